@@ -0,0 +1,38 @@
+"""
+Сравнение двух прогонов benchmarks.run.
+
+Запуск:
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+
+def compare(before: dict, after: dict) -> list[tuple[str, str, float, float]]:
+    """Возвращает (размер, операция, медиана до, медиана после) для общих замеров"""
+    rows = []
+    for size, operations in after['results'].items():
+        old_operations = before['results'].get(size, {})
+        for name, stats in operations.items():
+            if name in old_operations:
+                rows.append((size, name, old_operations[name]['median'], stats['median']))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Сравнение результатов замеров')
+    parser.add_argument('before', type=Path)
+    parser.add_argument('after', type=Path)
+    args = parser.parse_args()
+
+    before = json.loads(args.before.read_text(encoding='utf-8'))
+    after = json.loads(args.after.read_text(encoding='utf-8'))
+    print(f'{before["meta"].get("commit")} -> {after["meta"].get("commit")}')
+    for size, name, old, new in compare(before, after):
+        ratio = old / new if new else float('inf')
+        print(f'{size:>8} {name:<45} {old * 1000:10.3f} мс -> {new * 1000:10.3f} мс  x{ratio:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Детерминированный генератор синтетических справочников.
+
+Запуск:
+    python -m benchmarks.generator book.json --count 100000 --seed 42
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Iterator
+from custom_types import Contact
+
+MALE_NAMES = [
+    'Александр', 'Алексей', 'Андрей', 'Антон', 'Артём', 'Борис', 'Вадим', 'Валерий', 'Василий',
+    'Виктор', 'Владимир', 'Вячеслав', 'Георгий', 'Глеб', 'Григорий', 'Денис', 'Дмитрий', 'Евгений',
+    'Егор', 'Иван', 'Игорь', 'Илья', 'Кирилл', 'Константин', 'Леонид', 'Максим', 'Марк', 'Михаил',
+    'Никита', 'Николай', 'Олег', 'Павел', 'Пётр', 'Роман', 'Руслан', 'Семён', 'Сергей', 'Степан',
+    'Тимофей', 'Фёдор', 'Юрий', 'Ярослав',
+]
+FEMALE_NAMES = [
+    'Алина', 'Алла', 'Анастасия', 'Анна', 'Валентина', 'Валерия', 'Вера', 'Виктория', 'Галина',
+    'Дарья', 'Екатерина', 'Елена', 'Елизавета', 'Жанна', 'Зоя', 'Ирина', 'Карина', 'Ксения',
+    'Лариса', 'Любовь', 'Людмила', 'Маргарита', 'Марина', 'Мария', 'Надежда', 'Наталья', 'Нина',
+    'Оксана', 'Ольга', 'Полина', 'Светлана', 'София', 'Тамара', 'Татьяна', 'Ульяна', 'Юлия', 'Яна',
+]
+# Фамилии в мужской форме; женская образуется по окончанию
+SURNAMES = [
+    'Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов', 'Михайлов',
+    'Новиков', 'Фёдоров', 'Морозов', 'Волков', 'Алексеев', 'Лебедев', 'Семёнов', 'Егоров',
+    'Павлов', 'Козлов', 'Степанов', 'Николаев', 'Орлов', 'Андреев', 'Макаров', 'Никитин',
+    'Захаров', 'Зайцев', 'Соловьёв', 'Борисов', 'Яковлев', 'Григорьев', 'Романов', 'Воробьёв',
+    'Сергеев', 'Кузьмин', 'Фролов', 'Александров', 'Дмитриев', 'Королёв', 'Гусев', 'Киселёв',
+    'Ильин', 'Максимов', 'Поляков', 'Сорокин', 'Виноградов', 'Ковалёв', 'Белов', 'Медведев',
+    'Антонов', 'Тарасов', 'Жуков', 'Баранов', 'Филиппов', 'Комаров', 'Давыдов', 'Беляев',
+    'Герасимов', 'Богданов', 'Осипов', 'Сидоров', 'Матвеев', 'Титов', 'Марков', 'Миронов',
+    'Крылов', 'Куликов', 'Карпов', 'Власов', 'Мельников', 'Денисов', 'Гаврилов', 'Тихонов',
+    'Казаков', 'Афанасьев', 'Данилов', 'Савельев', 'Тимофеев', 'Фомин', 'Чернов', 'Абрамов',
+    'Мартынов', 'Ефимов', 'Федотов', 'Щербаков', 'Назаров', 'Калинин', 'Исаев', 'Чернышёв',
+    'Быков', 'Маслов', 'Родионов', 'Коновалов', 'Лазарев', 'Воронин', 'Климов', 'Филатов',
+    'Пономарёв', 'Голубев', 'Кудрявцев', 'Прохоров', 'Наумов', 'Потапов', 'Журавлёв', 'Овчинников',
+    'Трофимов', 'Леонов', 'Соболев', 'Ермаков', 'Колесников', 'Гончаров', 'Емельянов', 'Никифоров',
+    'Грачёв', 'Котов', 'Гришин', 'Ефремов', 'Архипов', 'Громов', 'Кириллов', 'Малышев', 'Панов',
+    'Моисеев', 'Румянцев', 'Акимов', 'Кондратьев', 'Бирюков', 'Горбунов', 'Анисимов', 'Ерёмин',
+    'Тихомиров', 'Галкин', 'Лукьянов', 'Михеев', 'Скворцов', 'Юдин', 'Белоусов', 'Нестеров',
+    'Симонов', 'Прокофьев', 'Харитонов', 'Князев', 'Цветков', 'Левин', 'Митрофанов', 'Воронов',
+    'Аксёнов', 'Софронов', 'Мальцев', 'Логинов', 'Горшков', 'Савин', 'Краснов', 'Майоров',
+    'Демидов', 'Елисеев', 'Рыбаков', 'Сафонов', 'Плотников', 'Дёмин', 'Хохлов', 'Жданов',
+    'Достоевский', 'Вяземский', 'Трубецкой', 'Шевченко', 'Бондаренко', 'Ткаченко', 'Пак', 'Ким',
+]
+COMMENTS = [
+    '', '', '', 'коллега', 'коллега из отдела IT', 'старый друг', 'куратор проекта', 'ветеринар',
+    'тренер по фитнесу', 'сосед по даче', 'одноклассник', 'стоматолог', 'бухгалтер', 'мастер по ремонту',
+    'звонить после 18:00', 'рабочий номер', 'личный номер', 'поставщик', 'клиент', 'родственник',
+    'директор', 'курьер', 'репетитор английского', 'автосервис', 'риелтор', 'юрист', 'няня',
+]
+# (код страны, длина абонентского номера, вес)
+PHONE_PLANS = [('7', 10, 80), ('375', 9, 6), ('380', 9, 5), ('34', 9, 4), ('49', 10, 3), ('1', 10, 2)]
+
+
+def _feminine(surname: str) -> str:
+    if surname.endswith(('ов', 'ев', 'ёв', 'ин')):
+        return surname + 'а'
+    if surname.endswith('ский'):
+        return surname[:-4] + 'ская'
+    if surname.endswith('ой'):
+        return surname[:-2] + 'ая'
+    return surname
+
+
+def generate_contacts(count: int, seed: int = 42) -> Iterator[Contact]:
+    """
+    Генерирует count контактов; один и тот же seed всегда дает одну и ту же книгу.
+
+    Args:
+        count: Количество контактов
+        seed: Зерно генератора случайных чисел
+
+    Yields:
+        Contact: Контакты с ID от 1 до count
+    """
+    rnd = random.Random(seed)
+    codes = [code for code, _, _ in PHONE_PLANS]
+    lengths = {code: length for code, length, _ in PHONE_PLANS}
+    weights = [weight for _, _, weight in PHONE_PLANS]
+
+    for cid in range(1, count + 1):
+        surname = rnd.choice(SURNAMES)
+        if rnd.random() < 0.5:
+            name = f'{rnd.choice(MALE_NAMES)} {surname}'
+        else:
+            name = f'{rnd.choice(FEMALE_NAMES)} {_feminine(surname)}'
+
+        code = rnd.choices(codes, weights)[0]
+        subscriber = ''.join(str(rnd.randrange(10)) for _ in range(lengths[code]))
+        if code == '7':
+            # Мобильные номера в России начинаются с 9
+            subscriber = '9' + subscriber[1:]
+
+        yield Contact(id=cid, name=name, phone_number=int(code + subscriber), comment=rnd.choice(COMMENTS))
+
+
+def write_book(path: Path, count: int, seed: int = 42) -> None:
+    """Записывает сгенерированную книгу в JSON-файл, не держа ее целиком в памяти"""
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('[')
+        for i, contact in enumerate(generate_contacts(count, seed)):
+            if i:
+                file.write(', ')
+            file.write(json.dumps(contact.to_dict(), ensure_ascii=False))
+        file.write(']')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Генерация синтетического справочника')
+    parser.add_argument('output', type=Path, help='путь к создаваемому JSON-файлу')
+    parser.add_argument('--count', type=int, default=100_000, help='количество контактов')
+    parser.add_argument('--seed', type=int, default=42, help='зерно генератора')
+    args = parser.parse_args()
+
+    write_book(args.output, args.count, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Нагрузочный замер HTTP/JSON сервера (server.py): запросов в секунду.
+
+Без --port запускает локальный сервер на синтетической книге из --count
+контактов и останавливает его после замера. Каждое соединение отправляет
+запросы пачками по --pipeline штук без ожидания ответов.
+
+Запуск:
+    python -m benchmarks.http_load --count 100000 --connections 16 --requests 20000
+    python -m benchmarks.http_load --port 8080 --path '/contacts?q=ivan&mode=1'
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from .generator import write_book
+
+# Запросы по умолчанию: чтение по ID и поиск по имени с постраничным выводом
+DEFAULT_PATHS = [
+    '/contacts/1',
+    '/contacts/500',
+    '/contacts?q=%D0%98%D0%B2%D0%B0%D0%BD%D0%BE%D0%B2&mode=1&limit=20',
+]
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *lines = head.decode('latin-1').split('\r\n')
+    length = 0
+    for line in lines:
+        name, _, value = line.partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _connection(host: str, port: int, paths: list[str], count: int, pipeline: int) -> list[int]:
+    reader, writer = await asyncio.open_connection(host, port)
+    statuses: list[int] = []
+    sent = 0
+    while sent < count:
+        batch = min(pipeline, count - sent)
+        writer.write(b''.join(
+            f'GET {paths[(sent + i) % len(paths)]} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode('latin-1')
+            for i in range(batch)
+        ))
+        await writer.drain()
+        for _ in range(batch):
+            statuses.append(await _read_response(reader))
+        sent += batch
+    writer.close()
+    await writer.wait_closed()
+    return statuses
+
+
+async def load(host: str, port: int, paths: list[str], requests: int, connections: int, pipeline: int) -> dict:
+    per_connection = -(-requests // connections)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        _connection(host, port, paths, per_connection, pipeline) for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    statuses = [status for result in results for status in result]
+    return {
+        'requests': len(statuses),
+        'errors': sum(status >= 400 for status in statuses),
+        'seconds': elapsed,
+        'rps': len(statuses) / elapsed,
+    }
+
+
+def start_local_server(book: Path) -> tuple[subprocess.Popen, int]:
+    """Запускает server.py на свободном порту и ждет строки о запуске"""
+    process = subprocess.Popen(
+        [sys.executable, 'server.py', str(book), '--port', '0', '--no-cache'],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    if not line:
+        process.kill()
+        raise RuntimeError('Сервер не запустился')
+    return process, int(line.rsplit(':', 1)[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Нагрузочный замер HTTP/JSON сервера')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='порт запущенного сервера; без него сервер запускается локально')
+    parser.add_argument('--count', type=int, default=10_000, help='контактов в книге локального сервера')
+    parser.add_argument('--requests', type=int, default=10_000, help='всего запросов')
+    parser.add_argument('--connections', type=int, default=8, help='одновременных соединений')
+    parser.add_argument('--pipeline', type=int, default=1, help='запросов в пачке без ожидания ответов')
+    parser.add_argument('--path', action='append', help='путь запроса (можно несколько раз)')
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    with tempfile.TemporaryDirectory() as tmp:
+        process = None
+        port = args.port
+        if port is None:
+            book = Path(tmp) / 'book.json'
+            write_book(book, args.count)
+            process, port = start_local_server(book)
+        try:
+            result = asyncio.run(load(args.host, port, paths, args.requests, args.connections, args.pipeline))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    print(f'Запросов: {result["requests"]}, ошибок: {result["errors"]}, '
+          f'за {result["seconds"]:.2f} с — {result["rps"]:.0f} запросов/с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Замер памяти на один контакт для обычного и компактного хранения.
+
+Запуск:
+    python -m benchmarks.memory --count 100000
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable
+from model import ContactBookModel
+from tools.columnar_store import ColumnarContactStore
+from .generator import generate_contacts
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Возвращает количество байт, удерживаемых результатом build()"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def run(count: int) -> dict[str, float]:
+    """Замеряет байты на контакт для разных способов хранения"""
+    def plain_model() -> ContactBookModel:
+        book = ContactBookModel('benchmark.json')
+        book.data = list(generate_contacts(count))
+        return book
+
+    def compact_model() -> ContactBookModel:
+        book = ContactBookModel('benchmark.json', compact=True)
+        book.data = generate_contacts(count)
+        return book
+
+    def compact_model_without_indexes() -> ContactBookModel:
+        book = ContactBookModel('benchmark.json', compact=True, trigram_index=False, phone_index=False)
+        book.data = generate_contacts(count)
+        return book
+
+    builders = {
+        'list[Contact]': lambda: list(generate_contacts(count)),
+        'ColumnarContactStore': lambda: ColumnarContactStore(generate_contacts(count)),
+        'model': plain_model,
+        'model(compact)': compact_model,
+        'model(compact, без поисковых индексов)': compact_model_without_indexes,
+    }
+    return {name: measure(build) / count for name, build in builders.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Память на один контакт')
+    parser.add_argument('--count', type=int, default=100_000, help='количество контактов')
+    args = parser.parse_args()
+
+    for name, per_contact in run(args.count).items():
+        print(f'{name:<45} {per_contact:8.1f} байт/контакт')
+
+
+if __name__ == '__main__':
+    main()
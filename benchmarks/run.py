@@ -0,0 +1,136 @@
+"""
+Замер времени основных операций справочника на синтетических книгах.
+
+Запуск:
+    python -m benchmarks.run --sizes 10000 100000 --output results.json
+
+Результаты пишутся в JSON вместе с коммитом и версией Python, чтобы
+прогоны можно было сравнивать между коммитами (см. benchmarks.compare).
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+from model import ContactBookModel
+from view import ContactBookView
+from tools.file_reader import FileReader
+from tools.file_writer import FileWriter
+from .generator import generate_contacts, write_book
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+# Запросы для каждого режима поиска; подобраны так, чтобы находилась часть книги
+SEARCH_QUERIES = {
+    '1': 'Иванов',
+    '2': '7916',
+    '3': 'коллега',
+    '4': 'Мария',
+}
+# Сколько одиночных операций изменения выполнить за один замер
+MUTATIONS = 1000
+
+
+def timed(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Выполняет func repeat раз и возвращает статистику времени в секундах"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {'min': min(samples), 'median': statistics.median(samples), 'max': max(samples)}
+
+
+def per_operation(stats: dict[str, float], count: int) -> dict[str, float]:
+    return {key: value / count for key, value in stats.items()}
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_size(size: int, repeat: int, workdir: Path) -> dict[str, dict[str, float]]:
+    """Замеряет все операции на книге из size контактов"""
+    results: dict[str, dict[str, float]] = {}
+    book_path = workdir / f'book_{size}.json'
+    write_book(book_path, size)
+
+    reader = FileReader(book_path)
+    results['FileReader.read'] = timed(reader.read, repeat)
+
+    contacts = list(generate_contacts(size))
+    writer = FileWriter(workdir / f'out_{size}.json')
+    results['FileWriter.write'] = timed(lambda: writer.write(contacts), repeat)
+
+    book = ContactBookModel(str(book_path))
+    book.load_data()
+    for mode, query in SEARCH_QUERIES.items():
+        field = ContactBookModel.SEARCH_FIELDS[int(mode)]
+        results[f'find_contact[{mode}:{field}]'] = timed(lambda: book.find_contact(query, mode), repeat)
+
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        results['view.show_contacts'] = timed(lambda: ContactBookView.show_contacts(book.data), repeat)
+
+    # Изменения замеряются пачками по MUTATIONS операций; в результат идет время одной операции
+    mutations = min(MUTATIONS, size)
+    new_contact = {'name': 'Тестовый Контакт', 'phone_number': 79990000000, 'comment': 'бенчмарк'}
+    results['add_contact'] = per_operation(
+        timed(lambda: [book.add_contact(new_contact) for _ in range(mutations)], 1), mutations
+    )
+
+    ids = book.get_contact_ids()[size // 2:size // 2 + mutations]
+    results['edit_contact'] = per_operation(
+        timed(lambda: [book.edit_contact(cid, {'comment': 'изменен'}) for cid in ids], 1), mutations
+    )
+    results['delete_contact'] = per_operation(
+        timed(lambda: [book.delete_contact(cid) for cid in ids], 1), mutations
+    )
+    return results
+
+
+def run(sizes: list[int], repeat: int = 3) -> dict:
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'repeat': repeat,
+        },
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            report['results'][str(size)] = run_size(size, repeat, Path(tmp))
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Замер времени операций справочника')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='размеры книг')
+    parser.add_argument('--repeat', type=int, default=3, help='повторов каждого замера')
+    parser.add_argument('--output', type=Path, default=Path('benchmark_results.json'),
+                        help='файл для результатов в JSON')
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    for size, operations in report['results'].items():
+        print(f'{size} контактов:')
+        for name, stats in operations.items():
+            print(f'    {name:<32} {stats["median"] * 1000:12.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Замер поиска на типичных запросах: литералы разной длины и регулярные выражения,
+с триграммным индексом и без него.
+
+Запуск:
+    python -m benchmarks.search --count 100000 --output search.json
+"""
+import argparse
+import json
+from pathlib import Path
+from model import ContactBookModel
+from .generator import generate_contacts
+from .run import timed, git_commit
+
+# (режим, запрос)
+QUERIES = [
+    ('1', 'ан'),
+    ('1', 'Иванов'),
+    ('1', 'иВАНОВА'),
+    ('3', 'коллега'),
+    ('4', 'Мария'),
+    ('4', '18:00'),
+    ('1', r'^Ан.*ова$'),
+    ('3', r'друг|сосед'),
+]
+
+
+def run(count: int, repeat: int = 5) -> dict[str, dict[str, float]]:
+    contacts = list(generate_contacts(count))
+    results = {}
+    for trigram_index in (True, False):
+        book = ContactBookModel('benchmark.json', trigram_index=trigram_index)
+        book.data = contacts
+        suffix = '' if trigram_index else ', без индекса'
+        for mode, query in QUERIES:
+            results[f'find_contact[{mode}:{query}{suffix}]'] = timed(lambda: book.find_contact(query, mode), repeat)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Замер поиска')
+    parser.add_argument('--count', type=int, default=100_000, help='количество контактов')
+    parser.add_argument('--repeat', type=int, default=5, help='повторов каждого замера')
+    parser.add_argument('--output', type=Path, help='файл для результатов в JSON')
+    args = parser.parse_args()
+
+    results = run(args.count, args.repeat)
+    if args.output is not None:
+        report = {'meta': {'commit': git_commit(), 'repeat': args.repeat},
+                  'results': {str(args.count): results}}
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    for name, stats in results.items():
+        print(f'{name:<45} {stats["median"] * 1000:10.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
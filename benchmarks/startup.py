@@ -0,0 +1,67 @@
+"""
+Замер запуска: загрузка JSON-справочника без кеша, с холодным кешем
+(кеш создается при загрузке) и с теплым кешем (файл не менялся), отдельно
+для чтения хранилищем и для полного load_data с поисковыми индексами.
+
+Запуск:
+    python -m benchmarks.startup --count 100000 --output startup.json
+"""
+import argparse
+import json
+import tempfile
+from pathlib import Path
+from model import ContactBookModel
+from tools.storage import JsonStorage
+from tools.columnar_store import ColumnarContactStore
+from .generator import write_book
+from .run import timed, git_commit
+
+
+def run(count: int, repeat: int = 5) -> dict[str, dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'book.json'
+        write_book(path, count)
+
+        def load(cache: bool, compact: bool = False, cold: bool = False) -> None:
+            storage = JsonStorage(path, lazy=not compact, cache=cache)
+            if cold:
+                storage.cache.clear()
+            contacts = storage.load(stream=compact)
+            if compact and not isinstance(contacts, ColumnarContactStore):
+                # Без кеша компактная загрузка — поток, который модель переливает в колонки
+                ColumnarContactStore(contacts)
+
+        # Чтение книги хранилищем — та часть запуска, которую ускоряет кеш
+        for compact in (False, True):
+            suffix = ', компактно' if compact else ''
+            results[f'load[без кеша{suffix}]'] = timed(lambda: load(False, compact), repeat)
+            results[f'load[холодный кеш{suffix}]'] = timed(lambda: load(True, compact, cold=True), repeat)
+            results[f'load[теплый кеш{suffix}]'] = timed(lambda: load(True, compact), repeat)
+
+        # Полный запуск модели, включая построение поисковых индексов
+        for cache in (False, True):
+            name = 'load_data[теплый кеш]' if cache else 'load_data[без кеша]'
+            results[name] = timed(lambda: ContactBookModel(str(path), cache=cache).load_data(), repeat)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Замер запуска с кешем разбора и без него')
+    parser.add_argument('--count', type=int, default=100_000, help='количество контактов')
+    parser.add_argument('--repeat', type=int, default=5, help='повторов каждого замера')
+    parser.add_argument('--output', type=Path, help='файл для результатов в JSON')
+    args = parser.parse_args()
+
+    results = run(args.count, args.repeat)
+    if args.output is not None:
+        report = {'meta': {'commit': git_commit(), 'repeat': args.repeat},
+                  'results': {str(args.count): results}}
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    for name, stats in results.items():
+        print(f'{name:<45} {stats["median"] * 1000:10.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
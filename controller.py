@@ -1,4 +1,4 @@
-from typing import Iterable, Any, Callable
+from typing import Iterable, Any, Callable, Sequence
 from model import ContactBookModel
 from view import ContactBookView
 from custom_errors import (
@@ -17,7 +17,7 @@ from custom_types import Contact
 
 class ContactBookController:
     MAIN_MENU_DICT = {
-        1: 'Показать список всех контактов',
+        1: 'Показать список всех контактов (по алфавиту)',
         2: 'Создать новый контакт',
         3: 'Редактировать контакт',
         4: 'Найти контакт',
@@ -31,14 +31,19 @@ class ContactBookController:
         1: 'Имени',
         2: 'Телефону',
         3: 'Комментарию',
-        4: 'Всем данным'
+        4: 'Всем данным',
+        5: 'Имени с опечатками',
+        6: 'Имени по звучанию'
     }
 
     MENU_COMMAND = '/menu'
 
-    def __init__(self, model: ContactBookModel, view: ContactBookView):
+    def __init__(self, model: ContactBookModel, view: ContactBookView, page_size: int = 20):
         self.model = model
         self.view = view
+        self.page_size = page_size
+        # Совет запускать совместную работу с --journal показывается один раз
+        self._journal_hint_shown = False
 
     def run(self) -> None:
         try:
@@ -54,6 +59,8 @@ class ContactBookController:
         self.view.show_menu(self.MAIN_MENU_DICT)
 
         while (value := self.view.get_menu_command()) != '7':
+            self._show_save_errors()
+            self._refresh_book()
             command_options = [str(k) for k in self.MAIN_MENU_DICT]
             try:
                 command = self.parse_command_input(value, command_options)
@@ -83,6 +90,8 @@ class ContactBookController:
                 self.view.show_menu(self.MAIN_MENU_DICT)
         else:
             # Выход из приложения
+            self.model.stop_autosave()
+            self._show_save_errors()
             if self.model.is_changed():
                 save = self.view.get_save_file_decision() or 'n'
                 if save.lower() == 'y':
@@ -97,8 +106,9 @@ class ContactBookController:
     # --------- Обработчики команд (без дублирования логики ввода) ---------
 
     def _handle_show_all_contacts(self) -> None:
-        contacts = self.model.get_all_contacts()
-        self.view.show_contacts(contacts)
+        # Страницы читаются из индекса имен по мере листания
+        contacts = self.model.get_sorted_contacts()
+        self._show_pages(contacts)
 
     def _handle_add_contact(self) -> None:
         """Создание нового контакта с поддержкой /menu на каждом шаге."""
@@ -174,8 +184,48 @@ class ContactBookController:
         contacts = self.model.find_contact(search_term, search_mode)
         if not contacts:
             self.view.show_message('Совпадений не найдено.')
-        else:
-            self.view.show_contacts(contacts)
+            return
+        self._show_pages(contacts)
+
+        action = self.view.get_bulk_action(len(contacts)).lower()
+        if action == 'd':
+            self._handle_bulk_delete(contacts)
+        elif action == 'e':
+            self._handle_bulk_edit(search_term, search_mode)
+
+    def _handle_bulk_delete(self, contacts: Sequence[Contact]) -> None:
+        """Удаление всех найденных контактов после подтверждения."""
+        decision = self.view.get_bulk_delete_confirmation(len(contacts)) or 'n'
+        if decision.lower() != 'y':
+            return
+        deleted = self.model.delete_contacts([contact.id for contact in contacts])
+        self.view.show_message(f'Удалено контактов: {deleted}.')
+
+    def _handle_bulk_edit(self, search_term: str, search_mode: int) -> None:
+        """Одинаковое изменение всех найденных контактов; пустое поле не меняется."""
+        new_name = self._input_contact_name(allow_empty=True)
+        if new_name is None:
+            return
+
+        new_phone = self._input_contact_phone_number(allow_empty=True)
+        if new_phone is None:
+            return
+
+        new_comment = self._input_contact_comment(allow_empty=True)
+        if new_comment is None:
+            return
+
+        updated_keys: dict[str, Any] = {}
+        if new_name:
+            updated_keys['name'] = new_name
+        if new_phone not in (None, ''):
+            updated_keys['phone_number'] = new_phone
+        if new_comment:
+            updated_keys['comment'] = new_comment
+
+        if updated_keys:
+            updated = self.model.update_where(search_term, search_mode, updated_keys)
+            self.view.show_message(f'Изменено контактов: {updated}.')
 
     def _handle_delete_contact(self) -> None:
         """Удаление контакта с поддержкой /menu."""
@@ -192,6 +242,11 @@ class ContactBookController:
         self.view.show_message(f'Контакт с ID {contact_id} успешно удален.')
 
     def _handle_save(self) -> None:
+        if self.model.autosave_enabled:
+            # Запись идет в фоновом потоке, чтобы не блокировать ввод
+            self.model.request_save()
+            self.view.show_message('Сохранение запущено в фоне.')
+            return
         try:
             self.model.save_file()
         except SaveFileError as e:
@@ -199,6 +254,46 @@ class ContactBookController:
         else:
             self.view.show_message('Справочник успешно сохранен.')
 
+    def _show_pages(self, contacts: Sequence[Contact]) -> None:
+        """Постраничный вывод контактов с переходом вперед (Enter/n) и назад (p)."""
+        total = len(contacts)
+        pages = max(1, -(-total // self.page_size))
+        page = 0
+        while True:
+            start = page * self.page_size
+            self.view.show_contacts(contacts[start:start + self.page_size])
+            if pages == 1:
+                return
+            self.view.show_page_status(page + 1, pages, total)
+
+            command = self.view.get_page_command().lower()
+            if command in ('', 'n'):
+                if page + 1 == pages:
+                    return
+                page += 1
+            elif command == 'p':
+                page = max(0, page - 1)
+            else:
+                return
+
+    def _refresh_book(self) -> None:
+        """Подхватывает изменения, сохраненные другими пользователями того же справочника"""
+        try:
+            if self.model.refresh():
+                self.view.show_message('Справочник обновлен: загружены изменения других пользователей.')
+                if self.model.reloads_on_change and not self._journal_hint_shown:
+                    self._journal_hint_shown = True
+                    self.view.show_message(
+                        'Справочник изменяют несколько пользователей. Без --journal каждое чужое '
+                        'сохранение перечитывает всю книгу; запускайте все копии с --journal.'
+                    )
+        except (FileCorruptedError, InvalidFileFormatError, ContactLoadError) as e:
+            self.view.show_message(f'Не удалось загрузить изменения справочника: {e}')
+
+    def _show_save_errors(self) -> None:
+        while (error := self.model.pop_save_error()) is not None:
+            self.view.show_message(f'Ошибка фонового сохранения:\n{error}')
+
     # --------- Универсальные методы ввода с валидацией и поддержкой /menu ---------
 
     def _input_contact_name(
@@ -333,7 +428,7 @@ class ContactBookController:
     def parse_contact_id_input(self, value: str) -> int:
         int_value = Contact.parse_contact_id(value)
 
-        if int_value not in self.model.get_contact_ids():
+        if not self.model.has_contact(int_value):
             raise WrongContactIdError('Данный ID не найден.')
 
         return int_value
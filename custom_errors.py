@@ -46,6 +46,11 @@ class SaveFileError(PhoneBookBaseException):
     pass
 
 
+class BookLockedError(SaveFileError):
+    """Справочник заблокирован другим процессом"""
+    pass
+
+
 class CreateEmptyBookError(PhoneBookBaseException):
     """Ошибка при создании пустого справочника"""
     pass
@@ -61,5 +66,6 @@ __all__ = [
     'InvalidFileFormatError',
     'ContactLoadError',
     'SaveFileError',
+    'BookLockedError',
     'CreateEmptyBookError'
 ]
@@ -1,9 +1,118 @@
+import argparse
+from pathlib import Path
 from controller import ContactBookController
 from model import ContactBookModel
 from view import ContactBookView
+from tools.storage import ContactStorage, JsonStorage
+from tools.sqlite_storage import SqliteStorage, migrate_json_to_sqlite
+from tools.importer import import_contacts
+from tools.binary_book import BinaryStorage
+from tools.sharded_storage import ShardedStorage, rebalance
+
+SQLITE_EXTENSIONS = {'.db', '.sqlite', '.sqlite3'}
+BINARY_EXTENSIONS = {'.pbk'}
+SHARDED_EXTENSIONS = {'.shards'}
+# Сколько ошибок импорта показывать построчно
+MAX_IMPORT_ERRORS_SHOWN = 20
+
+
+def positive_int(value: str) -> int:
+    """Тип аргумента argparse: целое число не меньше 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{value!r} — не целое число')
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'значение должно быть не меньше 1, получено {number}')
+    return number
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Телефонный справочник')
+    parser.add_argument('file', nargs='?', default='data.json', help='путь к файлу справочника')
+    parser.add_argument('--storage', choices=['json', 'sqlite', 'binary', 'sharded'],
+                        help='формат хранилища (по умолчанию определяется по расширению файла)')
+    parser.add_argument('--migrate-from', type=Path, metavar='JSON',
+                        help='перенести контакты из JSON-справочника в базу SQLite и выйти')
+    parser.add_argument('--import', dest='import_file', type=Path, metavar='FILE',
+                        help='импортировать контакты из CSV или JSONL файла, сохранить и выйти')
+    parser.add_argument('--import-workers', type=positive_int, metavar='N',
+                        help='количество процессов для проверки строк при импорте (по умолчанию по числу ядер)')
+    parser.add_argument('--shard-size', type=positive_int, metavar='N',
+                        help='контактов в шарде шардированного справочника (по умолчанию из манифеста или 10000)')
+    parser.add_argument('--rebalance', action='store_true',
+                        help='разделить шарды шардированного справочника, в которых больше --shard-size контактов, и выйти')
+    parser.add_argument('--journal', action='store_true',
+                        help='сохранять изменения в журнал вместо полной перезаписи файла')
+    parser.add_argument('--cache', action=argparse.BooleanOptionalAction, default=False,
+                        help='хранить рядом с JSON-справочником кеш разобранных контактов (<файл>.cache)')
+    parser.add_argument('--autosave', type=float, metavar='SECONDS',
+                        help='сохранять изменения в фоне каждые SECONDS секунд')
+    parser.add_argument('--autosave-changes', type=positive_int, default=100, metavar='N',
+                        help='сохранять в фоне после N изменений (по умолчанию 100)')
+    parser.add_argument('--scan-workers', type=positive_int, default=1, metavar='N',
+                        help='процессов для поиска регулярными выражениями по большой книге (по умолчанию 1)')
+    parser.add_argument('--page-size', type=positive_int, default=20, metavar='N',
+                        help='количество контактов на странице (по умолчанию 20)')
+    return parser.parse_args(argv)
+
+
+def run_import(args: argparse.Namespace) -> None:
+    model = ContactBookModel(args.file, storage=create_storage(args))
+    model.load_data()
+    report = import_contacts(model, args.import_file, workers=args.import_workers)
+    for error in report.errors[:MAX_IMPORT_ERRORS_SHOWN]:
+        print(error)
+    if len(report.errors) > MAX_IMPORT_ERRORS_SHOWN:
+        print(f'... и еще ошибок: {len(report.errors) - MAX_IMPORT_ERRORS_SHOWN}')
+    if report.added:
+        model.save_file()
+    print(f'Импортировано контактов: {len(report.added)}, пропущено строк: {len(report.errors)}')
+
+
+def storage_kind(args: argparse.Namespace) -> str:
+    if args.storage:
+        return args.storage
+    path = Path(args.file)
+    suffix = path.suffix.lower()
+    if suffix in SQLITE_EXTENSIONS:
+        return 'sqlite'
+    if suffix in SHARDED_EXTENSIONS or path.is_dir():
+        return 'sharded'
+    return 'binary' if suffix in BINARY_EXTENSIONS else 'json'
+
+
+def create_storage(args: argparse.Namespace) -> ContactStorage:
+    path = Path(args.file)
+    kind = storage_kind(args)
+    if kind == 'sqlite':
+        return SqliteStorage(path)
+    if kind == 'binary':
+        return BinaryStorage(path)
+    if kind == 'sharded':
+        return ShardedStorage(path, shard_size=args.shard_size)
+    return JsonStorage(path, journal=args.journal, lazy=True, cache=args.cache)
+
 
 if __name__ == '__main__':
-    model = ContactBookModel('data.json')
-    view = ContactBookView()
-    controller = ContactBookController(model, view)
-    controller.run()
\ No newline at end of file
+    args = parse_args()
+    if args.migrate_from is not None:
+        count = migrate_json_to_sqlite(args.migrate_from, Path(args.file))
+        print(f'Перенесено контактов: {count}')
+    elif args.import_file is not None:
+        run_import(args)
+    elif args.rebalance:
+        split = rebalance(Path(args.file), shard_size=args.shard_size)
+        print(f'Разделено шардов: {split}')
+    else:
+        # Автосохранение вливает изменения других пользователей из фонового потока
+        model = ContactBookModel(args.file, storage=create_storage(args), scan_workers=args.scan_workers,
+                                 thread_safe=args.autosave is not None)
+        if args.autosave is not None:
+            model.start_autosave(interval=args.autosave, threshold=args.autosave_changes)
+        view = ContactBookView()
+        controller = ContactBookController(model, view, page_size=args.page_size)
+        try:
+            controller.run()
+        finally:
+            model.close()
\ No newline at end of file
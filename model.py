@@ -1,26 +1,330 @@
 from pathlib import Path
-from typing import Literal
-import re
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, Literal
+import threading
+from contextlib import nullcontext
+from queue import SimpleQueue, Empty
+from dataclasses import replace
+from itertools import islice
 from custom_types import Contact, ContactAdd, ContactUpdate
 from tools.file_reader import FileReader
 from tools.file_writer import FileWriter
-from custom_errors import SaveFileError
+from tools.storage import ContactStorage, ExternalChanges, JsonStorage
+from tools.trigram_index import TrigramIndex
+from tools.query import SearchKey, compile_query, fold_contact, fold_fields
+from tools.phone_index import PhonePrefixIndex
+from tools.journal import ContactJournal
+from tools.autosave import AutoSaver
+from tools.columnar_store import ColumnarContactStore
+from tools.lazy_contacts import LazyContactList
+from tools.parallel_scan import ParallelScanner
+from tools.bk_tree import BKTree, damerau_levenshtein
+from tools.phonetic import PhoneticIndex, phonetic_keys
+from tools.rwlock import ReadWriteLock
+from tools.name_index import SortedNameIndex
+from custom_errors import SaveFileError, FileCorruptedError, InvalidFileFormatError, ContactLoadError
+
+
+class SortedContacts(Sequence):
+    """
+    Контакты диапазона имен в алфавитном порядке — живое представление книги:
+    границы диапазона в индексе имен находятся заново при каждом обращении,
+    поэтому добавленные и удаленные контакты сразу видны. Страница читается
+    за O(log n + k).
+    """
+
+    def __init__(self, book: 'ContactBookModel', first: str, last: str | None):
+        self._book = book
+        self._first = first
+        self._last = last
+
+    def __len__(self) -> int:
+        start, stop = self._book._name_bounds(self._first, self._last)
+        return stop - start
+
+    def __iter__(self) -> Iterator[Contact]:
+        # Весь диапазон одним чтением, а не поиском границ для каждой позиции
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(*index.indices(len(self)))
+            if not positions:
+                return []
+            # Позиции читаются по возрастанию; при отрицательном шаге срез
+            # начинается с конца прочитанного, т.е. с positions[0]
+            low, high = min(positions[0], positions[-1]), max(positions[0], positions[-1]) + 1
+            contacts = self._book._contacts_by_name(self._first, self._last, low, high)
+            return contacts[::positions.step]
+        if index < 0:
+            index += len(self)
+        # Книга могла уменьшиться после len(): пустой результат — тоже выход за границы
+        contacts = self._book._contacts_by_name(self._first, self._last, index, index + 1) if index >= 0 else []
+        if not contacts:
+            raise IndexError('Индекс вне диапазона')
+        return contacts[0]
 
 
 class ContactBookModel:
-    SEARCH_FIELDS = {1: 'name', 2: 'phone_number', 3: 'comment', 4: 'all'}
+    SEARCH_FIELDS = {1: 'name', 2: 'phone_number', 3: 'comment', 4: 'all', 5: 'name_fuzzy', 6: 'name_phonetic'}
+    TEXT_FIELDS = ('name', 'phone_number', 'comment')
+    # После массового добавления большего числа контактов хранилище перезаписывается целиком
+    BULK_REWRITE_THRESHOLD = 1000
+    # Индексы перестраиваются целиком, если массово добавлено больше 1/BULK_REINDEX_RATIO книги;
+    # иначе индексируются только новые контакты
+    BULK_REINDEX_RATIO = 4
+    # С какого размера книги регулярные выражения без подсказки индекса проверяются параллельно
+    PARALLEL_SCAN_THRESHOLD = 100_000
 
-    def __init__(self, filename: str):
-        self.data: list[Contact] = []
+    def __init__(self,
+                 filename: str,
+                 trigram_index: bool = True,
+                 phone_index: bool = True,
+                 journal: bool = False,
+                 compact_every: int = 1000,
+                 compact: bool = False,
+                 storage: ContactStorage | None = None,
+                 scan_workers: int = 1,
+                 fuzzy_index: bool = True,
+                 phonetic_index: bool = True,
+                 cache: bool = False,
+                 thread_safe: bool = False,
+                 name_index: bool = True):
+        # В компактном режиме контакты хранятся колонками, а не объектами Contact
+        self._compact = compact
+        # Загруженная из JSON книга хранится в LazyContactList: Contact создается при первом обращении
+        self._data: list[Contact] | ColumnarContactStore | LazyContactList = (
+            ColumnarContactStore() if compact else []
+        )
+        # Индекс ID -> позиция в self.data; позиции начиная с _stale_from
+        # могли сдвинуться после удаления и досчитываются лениво
+        self._positions: dict[int, int] = {}
+        self._stale_from: int | None = None
+        # Триграммные индексы по полям и BK-дерево слов имени для поиска с опечатками
+        # строятся при первом поиске, которому они нужны, а не при каждой загрузке;
+        # None — индекс еще не построен (или отключен), изменения его не трогают
+        self._trigram_enabled = trigram_index
+        self._fuzzy_enabled = fuzzy_index
+        self._trigrams: dict[str, TrigramIndex] | None = None
+        self._fuzzy: BKTree | None = None
+        self._phones: PhonePrefixIndex | None = PhonePrefixIndex() if phone_index else None
+        # Фонетические ключи имен для поиска по звучанию; тоже строятся при первом поиске
+        self._phonetic_enabled = phonetic_index
+        self._phonetic: PhoneticIndex | None = None
+        # Нормализованные имена по алфавиту для упорядоченного вывода и диапазонов имен
+        self._names: SortedNameIndex | None = SortedNameIndex() if name_index else None
+        # Ключи поиска (см. SearchKey) параллельно self.data; поиск идет только по ним
+        self._keys: list[SearchKey] = []
+        # Пул процессов для полного перебора регулярным выражением на больших книгах
+        # Процессы пула получают ключи один раз и дальше догоняют их по журналу изменений
+        self._scanner: ParallelScanner | None = (
+            ParallelScanner(scan_workers, threaded=thread_safe) if scan_workers > 1 else None
+        )
         self._changed: bool = False
+        # Номер версии данных растет с каждым изменением; по нему фоновое
+        # сохранение понимает, не появились ли изменения во время записи
+        self._version: int = 0
+        # _lock защищает данные и индексы при изменениях, _save_lock не дает двум сохранениям
+        # идти одновременно. В потокобезопасном режиме _lock — сторона записи блокировки
+        # «читатели-писатель», а поиск и чтение идут под ее стороной чтения параллельно
+        self._thread_safe = thread_safe
+        self._rwlock: ReadWriteLock | None = ReadWriteLock() if thread_safe else None
+        self._lock = self._rwlock.writer if thread_safe else threading.RLock()
+        self._read_lock = self._rwlock.reader if thread_safe else nullcontext()
+        # Досчет устаревших позиций меняет индекс позиций и при чтении
+        self._repair_lock = threading.Lock()
+        # Ленивые индексы строятся под блокировкой: в потокобезопасном режиме поиск идет параллельно
+        self._build_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._autosaver: AutoSaver | None = None
+        self._save_errors: SimpleQueue[Exception] = SimpleQueue()
+        # Операции с момента последнего сохранения в формате записей журнала; массовое
+        # добавление хранится одной записью {'op': 'add_range', 'first_id', 'count'}
+        # и всегда сохраняется полной перезаписью
+        self._pending: list[dict[str, Any]] = []
+        self._full_rewrite: bool = False
+        # False после замены data целиком: свои операции неизвестны и чужие изменения не влить
+        self._ops_known: bool = True
+        # Чужие изменения не удалось влить — сохранение затерло бы их
+        self._conflict: bool = False
         self.file_path: Path = Path(filename)
-        self.reader = FileReader(self.file_path)
-        self.writer = FileWriter(self.file_path)
+        # По умолчанию — JSON-файл; journal, compact_every и cache относятся только к нему
+        self.storage: ContactStorage = storage or JsonStorage(
+            self.file_path, journal=journal, compact_every=compact_every, lazy=not compact, cache=cache
+        )
+        if self.storage.indexed_search:
+            # Имя, комментарий и начало номера ищутся по индексам хранилища
+            self._trigram_enabled = False
+            self._phones = None
+        # Прямой доступ к частям JSON-хранилища; для других хранилищ — None
+        self.reader: FileReader | None = getattr(self.storage, 'reader', None)
+        self.writer: FileWriter | None = getattr(self.storage, 'writer', None)
+        self.journal: ContactJournal | None = getattr(self.storage, 'journal', None)
+
+    @property
+    def data(self) -> list[Contact] | ColumnarContactStore | LazyContactList:
+        return self._data
+
+    @data.setter
+    def data(self, contacts: Iterable[Contact]) -> None:
+        with self._lock:
+            if self._compact and not isinstance(contacts, ColumnarContactStore):
+                contacts = ColumnarContactStore(contacts)
+            self._data = contacts
+            self._rebuild_indexes()
+            # Список заменен целиком — в журнал это не выразить, нужна полная перезапись
+            self._pending.clear()
+            self._full_rewrite = True
+            self._ops_known = False
+            self._version += 1
+
+    def _rebuild_indexes(self) -> None:
+        """Полностью перестраивает индекс ID -> позиция и поисковые индексы"""
+        self._rebuild_positions()
+        if isinstance(self._data, LazyContactList):
+            # Ключи строятся по сырым записям, не создавая объекты Contact
+            records = self._data.records()
+            self._keys = [fold_fields(name, phone, comment) for _, name, phone, comment in records]
+            ids = [record[0] for record in records]
+        else:
+            self._keys = [fold_contact(contact) for contact in self._data]
+            ids = [contact.id for contact in self._data]
+        if self._scanner is not None:
+            self._scanner.replaced()
+
+        # Ленивые индексы построятся заново при первом поиске
+        self._trigrams = None
+        self._fuzzy = None
+        self._phonetic = None
+        if self._phones is not None:
+            self._phones.rebuild([(key.phone_number, cid) for cid, key in zip(ids, self._keys)])
+        if self._names is not None:
+            self._names.rebuild([(key.name, cid) for cid, key in zip(ids, self._keys)])
+
+    def _contact_keys(self) -> Iterator[tuple[int, SearchKey]]:
+        """Пары (ID, ключ поиска) в порядке self.data"""
+        return zip(self._contact_ids(), self._keys)
+
+    def _trigram_index(self) -> dict[str, TrigramIndex] | None:
+        """Триграммные индексы полей; строятся по ключам поиска при первом обращении"""
+        if self._trigrams is None and self._trigram_enabled:
+            with self._build_lock:
+                if self._trigrams is None:
+                    trigrams = {field: TrigramIndex() for field in self.TEXT_FIELDS}
+                    for cid, key in self._contact_keys():
+                        for field, index in trigrams.items():
+                            index.add(cid, getattr(key, field))
+                    self._trigrams = trigrams
+        return self._trigrams
+
+    def _fuzzy_index(self) -> BKTree | None:
+        """BK-дерево слов имени; строится при первом поиске с опечатками"""
+        if self._fuzzy is None and self._fuzzy_enabled:
+            with self._build_lock:
+                if self._fuzzy is None:
+                    fuzzy = BKTree()
+                    for cid, key in self._contact_keys():
+                        for word in set(key.name.split()):
+                            fuzzy.add(cid, word)
+                    self._fuzzy = fuzzy
+        return self._fuzzy
+
+    def _phonetic_index(self) -> PhoneticIndex | None:
+        """Фонетические ключи имен; строятся при первом поиске по звучанию"""
+        if self._phonetic is None and self._phonetic_enabled:
+            with self._build_lock:
+                if self._phonetic is None:
+                    phonetic = PhoneticIndex()
+                    for cid, key in self._contact_keys():
+                        phonetic.add(cid, key.name)
+                    self._phonetic = phonetic
+        return self._phonetic
+
+    def _rebuild_positions(self) -> None:
+        positions: dict[int, int] = {}
+        for pos, cid in enumerate(self._contact_ids()):
+            # При дублях ID выигрывает первый контакт, как и при линейном поиске
+            positions.setdefault(cid, pos)
+        self._positions = positions
+        self._stale_from = None
+
+    def _contact_ids(self) -> list[int]:
+        """ID контактов в порядке self.data"""
+        if isinstance(self._data, LazyContactList):
+            return self._data.ids()
+        return [contact.id for contact in self._data]
+
+    def _index_contact(self, cid: int, key: SearchKey, fields: tuple[str, ...] = TEXT_FIELDS) -> None:
+        if self._trigrams is not None:
+            for field in fields:
+                self._trigrams[field].add(cid, getattr(key, field))
+        if self._phones is not None and 'phone_number' in fields:
+            self._phones.add(cid, key.phone_number)
+        if self._fuzzy is not None and 'name' in fields:
+            for word in set(key.name.split()):
+                self._fuzzy.add(cid, word)
+        if self._phonetic is not None and 'name' in fields:
+            self._phonetic.add(cid, key.name)
+        if self._names is not None and 'name' in fields:
+            self._names.add(cid, key.name)
+
+    def _unindex_contact(self, cid: int, key: SearchKey, fields: tuple[str, ...] = TEXT_FIELDS) -> None:
+        if self._trigrams is not None:
+            for field in fields:
+                self._trigrams[field].remove(cid, getattr(key, field))
+        if self._phones is not None and 'phone_number' in fields:
+            self._phones.remove(cid, key.phone_number)
+        if self._fuzzy is not None and 'name' in fields:
+            for word in set(key.name.split()):
+                self._fuzzy.remove(cid, word)
+        if self._phonetic is not None and 'name' in fields:
+            self._phonetic.remove(cid)
+        if self._names is not None and 'name' in fields:
+            self._names.remove(cid, key.name)
+
+    def _position(self, cid: int) -> int | None:
+        """
+        Возвращает позицию контакта в self.data или None.
+
+        Поиск левее всех удалений с прошлого досчета — один словарный поиск.
+        После удаления позиции правее него досчитываются при первом обращении:
+        до O(n) на обращение, как и само удаление из списка, так что чередование
+        удалений в начале книги и поиска в конце стоит O(n) на каждую пару.
+        """
+        pos = self._positions.get(cid)
+        if pos is None or self._stale_from is None or pos < self._stale_from:
+            return pos
+
+        with self._repair_lock:
+            return self._repair_position(cid)
+
+    def _repair_position(self, cid: int) -> int | None:
+        pos = self._positions.get(cid)
+        if pos is None or self._stale_from is None or pos < self._stale_from:
+            # Пока ждали блокировку, позицию досчитал другой поток
+            return pos
+
+        # Позиция устарела: досчитываем индекс слева направо до искомого контакта.
+        # Каждый элемент чинится один раз на удаление левее него.
+        data = self._data
+        id_at = data.id_at if isinstance(data, LazyContactList) else lambda i: data[i].id
+        for i in range(self._stale_from, len(data)):
+            contact_id = id_at(i)
+            self._positions[contact_id] = i
+            if contact_id == cid:
+                self._stale_from = i + 1 if i + 1 < len(self._data) else None
+                return i
+        self._stale_from = None
+        return None
 
     def load_data(self) -> None:
         """Загружает данные с обработкой ошибок"""
         try:
-            self.data = self.reader.read()
+            # В компактном режиме контакты переливаются в колонки по мере чтения
+            self.data = self.storage.load(stream=self._compact)
+            self._full_rewrite = False
+            self._ops_known = True
+            self._conflict = False
         except FileNotFoundError:
             # Файл еще не создан
             pass
@@ -28,45 +332,514 @@ class ContactBookModel:
             raise
 
     def get_contact(self, cid: int) -> Contact | None:
-        for contact in self.data:
-            if cid == contact.id:
-                return contact
-        return None
+        with self._read_lock:
+            pos = self._position(cid)
+            return None if pos is None else self._export([self._data[pos]])[0]
+
+    def has_contact(self, cid: int) -> bool:
+        with self._read_lock:
+            return cid in self._positions
 
     def get_contact_ids(self) -> list[int]:
-        return [c.id for c in self.data]
+        with self._read_lock:
+            return self._contact_ids()
+
+    def _export(self, contacts: list[Contact]) -> list[Contact]:
+        """
+        В потокобезопасном режиме строки колоночного хранилища отдаются копиями:
+        представление читает колонки, которые после снятия блокировки может менять писатель.
+        """
+        if self._thread_safe and isinstance(self._data, ColumnarContactStore):
+            return [contact.to_contact() for contact in contacts]
+        return contacts
 
     def find_contact(self,
                      search_term: str,
-                     mode_id: Literal['1', '2', '3', '4'] = '4') -> list[Contact]:
-        """Поиск контактов с регулярными выражениями"""
+                     mode_id: Literal['1', '2', '3', '4', '5', '6'] = '4',
+                     limit: int | None = None) -> list[Contact]:
+        """Поиск контактов по подстроке или регулярному выражению"""
+        with self._read_lock:
+            return self._export(self._find_contact(search_term, mode_id, limit))
+
+    def _find_contact(self, search_term: str, mode_id: str, limit: int | None) -> list[Contact]:
         if not search_term.strip():
             return []
 
-        try:
-            pattern = re.compile(search_term, re.IGNORECASE)
-        except re.error:
-            # Если не валидное regex, ищем как подстроку
-            pattern = re.compile(re.escape(search_term), re.IGNORECASE)
-
-        def matches(contact: Contact) -> bool:
-            mode = self.SEARCH_FIELDS[int(mode_id)]
-            if mode == 'all':
-                fields = [contact.name, str(contact.phone_number), contact.comment]
-                return any(pattern.search(str(field)) for field in fields)
+        mode = self.SEARCH_FIELDS[int(mode_id)]
+        if (mode == 'phone_number' and (self._phones is not None or self.storage.indexed_search)
+                and search_term.isascii() and search_term.isdigit()):
+            return self._find_by_phone(search_term, limit)
+        if mode == 'name_fuzzy':
+            # Сначала самые близкие совпадения
+            found = sorted(self._fuzzy_matches(search_term).items(), key=lambda item: (item[1], item[0]))
+            return [self._data[pos] for pos, _ in islice(found, limit)]
+
+        data = self._data
+        found = (data[pos] for pos in self._match_positions(search_term, mode))
+        return list(islice(found, limit))
+
+    def _match_positions(self, search_term: str, mode: str) -> Iterator[int]:
+        """Позиции контактов, подходящих под запрос, в порядке self.data"""
+        if mode == 'name_fuzzy':
+            return iter(sorted(self._fuzzy_matches(search_term)))
+        if mode == 'name_phonetic':
+            return iter(self._phonetic_positions(search_term))
+        query = compile_query(search_term, mode)
+        positions = self._candidate_positions(self.TEXT_FIELDS if mode == 'all' else (mode,), query.literals)
+        if (query.pattern is not None and self._scanner is not None
+                and isinstance(positions, range) and len(positions) >= self.PARALLEL_SCAN_THRESHOLD):
+            # Индекс не сузил поиск — проверяем выражение по шардам в нескольких процессах
+            return iter(self._scanner.scan(self._keys, query.pattern, query.columns))
+        keys, matches = self._keys, query.matcher()
+        return (pos for pos in positions if matches(keys[pos]))
+
+    @staticmethod
+    def fuzzy_distance(word: str) -> int:
+        """Допустимое число опечаток в слове запроса"""
+        return 1 if len(word) <= 4 else 2
+
+    def _fuzzy_matches(self, search_term: str) -> dict[int, int]:
+        """
+        Поиск по имени с опечатками: каждое слово запроса должно быть на расстоянии
+        Дамерау — Левенштейна не больше fuzzy_distance от какого-то слова имени.
+
+        Returns:
+            dict[int, int]: Позиция контакта -> суммарное расстояние по словам запроса
+        """
+        total: dict[int, int] | None = None
+        for word in search_term.casefold().split():
+            max_distance = self.fuzzy_distance(word)
+            best: dict[int, int] = {}
+            if (fuzzy := self._fuzzy_index()) is not None:
+                for distance, _, ids in fuzzy.search(word, max_distance):
+                    for cid in ids:
+                        if (pos := self._position(cid)) is not None and distance < best.get(pos, max_distance + 1):
+                            best[pos] = distance
+            else:
+                for pos, key in enumerate(self._keys):
+                    distance = min((damerau_levenshtein(word, token) for token in key.name.split()),
+                                   default=max_distance + 1)
+                    if distance <= max_distance:
+                        best[pos] = distance
+
+            if total is None:
+                total = best
             else:
-                value = getattr(contact, mode)
-                return bool(pattern.search(str(value)))
+                total = {pos: total[pos] + distance for pos, distance in best.items() if pos in total}
+            if not total:
+                return {}
+        return total or {}
 
-        return [contact for contact in self.data if matches(contact)]
+    def _phonetic_positions(self, search_term: str) -> list[int]:
+        """Позиции контактов, в имени которых каждое слово запроса есть по звучанию"""
+        if (phonetic := self._phonetic_index()) is not None:
+            ids = phonetic.find(search_term)
+            return sorted(pos for cid in ids if (pos := self._position(cid)) is not None)
+
+        words = [phonetic_keys(word) for word in search_term.split()]
+        if not words:
+            return []
+        positions = []
+        for pos, key in enumerate(self._keys):
+            name_codes = phonetic_keys(key.name)
+            if all(codes & name_codes for codes in words):
+                positions.append(pos)
+        return positions
+
+    def _find_by_phone(self, digits: str, limit: int | None) -> list[Contact]:
+        """
+        Поиск по цифрам номера: сначала номера, начинающиеся с digits, в порядке
+        номеров (по префиксному индексу), затем номера, содержащие digits в середине,
+        в порядке справочника. Порядок не зависит от limit, поэтому результат
+        с меньшим limit — начало результата с большим.
+        """
+        prefix_ids = self._phone_prefix_ids(digits, limit)
+        result = [self._data[pos] for cid in prefix_ids if (pos := self._position(cid)) is not None]
+        if limit is not None and len(result) >= limit:
+            return result
+
+        seen = set(prefix_ids)
+        keys = self._keys
+        rest = (
+            self._data[pos] for pos in self._candidate_positions(('phone_number',), (digits,))
+            if digits in keys[pos].phone_number and self._data[pos].id not in seen
+        )
+        result.extend(islice(rest, None if limit is None else limit - len(result)))
+        return result
+
+    def _phone_prefix_ids(self, digits: str, limit: int | None) -> list[int]:
+        """ID контактов с номером, начинающимся с digits, в порядке (номер, ID)"""
+        if self._phones is not None:
+            return self._phones.find_prefix(digits, limit)
+
+        # Хранилище знает только сохраненную книгу: контакты с несохраненными
+        # изменениями проверяются по модели и вливаются в порядок номеров
+        touched = self._touched_ids()
+        stored = self.storage.phone_prefix_ids(digits, None if limit is None else limit + len(touched))
+        keys = self._keys
+        found = [(keys[pos].phone_number, cid)
+                 for cid in (*(cid for cid in stored if cid not in touched), *touched)
+                 if (pos := self._position(cid)) is not None and keys[pos].phone_number.startswith(digits)]
+        found.sort()
+        return [cid for _, cid in islice(found, limit)]
+
+    def _touched_ids(self) -> set[int]:
+        """ID контактов, добавленных или измененных после последнего сохранения"""
+        added, edited, _ = self._own_changes()
+        return set(added) | edited.keys()
+
+    def _candidate_positions(self, fields: tuple[str, ...], literals: tuple[str, ...] | None) -> Iterable[int]:
+        """
+        Сужает поиск по индексам хранилища или триграммному индексу;
+        без индекса или литералов — все позиции.
+        """
+        if literals is None:
+            return range(len(self._data))
+        if self.storage.indexed_search:
+            candidate_ids = self._touched_ids()
+            for field in fields:
+                ids = self.storage.find_ids(field, literals)
+                if ids is None:
+                    return range(len(self._data))
+                candidate_ids |= ids
+            return sorted(pos for cid in candidate_ids if (pos := self._position(cid)) is not None)
+        if (trigrams := self._trigram_index()) is None:
+            return range(len(self._data))
+
+        candidate_ids: set[int] = set()
+        for field in fields:
+            ids = trigrams[field].candidates(literals)
+            if ids is None:
+                return range(len(self._data))
+            candidate_ids |= ids
+
+        return sorted(pos for cid in candidate_ids if (pos := self._position(cid)) is not None)
 
     def save_file(self) -> None:
         try:
-            self.writer.write(self.data)
-            self._changed = False
+            self._save()
+        except SaveFileError:
+            raise
+
+    def compact(self) -> None:
+        """Перезаписывает хранилище целиком (для JSON — еще и очищает журнал)"""
+        self._save(full_rewrite=True)
+
+    def add_contact_saved(self, contact: ContactAdd) -> int:
+        """
+        Добавляет контакт и сразу сохраняет справочник.
+
+        ID несохраненного контакта может смениться, если другой процесс успеет
+        сохранить свои новые контакты (см. _merge_external). Здесь ID выдается
+        под блокировкой хранилища между процессами уже после вливания чужих
+        изменений и записывается до ее снятия, поэтому он окончательный.
+
+        Raises:
+            SaveFileError: Если не удалось сохранить справочник; контакт остается
+                в книге несохраненным
+        """
+        with self._save_lock, self.storage.locked():
+            self._merge_before_save()
+            cid = self.add_contact(contact)
+            self._write_pending()
+            return cid
+
+    def _save(self, full_rewrite: bool = False, snapshot: bool = False) -> None:
+        """
+        Сохраняет только несохраненные операции, если хранилище это поддерживает,
+        иначе перезаписывает хранилище целиком.
+
+        При snapshot=True контакты копируются под блокировкой, и запись на диск
+        идет без нее — так фоновое сохранение не мешает основному потоку.
+
+        Запись идет под блокировкой хранилища между процессами; перед ней в книгу
+        вливаются изменения, сохраненные другими процессами, чтобы не затереть их.
+        """
+        with self._save_lock, self.storage.locked():
+            self._merge_before_save()
+            self._write_pending(full_rewrite, snapshot)
+
+    def _merge_before_save(self) -> None:
+        """Вливает чужие изменения перед записью; вызывается под блокировкой хранилища"""
+        try:
+            changes = self.storage.poll_changes()
+        except (FileCorruptedError, InvalidFileFormatError, ContactLoadError) as e:
+            raise SaveFileError(f'Невозможно прочитать изменения других пользователей: {e}')
+        if changes is not None:
+            self._merge_external(changes)
+        if self._conflict:
+            raise SaveFileError(
+                'Справочник изменен другими пользователями после замены всей книги: '
+                'сохранение затерло бы их изменения. Загрузите справочник заново.'
+            )
+
+    def _write_pending(self, full_rewrite: bool = False, snapshot: bool = False) -> None:
+        """Записывает несохраненные операции; вызывается под блокировкой хранилища"""
+        with self._lock:
+            version = self._version
+            pending, self._pending = self._pending, []
+            was_full_rewrite = self._full_rewrite
+            full_rewrite = (
+                full_rewrite
+                or was_full_rewrite
+                or not self.storage.accepts_changes(len(pending))
+            )
+            self._full_rewrite = False
+            contacts: list[Contact] = []
+            if full_rewrite:
+                contacts = self._snapshot_contacts() if snapshot else self._data
+
+        try:
+            if full_rewrite:
+                self.storage.write_all(contacts)
+            else:
+                self.storage.write_changes(pending)
         except SaveFileError:
+            with self._lock:
+                # Возвращаем операции, чтобы повторить их при следующем сохранении
+                self._pending[:0] = pending
+                self._full_rewrite = self._full_rewrite or was_full_rewrite
             raise
 
+        with self._lock:
+            if self._version == version:
+                self._changed = False
+
+    # --------- Изменения других процессов ---------
+
+    @property
+    def reloads_on_change(self) -> bool:
+        """Перечитывает ли refresh всю книгу после чужого сохранения (JSON без журнала)"""
+        return self.storage.reloads_on_change
+
+    def refresh(self) -> bool:
+        """
+        Подхватывает изменения справочника, сохраненные другими процессами.
+
+        Проверка дешевая — отпечаток файла и позиция журнала. Если книга
+        изменилась, в модели обновляются только отличающиеся контакты,
+        индексы целиком не перестраиваются. Если идет сохранение (оно может
+        ждать блокировку файла), проверка пропускается, не дожидаясь его:
+        сохранение само вливает чужие изменения.
+
+        Returns:
+            bool: Были ли чужие изменения
+        """
+        if not self._save_lock.acquire(blocking=False):
+            return False
+        try:
+            changes = self.storage.poll_changes()
+            if changes is not None:
+                self._merge_external(changes)
+            return changes is not None
+        finally:
+            self._save_lock.release()
+
+    def _merge_external(self, changes: ExternalChanges) -> None:
+        """
+        Применяет чужие изменения поверх книги, сохраняя несохраненные изменения модели.
+
+        Правила слияния:
+        - свое несохраненное изменение поля важнее чужого (оно запишется при сохранении);
+        - чужое удаление важнее своих правок того же контакта;
+        - свои новые контакты получают ID после чужих новых, чтобы ID не совпали.
+
+        После замены data целиком свои операции неизвестны, и чужие изменения
+        не влить — тогда сохранение отказывается затирать их до перезагрузки.
+        """
+        with self._lock:
+            if not self._ops_known:
+                self._conflict = True
+                return
+            if changes.contacts is not None:
+                records = self._diff_records(changes.contacts)
+            else:
+                records = changes.records
+            if records:
+                self._apply_external(records)
+
+    def _own_changes(self) -> tuple[list[int], dict[int, set[str]], set[int]]:
+        """Несохраненные операции модели: новые ID, измененные поля по ID и удаленные ID"""
+        added: list[int] = []
+        edited: dict[int, set[str]] = {}
+        deleted: set[int] = set()
+        for record in self._pending:
+            op = record['op']
+            if op == 'add':
+                added.append(record['contact']['id'])
+            elif op == 'add_range':
+                added.extend(range(record['first_id'], record['first_id'] + record['count']))
+            elif op == 'edit':
+                edited.setdefault(record['id'], set()).update(record['fields'])
+            elif op == 'delete':
+                deleted.add(record['id'])
+        return added, edited, deleted
+
+    def _record_at(self, pos: int) -> tuple[int, str, int, str]:
+        if isinstance(self._data, LazyContactList):
+            return self._data.record_at(pos)
+        contact = self._data[pos]
+        return contact.id, contact.name, contact.phone_number, contact.comment
+
+    def _diff_records(self, contacts: Iterable[Contact]) -> list[dict[str, Any]]:
+        """Операции в формате журнала, которые превращают книгу модели в contacts"""
+        added, _, deleted = self._own_changes()
+        own_new = set(added)
+        if isinstance(contacts, LazyContactList):
+            rows = contacts.records()
+        else:
+            rows = [(c.id, c.name, c.phone_number, c.comment) for c in contacts]
+
+        records: list[dict[str, Any]] = []
+        seen: set[int] = set()
+        for cid, *values in rows:
+            seen.add(cid)
+            pos = self._position(cid)
+            if pos is None:
+                if cid not in deleted:
+                    records.append({'op': 'add', 'contact': Contact(cid, *values).to_dict()})
+                continue
+            current = self._record_at(pos)[1:]
+            fields = {field: value
+                      for field, value, old in zip(self.TEXT_FIELDS, values, current) if value != old}
+            if not fields:
+                continue
+            if cid in own_new:
+                # Этот ID у другого процесса занял его новый контакт
+                records.append({'op': 'add', 'contact': Contact(cid, *values).to_dict()})
+            else:
+                records.append({'op': 'edit', 'id': cid, 'fields': fields})
+
+        records.extend(
+            {'op': 'delete', 'id': cid}
+            for cid in self._contact_ids() if cid not in seen and cid not in own_new
+        )
+        return records
+
+    def _apply_external(self, records: list[dict[str, Any]]) -> None:
+        """Применяет чужие операции к книге и индексам, не записывая их в свои операции"""
+        added, edited, deleted = self._own_changes()
+        moved: list[Contact] = []
+        if added and any(record['op'] == 'add' for record in records):
+            # Свои новые контакты снимаются и добавляются заново после чужих с новыми ID
+            own_new = set(added)
+            # С конца книги: снятие последнего контакта не сдвигает позиции остальных
+            for cid in reversed(added):
+                if (pos := self._position(cid)) is not None:
+                    contact = self._data[pos]
+                    moved.append(Contact(cid, contact.name, contact.phone_number, contact.comment))
+                    self._remove_at(pos, cid)
+            moved.reverse()
+            # Все записи добавления — свои новые контакты; их правки тоже уходят, поля уже в контактах
+            self._pending = [r for r in self._pending
+                             if r['op'] not in ('add', 'add_range') and r['id'] not in own_new]
+            deleted -= own_new
+
+        removed: set[int] = set()
+        try:
+            for record in records:
+                op = record['op']
+                if op == 'add':
+                    contact = Contact.from_dict(record['contact'])
+                    pos = self._position(contact.id)
+                    if pos is None:
+                        if contact.id not in deleted:
+                            self._append_contact(contact)
+                    else:
+                        # Повтор уже примененной записи — сверяем поля
+                        fields = {field: getattr(contact, field) for field in self.TEXT_FIELDS}
+                        self._apply_external_edit(pos, contact.id, fields, edited)
+                elif op == 'edit':
+                    if (pos := self._position(record['id'])) is not None:
+                        self._apply_external_edit(pos, record['id'], record['fields'], edited)
+                elif op == 'delete':
+                    if (pos := self._position(record['id'])) is not None:
+                        self._remove_at(pos, record['id'])
+                        removed.add(record['id'])
+                else:
+                    raise ValueError(f'неизвестная операция {op!r}')
+        except (KeyError, TypeError, ValueError) as e:
+            raise FileCorruptedError(f'Журнал изменений поврежден: {e}')
+        finally:
+            if removed:
+                self._pending = [r for r in self._pending if r['op'] != 'edit' or r['id'] not in removed]
+            first_id = self._data[-1].id + 1 if self._data else 1
+            for cid, contact in enumerate(moved, first_id):
+                contact.id = cid
+                self._append_contact(contact)
+            self._record_adds(moved)
+            self._version += 1
+
+    def _apply_external_edit(self, pos: int, cid: int, fields: dict[str, Any], edited: dict[int, set[str]]) -> None:
+        own_fields = edited.get(cid, ())
+        current = dict(zip(self.TEXT_FIELDS, self._record_at(pos)[1:]))
+        changed = tuple(field for field in self.TEXT_FIELDS
+                        if field in fields and field not in own_fields and fields[field] != current[field])
+        if changed:
+            self._edit_at(pos, {field: fields[field] for field in changed}, changed, record=False)
+
+    def _snapshot_contacts(self) -> list[Contact] | ColumnarContactStore | LazyContactList:
+        """Копия контактов, независимая от последующих изменений"""
+        if isinstance(self._data, (ColumnarContactStore, LazyContactList)):
+            return self._data.copy()
+        return [replace(c) for c in self._data]
+
+    def _mark_changed(self) -> None:
+        self._changed = True
+        self._version += 1
+        if self._autosaver is not None:
+            self._autosaver.notify_change()
+
+    # --------- Фоновое автосохранение ---------
+
+    @property
+    def autosave_enabled(self) -> bool:
+        return self._autosaver is not None
+
+    def start_autosave(self, interval: float = 30.0, threshold: int = 100) -> None:
+        """Запускает фоновое сохранение раз в interval секунд или после threshold изменений"""
+        if self._autosaver is not None:
+            return
+        if self._scanner is not None:
+            # fork при работающем потоке автосохранения небезопасен
+            self._scanner.threaded = True
+        self._autosaver = AutoSaver(self._autosave, interval=interval, threshold=threshold)
+        self._autosaver.start()
+
+    def stop_autosave(self) -> None:
+        """Останавливает автосохранение, дождавшись окончания текущей записи"""
+        if self._autosaver is None:
+            return
+        self._autosaver.stop()
+        self._autosaver = None
+
+    def request_save(self) -> None:
+        """Просит фоновый поток сохранить справочник, не дожидаясь записи"""
+        if self._autosaver is not None:
+            self._autosaver.request_save()
+
+    def pop_save_error(self) -> Exception | None:
+        """Возвращает очередную ошибку фонового сохранения, если она была"""
+        try:
+            return self._save_errors.get_nowait()
+        except Empty:
+            return None
+
+    def _autosave(self) -> None:
+        """Сохранение в потоке AutoSaver; ошибки не завершают поток, а ждут pop_save_error"""
+        if not self._changed:
+            return
+        try:
+            self._save(snapshot=True)
+        except Exception as e:
+            self._save_errors.put(e)
+
+    def close(self) -> None:
+        """Останавливает фоновые потоки и процессы модели"""
+        self.stop_autosave()
+        if self._scanner is not None:
+            self._scanner.close()
+
     def is_changed(self) -> bool:
         return self._changed
 
@@ -77,36 +850,264 @@ class ContactBookModel:
         if save_changes.lower() == 'y':
             self.save_file()
 
+    def get_sorted_contacts(self, first: str = '', last: str | None = None) -> Sequence[Contact]:
+        """
+        Контакты по алфавиту нормализованного имени, при равных именах — по ID.
+
+        Args:
+            first: Начало диапазона имен
+            last: Конец диапазона имен включительно вместе с именами, которые
+                с него начинаются: ('а', 'в') включает «Вера», ('ив', 'ив') —
+                все имена на «ив». None — до конца алфавита.
+
+        Returns:
+            Sequence[Contact]: Последовательность, которую можно листать срезами
+        """
+        first = first.casefold()
+        last = None if last is None else last.casefold()
+        with self._read_lock:
+            if self._names is None:
+                # Без индекса — сортировка всей книги при каждом вызове
+                upper = None if last is None else last + chr(0x10FFFF)
+                positions = sorted(
+                    (pos for pos, key in enumerate(self._keys)
+                     if key.name >= first and (upper is None or key.name < upper)),
+                    key=lambda pos: (self._keys[pos].name, self._data[pos].id),
+                )
+                return self._export([self._data[pos] for pos in positions])
+        return SortedContacts(self, first, last)
+
+    def _name_bounds(self, first: str, last: str | None) -> tuple[int, int]:
+        with self._read_lock:
+            return self._names.bounds(first, last)
+
+    def _contacts_by_name(self, first: str, last: str | None, start: int, stop: int) -> list[Contact]:
+        """Контакты в позициях [start, stop) диапазона имен first–last индекса имен"""
+        with self._read_lock:
+            low, high = self._names.bounds(first, last)
+            ids = self._names.keys_between(low + start, min(low + stop, high))
+            return self._export([self._data[pos] for cid in ids if (pos := self._position(cid)) is not None])
+
     def get_all_contacts(self) -> list[Contact]:
-        return self.data
-
-    def add_contact(self, contact: ContactAdd) -> None:
-        new_id = self.data[-1].id + 1 if self.data else 1
-        new_contact = Contact(
-            id=new_id,
-            name=contact['name'],
-            phone_number=contact['phone_number'],
-            comment=contact['comment'],
-        )
-        self.data.append(new_contact)
-        self._changed = True
+        if not self._thread_safe:
+            return self.data
+        # Копия списка: писатели меняют его на месте
+        with self._read_lock:
+            return self._export(list(self._data))
+
+    def add_contact(self, contact: ContactAdd) -> int:
+        """Добавляет контакт и возвращает его ID"""
+        with self._lock:
+            new_id = self._data[-1].id + 1 if self._data else 1
+            new_contact = Contact(
+                id=new_id,
+                name=contact['name'],
+                phone_number=contact['phone_number'],
+                comment=contact['comment'],
+            )
+            self._append_contact(new_contact)
+            self._pending.append({'op': 'add', 'contact': new_contact.to_dict()})
+            self._mark_changed()
+            return new_id
+
+    def _append_contact(self, contact: Contact) -> None:
+        """Добавляет контакт в конец книги и в индексы"""
+        key = fold_contact(contact)
+        self._data.append(contact)
+        self._keys.append(key)
+        if self._scanner is not None:
+            self._scanner.appended(key)
+        self._positions[contact.id] = len(self._data) - 1
+        self._index_contact(contact.id, key)
+
+    def add_contacts(self, contacts: Iterable[ContactAdd]) -> range:
+        """
+        Массово добавляет уже проверенные контакты.
+
+        ID выдаются подряд после последнего. Новые контакты индексируются по
+        одному, а если их больше 1/BULK_REINDEX_RATIO книги, поисковые индексы
+        перестраиваются один раз в конце. Если добавлено больше BULK_REWRITE_THRESHOLD контактов,
+        следующее сохранение перезапишет хранилище целиком вместо журнала операций.
+
+        Args:
+            contacts: Данные новых контактов
+
+        Returns:
+            range: ID добавленных контактов
+        """
+        with self._lock:
+            first_id = self._data[-1].id + 1 if self._data else 1
+            start = len(self._data)
+            try:
+                for cid, contact in enumerate(contacts, first_id):
+                    self._data.append(Contact(
+                        id=cid,
+                        name=contact['name'],
+                        phone_number=contact['phone_number'],
+                        comment=contact['comment'],
+                    ))
+            except BaseException:
+                # Ошибка во входных данных — книга остается как была
+                del self._data[start:]
+                raise
+
+            count = len(self._data) - start
+            added = range(first_id, first_id + count)
+            if not count:
+                return added
+
+            if count * self.BULK_REINDEX_RATIO > len(self._data):
+                self._rebuild_indexes()
+            else:
+                for pos in range(start, len(self._data)):
+                    contact = self._data[pos]
+                    key = fold_contact(contact)
+                    self._keys.append(key)
+                    if self._scanner is not None:
+                        self._scanner.appended(key)
+                    self._positions[contact.id] = pos
+                    self._index_contact(contact.id, key)
+            self._record_adds(self._data[start:])
+            self._mark_changed()
+            return added
+
+    def _record_adds(self, contacts: Sequence[Contact]) -> None:
+        """Записывает добавление контактов, идущих подряд с ID по порядку, в свои операции"""
+        if len(contacts) > self.BULK_REWRITE_THRESHOLD:
+            self._pending.append({'op': 'add_range', 'first_id': contacts[0].id, 'count': len(contacts)})
+            self._full_rewrite = True
+        else:
+            self._pending.extend({'op': 'add', 'contact': c.to_dict()} for c in contacts)
 
     def edit_contact(self, cid: int, updated_keys: ContactUpdate) -> None:
-        contact = self.get_contact(cid)
-        if contact is None:
-            return
+        with self._lock:
+            pos = self._position(cid)
+            changed_fields = tuple(field for field in self.TEXT_FIELDS if field in updated_keys)
+            if pos is None or not changed_fields:
+                return
+
+            self._edit_at(pos, updated_keys, changed_fields)
+            self._mark_changed()
 
-        if 'name' in updated_keys:
-            contact.name = updated_keys['name']
-            self._changed = True
-        if 'phone_number' in updated_keys:
-            contact.phone_number = updated_keys['phone_number']
-            self._changed = True
-        if 'comment' in updated_keys:
-            contact.comment = updated_keys['comment']
-            self._changed = True
+    def update_where(self,
+                     search_term: str,
+                     mode_id: Literal['1', '2', '3', '4', '5', '6'],
+                     updated_keys: ContactUpdate) -> int:
+        """
+        Изменяет все контакты, найденные find_contact(search_term, mode_id), за один проход.
+
+        Returns:
+            int: Количество измененных контактов
+        """
+        with self._lock:
+            changed_fields = tuple(field for field in self.TEXT_FIELDS if field in updated_keys)
+            if not search_term.strip() or not changed_fields:
+                return 0
 
+            # Позиции собираются до изменений: новые значения не должны влиять на выборку
+            positions = list(self._match_positions(search_term, self.SEARCH_FIELDS[int(mode_id)]))
+            for pos in positions:
+                self._edit_at(pos, updated_keys, changed_fields)
+            if positions:
+                self._mark_changed()
+            return len(positions)
+
+    def _edit_at(self,
+                 pos: int,
+                 updated_keys: ContactUpdate,
+                 changed_fields: tuple[str, ...],
+                 record: bool = True) -> None:
+        """Меняет поля контакта в позиции pos, обновляя индексы и (при record) журнал операций"""
+        contact = self._data[pos]
+        cid = contact.id
+        self._unindex_contact(cid, self._keys[pos], changed_fields)
+        if self._thread_safe and not isinstance(self._data, ColumnarContactStore):
+            # Копирование при записи: отданный читателю объект не меняется у него в руках
+            contact = replace(contact, **{field: updated_keys[field] for field in changed_fields})
+            self._data[pos] = contact
+        else:
+            if 'name' in updated_keys:
+                contact.name = updated_keys['name']
+            if 'phone_number' in updated_keys:
+                contact.phone_number = updated_keys['phone_number']
+            if 'comment' in updated_keys:
+                contact.comment = updated_keys['comment']
+        self._keys[pos] = fold_contact(contact)
+        if self._scanner is not None:
+            self._scanner.changed(pos, self._keys[pos])
+        self._index_contact(cid, self._keys[pos], changed_fields)
+        if record:
+            self._pending.append({
+                'op': 'edit',
+                'id': cid,
+                'fields': {field: updated_keys[field] for field in changed_fields},
+            })
 
     def delete_contact(self, cid: int) -> None:
-        self.data = [c for c in self.data if c.id != cid]
-        self._changed = True
+        with self._lock:
+            pos = self._position(cid)
+            if pos is not None:
+                self._remove_at(pos, cid)
+                self._pending.append({'op': 'delete', 'id': cid})
+            self._mark_changed()
+
+    def _remove_at(self, pos: int, cid: int) -> None:
+        """Удаляет контакт cid в позиции pos из книги и индексов"""
+        self._unindex_contact(cid, self._keys[pos])
+        del self._data[pos]
+        del self._keys[pos]
+        if self._scanner is not None:
+            self._scanner.removed(pos)
+        del self._positions[cid]
+        # Все позиции правее удаленной сдвинулись на единицу влево
+        if self._stale_from is None or pos < self._stale_from:
+            self._stale_from = pos
+        if self._stale_from >= len(self._data):
+            self._stale_from = None
+
+    def delete_contacts(self, ids: Iterable[int]) -> int:
+        """
+        Удаляет контакты с переданными ID за один проход по книге.
+        Несуществующие ID пропускаются.
+
+        Returns:
+            int: Количество удаленных контактов
+        """
+        with self._lock:
+            positions = {pos for cid in set(ids) if (pos := self._position(cid)) is not None}
+            return self._delete_positions(positions)
+
+    def delete_where(self, search_term: str, mode_id: Literal['1', '2', '3', '4', '5', '6']) -> int:
+        """
+        Удаляет все контакты, найденные find_contact(search_term, mode_id), за один проход.
+
+        Returns:
+            int: Количество удаленных контактов
+        """
+        with self._lock:
+            if not search_term.strip():
+                return 0
+            positions = set(self._match_positions(search_term, self.SEARCH_FIELDS[int(mode_id)]))
+            return self._delete_positions(positions)
+
+    def _delete_positions(self, positions: set[int]) -> int:
+        if not positions:
+            return 0
+
+        for pos in sorted(positions):
+            cid = self._data[pos].id
+            self._unindex_contact(cid, self._keys[pos])
+            self._pending.append({'op': 'delete', 'id': cid})
+
+        keep = [pos for pos in range(len(self._data)) if pos not in positions]
+        if isinstance(self._data, (ColumnarContactStore, LazyContactList)):
+            self._data.delete_rows(positions)
+        else:
+            data = self._data
+            data[:] = [data[pos] for pos in keep]
+        self._keys = [self._keys[pos] for pos in keep]
+        if self._scanner is not None:
+            self._scanner.replaced()
+        self._rebuild_positions()
+        self._mark_changed()
+        return len(positions)
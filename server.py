@@ -0,0 +1,399 @@
+"""
+HTTP/JSON API справочника на asyncio.
+
+Запуск:
+    python server.py data.json --port 8080
+
+Маршруты:
+    GET    /contacts?q=...&mode=4&offset=0&limit=20  — поиск или весь список, постранично
+    GET    /contacts/<id>                              — контакт по ID
+    POST   /contacts                                   — добавить и сохранить контакт, ответ {"id": ...}
+    PATCH  /contacts/<id>                              — изменить поля контакта
+    DELETE /contacts/<id>                              — удалить контакт
+    POST   /save                                       — сохранить справочник
+
+Соединения HTTP/1.1 по умолчанию постоянные; запросы, отправленные подряд
+без ожидания ответов (pipelining), обрабатываются и получают ответы по порядку.
+"""
+import argparse
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Awaitable, Callable
+from urllib.parse import parse_qsl, urlsplit
+from model import ContactBookModel
+from custom_types import Contact, ContactUpdate
+from custom_errors import (
+    PhoneBookValueError,
+    SaveFileError,
+    FileCorruptedError,
+    InvalidFileFormatError,
+    ContactLoadError,
+)
+from main import create_storage, positive_int
+
+# Ограничения на размер запроса
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class HttpError(Exception):
+    """Ошибка обработки запроса, которая превращается в ответ с кодом status"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes = b''
+    keep_alive: bool = True
+    # Номер контакта из пути /contacts/<id>
+    params: tuple[str, ...] = field(default_factory=tuple)
+
+    def json(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.body or b'{}')
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f'Тело запроса не является JSON: {e}')
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Тело запроса должно быть JSON-объектом')
+        return data
+
+
+Response = tuple[HTTPStatus, Any]
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class ModelGate:
+    """
+    Согласование доступа к модели между циклом событий и пулом потоков.
+
+    Поиски в пуле потоков идут как читатели и могут выполняться параллельно;
+    изменения выполняются в цикле событий как писатель — только когда в пуле
+    нет читателей. Ожидающий писатель не пропускает новых читателей вперед.
+    Модель сервера сама потокобезопасна; шлюз нужен, чтобы цикл событий не
+    ждал ее блокировку записи, пока в пуле идут поиски.
+    """
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writer_waiting = 0
+
+    @asynccontextmanager
+    async def reading(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writer_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def writing(self) -> AsyncIterator[None]:
+        async with self._condition:
+            self._writer_waiting += 1
+            try:
+                await self._condition.wait_for(lambda: not self._readers)
+                # Писатель держит блокировку условия, поэтому новые читатели ждут его окончания
+                yield
+            finally:
+                self._writer_waiting -= 1
+                self._condition.notify_all()
+
+
+class ContactBookServer:
+    """HTTP/JSON сервер над ContactBookModel"""
+
+    # С какого размера книги поиск выполняется в пуле потоков, а не в цикле событий
+    OFFLOAD_THRESHOLD = 10_000
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 1000
+
+    def __init__(self, model: ContactBookModel, search_workers: int = 4, keep_alive_timeout: float = 15.0):
+        self.model = model
+        self.keep_alive_timeout = keep_alive_timeout
+        self._executor = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix='search')
+        self._gate = ModelGate()
+        self._routes: list[tuple[re.Pattern, dict[str, Handler]]] = [
+            (re.compile(r'/contacts'), {'GET': self.list_contacts, 'POST': self.add_contact}),
+            (re.compile(r'/contacts/(\d+)'), {
+                'GET': self.get_contact, 'PATCH': self.edit_contact, 'DELETE': self.delete_contact,
+            }),
+            (re.compile(r'/save'), {'POST': self.save}),
+        ]
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080) -> asyncio.Server:
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_SIZE)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    # --------- Соединение ---------
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HttpError as e:
+                    writer.write(self._render(e.status, {'error': e.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                status, payload = await self._dispatch(request)
+                writer.write(self._render(status, payload, request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request | None:
+        """Читает очередной запрос; None — клиент закрыл соединение между запросами"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Неполный запрос')
+        except asyncio.LimitOverrunError:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, 'Слишком большие заголовки')
+
+        try:
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            method, target, version = request_line.split(' ')
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Некорректная строка запроса')
+        if version not in ('HTTP/1.1', 'HTTP/1.0'):
+            raise HttpError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED, 'Поддерживаются только HTTP/1.0 и HTTP/1.1')
+
+        headers: dict[str, str] = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        if 'transfer-encoding' in headers:
+            raise HttpError(HTTPStatus.NOT_IMPLEMENTED, 'Передача тела частями не поддерживается')
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Некорректный Content-Length')
+        if not 0 <= length <= MAX_BODY_SIZE:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'Слишком большое тело запроса')
+        try:
+            body = await reader.readexactly(length) if length else b''
+        except asyncio.IncompleteReadError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Неполное тело запроса')
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        url = urlsplit(target)
+        return Request(method.upper(), url.path.rstrip('/') or '/', dict(parse_qsl(url.query)),
+                       headers, body, keep_alive)
+
+    @staticmethod
+    def _render(status: HTTPStatus, payload: Any, keep_alive: bool) -> bytes:
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+            f'Content-Type: application/json; charset=utf-8\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+        )
+        return head.encode('latin-1') + body
+
+    async def _dispatch(self, request: Request) -> Response:
+        for pattern, handlers in self._routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            handler = handlers.get(request.method)
+            if handler is None:
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f'Метод {request.method} не поддерживается'}
+            request.params = match.groups()
+            try:
+                return await handler(request)
+            except HttpError as e:
+                return e.status, {'error': e.message}
+            except PhoneBookValueError as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+            except SaveFileError as e:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+        return HTTPStatus.NOT_FOUND, {'error': f'Путь {request.path} не найден'}
+
+    async def _offload(self, func: Callable[[], Any]) -> Any:
+        """Выполняет чтение модели в пуле потоков, не блокируя цикл событий"""
+        async with self._gate.reading():
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func)
+
+    # --------- Обработчики ---------
+
+    async def list_contacts(self, request: Request) -> Response:
+        offset = self._int_param(request, 'offset', 0)
+        limit = min(self._int_param(request, 'limit', self.DEFAULT_PAGE_SIZE), self.MAX_PAGE_SIZE)
+        term = request.query.get('q')
+        mode = request.query.get('mode', '4')
+        if mode not in {str(key) for key in ContactBookModel.SEARCH_FIELDS}:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f'Неизвестный режим поиска {mode!r}')
+
+        # Один лишний контакт показывает, есть ли следующая страница
+        stop = offset + limit + 1
+        if term is None:
+            page = self.model.data[offset:stop]
+        elif len(self.model.data) >= self.OFFLOAD_THRESHOLD:
+            page = (await self._offload(lambda: self.model.find_contact(term, mode, stop)))[offset:]
+        else:
+            page = self.model.find_contact(term, mode, stop)[offset:]
+
+        return HTTPStatus.OK, {
+            'items': [contact.to_dict() for contact in page[:limit]],
+            'offset': offset,
+            'limit': limit,
+            'next_offset': offset + limit if len(page) > limit else None,
+        }
+
+    async def get_contact(self, request: Request) -> Response:
+        contact = self.model.get_contact(int(request.params[0]))
+        if contact is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, 'Контакт не найден')
+        return HTTPStatus.OK, contact.to_dict()
+
+    async def add_contact(self, request: Request) -> Response:
+        data = request.json()
+        name = str(data.get('name') or '').strip()
+        Contact.validate_name(name)
+        phone_number = Contact.parse_phone_number(str(data.get('phone_number') or '').strip())
+        comment = str(data.get('comment') or '').strip()
+        # Контакт сохраняется сразу: ID несохраненного контакта мог бы смениться при слиянии
+        # с новыми контактами других процессов, а клиент уже получил бы старый.
+        # Запись идет в пуле, как и POST /save
+        cid = await self._offload(lambda: self.model.add_contact_saved(
+            {'name': name, 'phone_number': phone_number, 'comment': comment}
+        ))
+        return HTTPStatus.CREATED, {'id': cid}
+
+    async def edit_contact(self, request: Request) -> Response:
+        cid = int(request.params[0])
+        data = request.json()
+        updated: ContactUpdate = {}
+        if 'name' in data:
+            updated['name'] = str(data['name'] or '').strip()
+            Contact.validate_name(updated['name'])
+        if 'phone_number' in data:
+            updated['phone_number'] = Contact.parse_phone_number(str(data['phone_number'] or '').strip())
+        if 'comment' in data:
+            updated['comment'] = str(data['comment'] or '').strip()
+        if not updated:
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'Нет полей для изменения')
+
+        async with self._gate.writing():
+            if not self.model.has_contact(cid):
+                raise HttpError(HTTPStatus.NOT_FOUND, 'Контакт не найден')
+            self.model.edit_contact(cid, updated)
+            contact = self.model.get_contact(cid)
+        return HTTPStatus.OK, contact.to_dict()
+
+    async def delete_contact(self, request: Request) -> Response:
+        cid = int(request.params[0])
+        async with self._gate.writing():
+            if not self.model.has_contact(cid):
+                raise HttpError(HTTPStatus.NOT_FOUND, 'Контакт не найден')
+            self.model.delete_contact(cid)
+        return HTTPStatus.NO_CONTENT, None
+
+    async def save(self, request: Request) -> Response:
+        # Запись на диск идет в пуле как чтение: изменения из цикла событий ждут ее окончания,
+        # а слияние чужих изменений в книгу само берет блокировку записи модели
+        await self._offload(self.model.save_file)
+        return HTTPStatus.OK, {'saved': True}
+
+    @staticmethod
+    def _int_param(request: Request, name: str, default: int) -> int:
+        value = request.query.get(name)
+        if value is None:
+            return default
+        if not value.isdigit():
+            raise HttpError(HTTPStatus.BAD_REQUEST, f'Параметр {name} должен быть неотрицательным числом')
+        return int(value)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='HTTP/JSON API телефонного справочника')
+    parser.add_argument('file', nargs='?', default='data.json', help='путь к файлу справочника')
+    parser.add_argument('--storage', choices=['json', 'sqlite', 'binary', 'sharded'],
+                        help='формат хранилища (по умолчанию определяется по расширению файла)')
+    parser.add_argument('--shard-size', type=positive_int, metavar='N',
+                        help='контактов в шарде шардированного справочника (по умолчанию из манифеста или 10000)')
+    parser.add_argument('--journal', action='store_true',
+                        help='сохранять изменения в журнал вместо полной перезаписи файла')
+    parser.add_argument('--cache', action=argparse.BooleanOptionalAction, default=False,
+                        help='хранить рядом с JSON-справочником кеш разобранных контактов (<файл>.cache)')
+    parser.add_argument('--host', default='127.0.0.1', help='адрес для входящих соединений (по умолчанию 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='порт (по умолчанию 8080, 0 — любой свободный)')
+    parser.add_argument('--search-workers', type=positive_int, default=4, metavar='N',
+                        help='потоков для поиска по большой книге (по умолчанию 4)')
+    parser.add_argument('--scan-workers', type=positive_int, default=1, metavar='N',
+                        help='процессов для поиска регулярными выражениями по большой книге (по умолчанию 1)')
+    parser.add_argument('--autosave', type=float, metavar='SECONDS',
+                        help='сохранять изменения в фоне каждые SECONDS секунд')
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    # Поиски в пуле потоков идут одновременно с сохранением и автосохранением,
+    # которые вливают в книгу изменения других пользователей
+    model = ContactBookModel(args.file, storage=create_storage(args), scan_workers=args.scan_workers,
+                             thread_safe=True)
+    try:
+        model.load_data()
+    except (FileCorruptedError, InvalidFileFormatError, ContactLoadError) as e:
+        print(f'Ошибка при загрузке справочника: {e}')
+        return
+    if args.autosave is not None:
+        model.start_autosave(interval=args.autosave)
+
+    app = ContactBookServer(model, search_workers=args.search_workers)
+    server = await app.start(args.host, args.port)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f'Сервер запущен на http://{host}:{port}', flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.close()
+        if model.is_changed():
+            model.save_file()
+        model.close()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,50 @@
+import threading
+from tools.autosave import AutoSaver
+
+
+class TestAutoSaver:
+    """Тесты для класса AutoSaver"""
+
+    def test_saves_after_threshold(self):
+        """Должен сохранить после заданного числа изменений"""
+        saved = threading.Event()
+        saver = AutoSaver(saved.set, interval=60, threshold=3)
+        saver.start()
+        try:
+            saver.notify_change()
+            saver.notify_change()
+            assert not saved.wait(0.05)
+            saver.notify_change()
+            assert saved.wait(2)
+        finally:
+            saver.stop()
+
+    def test_saves_after_interval(self):
+        """Должен сохранить по истечении интервала"""
+        saved = threading.Event()
+        saver = AutoSaver(saved.set, interval=0.05, threshold=100)
+        saver.start()
+        try:
+            assert saved.wait(2)
+        finally:
+            saver.stop()
+
+    def test_saves_on_request(self):
+        """Должен сохранить по явному запросу"""
+        saved = threading.Event()
+        saver = AutoSaver(saved.set, interval=60, threshold=100)
+        saver.start()
+        try:
+            saver.request_save()
+            assert saved.wait(2)
+        finally:
+            saver.stop()
+
+    def test_stop_joins_thread(self):
+        """Должен остановить поток"""
+        saver = AutoSaver(lambda: None, interval=60, threshold=100)
+        saver.start()
+
+        saver.stop()
+
+        assert not saver._thread.is_alive()
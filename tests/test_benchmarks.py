@@ -0,0 +1,24 @@
+from benchmarks.generator import generate_contacts, write_book
+from tools.file_reader import FileReader
+
+
+class TestGenerator:
+    """Тесты генератора синтетических справочников"""
+
+    def test_deterministic(self):
+        """Один и тот же seed дает одну и ту же книгу"""
+        assert list(generate_contacts(200, seed=7)) == list(generate_contacts(200, seed=7))
+        assert list(generate_contacts(200, seed=7)) != list(generate_contacts(200, seed=8))
+
+    def test_contacts_are_valid(self):
+        """ID идут подряд, имена кириллические, телефоны положительные"""
+        contacts = list(generate_contacts(500))
+        assert [c.id for c in contacts] == list(range(1, 501))
+        assert all(c.name and c.name[0].isalpha() and not c.name.isascii() for c in contacts)
+        assert all(c.phone_number > 0 for c in contacts)
+
+    def test_write_book_is_readable(self, tmp_path):
+        """Записанная книга читается FileReader"""
+        path = tmp_path / 'book.json'
+        write_book(path, 100)
+        assert FileReader(path).read() == list(generate_contacts(100))
@@ -0,0 +1,119 @@
+import pytest
+from custom_types import Contact
+from custom_errors import FileCorruptedError, InvalidFileFormatError
+from model import ContactBookModel
+from tools.binary_book import BinaryFileWriter, BinaryStorage, MappedContactBook, HEADER
+from tools.lazy_contacts import LazyContactList
+
+
+@pytest.fixture
+def contacts(sample_contacts):
+    """Образцы контактов и контакт с кириллицей и пустым комментарием"""
+    return sample_contacts + [Contact(id=5, name='Анна Серова', phone_number=79501234567, comment='')]
+
+
+class TestMappedContactBook:
+    """Тесты для записи и чтения бинарного файла справочника"""
+
+    @pytest.fixture
+    def book(self, tmp_path, contacts):
+        """Фикстура с отображенным в память файлом"""
+        file_path = tmp_path / 'contacts.pbk'
+        BinaryFileWriter(file_path).write(contacts)
+        with MappedContactBook(file_path) as book:
+            yield book
+
+    def test_round_trip(self, book, contacts):
+        """Должен вернуть те же контакты в том же порядке"""
+        assert len(book) == 3
+        assert list(book) == contacts
+        assert book[-1] == contacts[-1]
+        assert book[1:] == contacts[1:]
+
+    def test_index_out_of_range(self, book):
+        """Должен выбросить IndexError для позиции вне книги"""
+        with pytest.raises(IndexError):
+            book[3]
+
+    def test_lookup_by_id(self, book, contacts):
+        """Должен находить контакт по ID двоичным поиском"""
+        assert book.sorted_ids
+        assert book.position(5) == 2
+        assert book.get(2) == contacts[1]
+        assert book.get(3) is None
+        assert book.get(99) is None
+
+    def test_lookup_by_id_unsorted(self, tmp_path, contacts):
+        """При неупорядоченных ID должен искать линейным просмотром"""
+        file_path = tmp_path / 'contacts.pbk'
+        BinaryFileWriter(file_path).write(contacts[::-1])
+
+        with MappedContactBook(file_path) as book:
+            assert not book.sorted_ids
+            assert book.position(1) == 2
+            assert book.get(5).name == 'Анна Серова'
+            assert book.get(3) is None
+
+    def test_empty_book(self, tmp_path):
+        """Пустая книга состоит из одного заголовка"""
+        file_path = tmp_path / 'contacts.pbk'
+        BinaryFileWriter(file_path).write([])
+
+        assert file_path.stat().st_size == HEADER.size
+        with MappedContactBook(file_path) as book:
+            assert len(book) == 0
+            assert book.get(1) is None
+
+    def test_not_a_binary_book(self, tmp_path):
+        """Файл другого формата не должен открываться"""
+        file_path = tmp_path / 'contacts.pbk'
+        file_path.write_text('[{"id": 1, "name": "Alex", "phone_number": 12345678, "comment": ""}]')
+
+        with pytest.raises(InvalidFileFormatError):
+            MappedContactBook(file_path)
+
+    @pytest.mark.parametrize("size", [0, HEADER.size + 10])
+    def test_truncated_file(self, tmp_path, contacts, size):
+        """Обрезанный файл должен считаться поврежденным"""
+        file_path = tmp_path / 'contacts.pbk'
+        BinaryFileWriter(file_path).write(contacts)
+        with open(file_path, 'r+b') as file:
+            file.truncate(size)
+
+        with pytest.raises(FileCorruptedError):
+            MappedContactBook(file_path)
+
+
+class TestBinaryStorage:
+    """Тесты для хранилища BinaryStorage"""
+
+    def test_load(self, tmp_path, contacts):
+        """Должен загрузить контакты списком или потоком"""
+        storage = BinaryStorage(tmp_path / 'contacts.pbk')
+        storage.write_all(contacts)
+
+        loaded = storage.load()
+        assert isinstance(loaded, LazyContactList)
+        assert not loaded.is_materialized(0)
+        assert loaded == contacts
+        assert list(storage.load(stream=True)) == contacts
+
+    def test_load_missing_file(self, tmp_path):
+        """Отсутствующий файл — FileNotFoundError, как и у других хранилищ"""
+        with pytest.raises(FileNotFoundError):
+            BinaryStorage(tmp_path / 'contacts.pbk').load()
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_model_round_trip(self, tmp_path, compact):
+        """Модель должна сохранять и загружать книгу через бинарное хранилище"""
+        file_path = tmp_path / 'contacts.pbk'
+        model = ContactBookModel(str(file_path), storage=BinaryStorage(file_path), compact=compact)
+        model.load_data()
+        model.add_contact({'name': 'Анна', 'phone_number': 79501234567, 'comment': 'коллега'})
+        model.add_contact({'name': 'Bob', 'phone_number': 987654321, 'comment': ''})
+        model.save_file()
+
+        reloaded = ContactBookModel(str(file_path), storage=BinaryStorage(file_path), compact=compact)
+        reloaded.load_data()
+        assert [c.name for c in reloaded.data] == ['Анна', 'Bob']
+        assert [c.id for c in reloaded.find_contact('анна', '1')] == [1]
@@ -0,0 +1,65 @@
+import random
+import pytest
+from tools.bk_tree import BKTree, damerau_levenshtein
+
+
+class TestDamerauLevenshtein:
+    """Тесты для функции damerau_levenshtein"""
+
+    @pytest.mark.parametrize("a,b,expected", [
+        ('иванов', 'иванов', 0),
+        ('иванов', 'иваноф', 1),
+        ('иванов', 'ивнаов', 1),
+        ('анна', 'ана', 1),
+        ('kitten', 'sitting', 3),
+        ('ca', 'abc', 2),
+        ('', 'abc', 3),
+    ])
+    def test_distance(self, a, b, expected):
+        """Вставка, удаление, замена и перестановка стоят по единице"""
+        assert damerau_levenshtein(a, b) == expected
+        assert damerau_levenshtein(b, a) == expected
+
+
+class TestBKTree:
+    """Тесты для класса BKTree"""
+
+    @pytest.fixture
+    def tree(self):
+        tree = BKTree()
+        for key, word in enumerate(['иванов', 'иванова', 'петров', 'сидоров', 'анна', 'инна'], 1):
+            tree.add(key, word)
+        tree.add(7, 'анна')
+        return tree
+
+    def test_search(self, tree):
+        """Должен найти слова в пределах расстояния вместе с ключами"""
+        found = {word: (distance, keys) for distance, word, keys in tree.search('иваноф', 2)}
+
+        assert found == {'иванов': (1, {1}), 'иванова': (2, {2})}
+
+    def test_search_shared_word(self, tree):
+        """Одно слово хранится один раз со всеми ключами"""
+        found = {word: keys for _, word, keys in tree.search('ана', 1)}
+
+        assert found == {'анна': {5, 7}}
+
+    def test_remove(self, tree):
+        """Удаленный ключ не попадает в результаты, пустой узел пропускается"""
+        tree.remove(5, 'анна')
+        tree.remove(7, 'анна')
+
+        assert [word for _, word, _ in tree.search('анна', 1)] == ['инна']
+
+    def test_search_matches_brute_force(self):
+        """Поиск по дереву совпадает с полным перебором"""
+        rnd = random.Random(1)
+        words = {''.join(rnd.choice('абвгд') for _ in range(rnd.randint(1, 7))) for _ in range(500)}
+        tree = BKTree()
+        for key, word in enumerate(words):
+            tree.add(key, word)
+
+        for query in ['аб', 'гдеаб', 'ввв', 'абвгдаб']:
+            for max_distance in (1, 2):
+                expected = {w for w in words if damerau_levenshtein(query, w) <= max_distance}
+                assert {word for _, word, _ in tree.search(query, max_distance)} == expected
@@ -0,0 +1,118 @@
+import json
+import os
+import pytest
+from unittest.mock import patch
+from model import ContactBookModel
+from tools import FileReader, FileWriter
+from tools.book_cache import BookCache, contact_columns
+from tools.columnar_store import ColumnarContactStore
+from tools.storage import JsonStorage
+
+
+@pytest.fixture
+def book_path(tmp_path, sample_contacts):
+    """JSON-справочник из образцов контактов"""
+    file_path = tmp_path / 'contacts.json'
+    FileWriter(file_path).write(sample_contacts)
+    return file_path
+
+
+class TestBookCache:
+    """Тесты для кеша разобранного справочника"""
+
+    def test_store_and_load(self, book_path, sample_contacts):
+        """Должен вернуть сохраненные колонки, пока файл не менялся"""
+        cache = BookCache(book_path)
+        columns = contact_columns(sample_contacts)
+        cache.store(cache.fingerprint(), columns)
+
+        assert cache.load() == columns
+        assert BookCache.to_contacts(cache.load(), lazy=False) == sample_contacts
+
+    def test_stale_after_file_change(self, book_path, sample_contacts):
+        """Изменение содержимого при тех же размере и mtime тоже делает кеш устаревшим"""
+        cache = BookCache(book_path)
+        cache.store(cache.fingerprint(), contact_columns(sample_contacts))
+        stat = book_path.stat()
+
+        book_path.write_text(book_path.read_text(encoding='utf-8').replace('Alex', 'Anna'), encoding='utf-8')
+        os.utime(book_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert book_path.stat().st_size == stat.st_size
+        assert cache.load() is None
+
+    @pytest.mark.parametrize("content", [b'', b'garbage', b'\xe9\x00'])
+    def test_corrupted_cache_is_a_miss(self, book_path, content):
+        """Поврежденный кеш должен считаться промахом"""
+        cache = BookCache(book_path)
+        cache.cache_path.write_bytes(content)
+
+        assert cache.load() is None
+
+    def test_to_contacts_compact(self, sample_contacts):
+        """Из колонок должно строиться колоночное хранилище"""
+        store = BookCache.to_contacts(contact_columns(sample_contacts), compact=True)
+
+        assert isinstance(store, ColumnarContactStore)
+        assert [c.to_contact() for c in store] == sample_contacts
+
+
+class TestCachedJsonStorage:
+    """Тесты загрузки JSON-справочника через кеш"""
+
+    def test_load_creates_cache_and_uses_it(self, book_path, sample_contacts):
+        """Первая загрузка создает кеш, следующая не разбирает JSON"""
+        storage = JsonStorage(book_path, lazy=True, cache=True)
+        assert storage.load() == sample_contacts
+        assert storage.cache.cache_path.exists()
+
+        with patch.object(FileReader, 'read', side_effect=AssertionError('JSON разобран повторно')):
+            assert storage.load() == sample_contacts
+
+    def test_model_save_regenerates_cache(self, book_path):
+        """После сохранения кеш должен соответствовать новому файлу"""
+        book = ContactBookModel(str(book_path), cache=True)
+        book.load_data()
+        book.add_contact({'name': 'Анна', 'phone_number': 79501234567, 'comment': ''})
+        book.save_file()
+
+        cache = BookCache(book_path)
+        assert cache.load() is not None
+        assert cache.load()[1] == ['Alex', 'Bob', 'Анна']
+
+        reloaded = ContactBookModel(str(book_path), cache=True)
+        reloaded.load_data()
+        assert [c.id for c in reloaded.find_contact('анна', '1')] == [3]
+
+    def test_external_edit_is_picked_up(self, book_path):
+        """Изменение файла другой программой должно читаться из файла, а не из кеша"""
+        ContactBookModel(str(book_path), cache=True).load_data()
+        data = json.loads(book_path.read_text(encoding='utf-8'))
+        data.append({'id': 3, 'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        book_path.write_text(json.dumps(data), encoding='utf-8')
+
+        book = ContactBookModel(str(book_path), cache=True)
+        book.load_data()
+
+        assert [c.name for c in book.data] == ['Alex', 'Bob', 'John']
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_journal_replayed_over_cache(self, book_path, compact):
+        """Журнал должен применяться поверх книги из кеша"""
+        book = ContactBookModel(str(book_path), journal=True, cache=True, compact=compact)
+        book.load_data()
+        book.edit_contact(1, {'name': 'Александр'})
+        book.save_file()
+
+        reloaded = ContactBookModel(str(book_path), journal=True, cache=True, compact=compact)
+        reloaded.load_data()
+        assert [c.name for c in reloaded.data] == ['Александр', 'Bob']
+        assert reloaded.get_contact(1).name == 'Александр'
+
+    def test_missing_file(self, tmp_path):
+        """Отсутствующий файл — по-прежнему пустая книга без кеша"""
+        book = ContactBookModel(str(tmp_path / 'missing.json'), cache=True)
+        book.load_data()
+
+        assert book.data == []
+        assert not (tmp_path / 'missing.json.cache').exists()
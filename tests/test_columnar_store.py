@@ -0,0 +1,89 @@
+import pytest
+from custom_types import Contact
+from tools.columnar_store import ColumnarContactStore, ContactRecord
+
+
+class TestColumnarContactStore:
+    """Тесты для класса ColumnarContactStore"""
+
+    @pytest.fixture
+    def store(self, sample_contacts):
+        """Фикстура с хранилищем из образцов контактов"""
+        return ColumnarContactStore(sample_contacts)
+
+    def test_records_match_contacts(self, store, sample_contacts):
+        """Представления должны возвращать поля исходных контактов"""
+        assert len(store) == 2
+        assert list(store) == sample_contacts
+        assert store[1].to_dict() == sample_contacts[1].to_dict()
+        assert store[-1].id == 2
+        assert store.id_at(0) == 1
+
+    def test_index_out_of_range(self, store):
+        """Должен вызвать IndexError для несуществующей строки"""
+        with pytest.raises(IndexError):
+            store[2]
+
+    def test_set_fields_through_record(self, store):
+        """Изменение полей представления должно попадать в колонки"""
+        record = store[0]
+
+        record.name = 'Александр'
+        record.phone_number = 79001234567
+        record.comment = ''
+
+        assert store[0].to_contact() == Contact(id=1, name='Александр', phone_number=79001234567, comment='')
+
+    def test_delete_and_insert(self, store):
+        """Удаление и вставка должны сдвигать строки"""
+        store.insert(0, Contact(id=7, name='Первый', phone_number=1234567, comment='x'))
+        del store[1]
+
+        assert [c.id for c in store] == [7, 2]
+        assert store[0].name == 'Первый'
+        assert store[1].name == 'Bob'
+
+    def test_heap_compaction_keeps_values(self):
+        """Переупаковка кучи не должна портить строки"""
+        store = ColumnarContactStore(
+            Contact(id=i, name=f'Имя {i}', phone_number=1000000 + i, comment='к' * 50) for i in range(100)
+        )
+        for _ in range(5):
+            for record in store:
+                record.comment = record.comment[::-1] + 'ж'
+
+        assert store._garbage * 2 <= len(store._heap)
+        assert store[42].name == 'Имя 42'
+        assert store[42].comment.startswith('ж')
+
+    def test_copy_is_independent(self, store):
+        """Копия не должна меняться вместе с оригиналом"""
+        clone = store.copy()
+
+        store[0].name = 'Changed'
+        del store[1]
+
+        assert [c.name for c in clone] == ['Alex', 'Bob']
+
+    def test_record_equality(self, store, sample_contacts):
+        """Представление должно сравниваться с Contact по значениям полей"""
+        assert store[0] == sample_contacts[0]
+        assert sample_contacts[0] == store[0]
+        assert store[0] != store[1]
+        assert isinstance(store[0], ContactRecord)
+
+    def test_memory_usage_per_contact(self, store):
+        """Служебные данные должны занимать 40 байт на контакт плюс текст"""
+        text = sum(len(c.name.encode()) + len(c.comment.encode()) for c in store)
+
+        assert store.memory_usage() == 40 * len(store) + text
+
+    def test_delete_rows(self, sample_contacts):
+        """Должен удалить несколько строк за один проход"""
+        contacts = sample_contacts + [Contact(id=3, name='Carl', phone_number=555555555, comment='')]
+        store = ColumnarContactStore(contacts)
+
+        store.delete_rows({0, 2})
+
+        assert list(store) == [contacts[1]]
+        assert store._garbage == len('Alex') + len('abc') + len('Carl')
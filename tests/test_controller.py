@@ -18,8 +18,13 @@ class TestContactBookController:
         """Фикстура для мокирования модели"""
         model = Mock()
         model.get_all_contacts.return_value = sample_contacts
-        model.get_contact_ids.return_value = [1, 2]
+        model.get_sorted_contacts.return_value = sample_contacts
+        model.has_contact.side_effect = lambda cid: cid in (1, 2)
         model.is_changed.return_value = False
+        model.autosave_enabled = False
+        model.pop_save_error.return_value = None
+        model.refresh.return_value = False
+        model.reloads_on_change = False
         return model
 
     @pytest.fixture
@@ -91,11 +96,35 @@ class TestContactBookController:
     # ==================== Тесты для обработчиков команд ====================
 
     def test_handle_show_all_contacts(self, controller, mock_model, mock_view, sample_contacts):
-        """Должен показать все контакты"""
+        """Должен показать все контакты по алфавиту"""
         controller._handle_show_all_contacts()
 
-        mock_model.get_all_contacts.assert_called_once()
+        mock_model.get_sorted_contacts.assert_called_once_with()
+        # Контакты помещаются на одну страницу — навигация не нужна
         mock_view.show_contacts.assert_called_once_with(sample_contacts)
+        mock_view.get_page_command.assert_not_called()
+
+    def test_show_pages_navigation(self, mock_model, mock_view):
+        """Должен листать страницы вперед и назад и выходить по q"""
+        controller = ContactBookController(mock_model, mock_view, page_size=2)
+        contacts = list(range(5))
+        mock_view.get_page_command.side_effect = ['', 'n', 'p', 'q']
+
+        controller._show_pages(contacts)
+
+        shown = [c.args[0] for c in mock_view.show_contacts.call_args_list]
+        assert shown == [[0, 1], [2, 3], [4], [2, 3]]
+        mock_view.show_page_status.assert_called_with(2, 3, 5)
+
+    def test_show_pages_stops_after_last_page(self, mock_model, mock_view):
+        """Переход вперед с последней страницы завершает просмотр"""
+        controller = ContactBookController(mock_model, mock_view, page_size=2)
+        mock_view.get_page_command.return_value = ''
+
+        controller._show_pages(list(range(3)))
+
+        assert mock_view.show_contacts.call_count == 2
+        assert mock_view.get_page_command.call_count == 2
 
     def test_handle_save_success(self, controller, mock_model, mock_view):
         """Должен успешно сохранить файл"""
@@ -113,6 +142,47 @@ class TestContactBookController:
         mock_model.save_file.assert_called_once()
         mock_view.show_message.assert_called_once_with('Упс, что-то пошло не так\nTest error')
 
+    def test_handle_save_with_autosave(self, controller, mock_model, mock_view):
+        """При включенном автосохранении должен запросить фоновое сохранение"""
+        mock_model.autosave_enabled = True
+
+        controller._handle_save()
+
+        mock_model.request_save.assert_called_once()
+        mock_model.save_file.assert_not_called()
+        mock_view.show_message.assert_called_once_with('Сохранение запущено в фоне.')
+
+    def test_show_save_errors(self, controller, mock_model, mock_view):
+        """Должен показать все накопившиеся ошибки фонового сохранения"""
+        errors = [SaveFileError('disk full'), None]
+        mock_model.pop_save_error.side_effect = lambda: errors.pop(0)
+
+        controller._show_save_errors()
+
+        mock_view.show_message.assert_called_once_with('Ошибка фонового сохранения:\ndisk full')
+
+    def test_refresh_book(self, controller, mock_model, mock_view):
+        """Должен сообщить, что загружены изменения других пользователей"""
+        mock_model.refresh.return_value = True
+
+        controller._refresh_book()
+
+        mock_view.show_message.assert_called_once_with(
+            'Справочник обновлен: загружены изменения других пользователей.'
+        )
+
+    def test_refresh_book_suggests_journal_once(self, controller, mock_model, mock_view):
+        """Без журнала при чужих изменениях должен один раз посоветовать --journal"""
+        mock_model.refresh.return_value = True
+        mock_model.reloads_on_change = True
+
+        controller._refresh_book()
+        controller._refresh_book()
+
+        messages = [call.args[0] for call in mock_view.show_message.call_args_list]
+        assert sum('--journal' in message for message in messages) == 1
+        assert len(messages) == 3
+
     def test_handle_add_contact_success(self, controller, mock_model, mock_view):
         """Должен добавить новый контакт"""
         mock_view.get_contact_name.return_value = 'John'
@@ -159,6 +229,49 @@ class TestContactBookController:
         mock_model.find_contact.assert_called_once_with('Alex', 1)
         mock_view.show_contacts.assert_called_once_with([sample_contacts[0]])
 
+    def test_handle_search_bulk_delete(self, controller, mock_model, mock_view, sample_contacts):
+        """Должен удалить все найденные контакты после подтверждения"""
+        mock_view.get_menu_command.return_value = '3'
+        mock_view.get_search_term.return_value = 'abc'
+        mock_model.find_contact.return_value = sample_contacts
+        mock_model.delete_contacts.return_value = 2
+        mock_view.get_bulk_action.return_value = 'd'
+        mock_view.get_bulk_delete_confirmation.return_value = 'y'
+
+        controller._handle_search_contacts()
+
+        mock_view.get_bulk_delete_confirmation.assert_called_once_with(2)
+        mock_model.delete_contacts.assert_called_once_with([1, 2])
+        mock_view.show_message.assert_called_once_with('Удалено контактов: 2.')
+
+    def test_handle_search_bulk_delete_cancelled(self, controller, mock_model, mock_view, sample_contacts):
+        """Без подтверждения ничего не удаляется"""
+        mock_view.get_menu_command.return_value = '3'
+        mock_view.get_search_term.return_value = 'abc'
+        mock_model.find_contact.return_value = sample_contacts
+        mock_view.get_bulk_action.return_value = 'd'
+        mock_view.get_bulk_delete_confirmation.return_value = ''
+
+        controller._handle_search_contacts()
+
+        mock_model.delete_contacts.assert_not_called()
+
+    def test_handle_search_bulk_edit(self, controller, mock_model, mock_view, sample_contacts):
+        """Должен изменить все найденные контакты, не трогая пустые поля"""
+        mock_view.get_menu_command.return_value = '3'
+        mock_view.get_search_term.return_value = 'abc'
+        mock_model.find_contact.return_value = sample_contacts
+        mock_model.update_where.return_value = 2
+        mock_view.get_bulk_action.return_value = 'e'
+        mock_view.get_contact_name.return_value = ''
+        mock_view.get_contact_phone_number.return_value = ''
+        mock_view.get_contact_comment.return_value = 'клиент'
+
+        controller._handle_search_contacts()
+
+        mock_model.update_where.assert_called_once_with('abc', 3, {'comment': 'клиент'})
+        mock_view.show_message.assert_called_once_with('Изменено контактов: 2.')
+
     def test_handle_search_contacts_no_matches(self, controller, mock_model, mock_view):
         """Должен показать сообщение если совпадений не найдено"""
         mock_view.get_menu_command.return_value = '1'
@@ -195,7 +308,6 @@ class TestContactBookController:
         """Должен обновить только заполненные поля"""
         contact = mock_model.get_all_contacts()[0]
         mock_view.get_contact_id_to_edit.return_value = '1'
-        mock_model.get_contact_ids.return_value = [1, 2]
         mock_model.get_contact.return_value = contact
         new_name = 'Aleksandr'
         mock_view.get_contact_name.return_value = new_name
@@ -213,7 +325,6 @@ class TestContactBookController:
         """Не должен вызывать edit_contact если нет изменений"""
         contact = mock_model.get_all_contacts()[0]
         mock_view.get_contact_id_to_edit.return_value = '1'
-        mock_model.get_contact_ids.return_value = [1, 2]
         mock_model.get_contact.return_value = contact
         mock_view.get_contact_name.return_value = ''
         mock_view.get_contact_phone_number.return_value = ''
@@ -226,7 +337,6 @@ class TestContactBookController:
     def test_handle_edit_contact_not_found(self, controller, mock_model, mock_view):
         """Должен показать сообщение если контакт не найден"""
         mock_view.get_contact_id_to_edit.return_value = '1'
-        mock_model.get_contact_ids.return_value = [1, 2]
         mock_model.get_contact.return_value = None
 
         controller._handle_edit_contact()
@@ -0,0 +1,38 @@
+import threading
+import pytest
+from custom_errors import BookLockedError
+from tools.file_lock import FileLock
+
+
+class TestFileLock:
+    """Тесты для блокировки справочника между процессами"""
+
+    def test_exclusive(self, tmp_path):
+        """Второй захват должен ждать освобождения первого"""
+        path = tmp_path / 'contacts.json'
+        released = threading.Event()
+
+        def hold():
+            with FileLock(path):
+                released.wait(2)
+
+        with FileLock(path):
+            thread = threading.Thread(target=hold)
+            thread.start()
+            thread.join(0.1)
+            assert thread.is_alive()
+        released.set()
+        thread.join(2)
+
+        assert not thread.is_alive()
+        assert (tmp_path / 'contacts.json.lock').exists()
+
+    def test_timeout(self, tmp_path):
+        """По истечении ожидания должен вызвать BookLockedError"""
+        path = tmp_path / 'contacts.json'
+        with FileLock(path):
+            with pytest.raises(BookLockedError):
+                FileLock(path, timeout=0.1).acquire()
+
+        with FileLock(path, timeout=0.1):
+            pass
@@ -84,6 +84,25 @@ class TestFileReader:
         assert contacts[0].name == "Alex"
         assert contacts[1].name == "Bob"
 
+    def test_read_lazy_returns_equal_contacts(self, tmp_path, sample_contacts):
+        """Ленивое чтение должно вернуть те же контакты, не создавая объекты заранее"""
+        file_path = tmp_path / 'contacts.json'
+        file_path.write_text(json.dumps([contact.to_dict() for contact in sample_contacts]), encoding='utf-8')
+        reader = FileReader(file_path)
+
+        contacts = reader.read(lazy=True)
+
+        assert not contacts.is_materialized(0)
+        assert contacts == sample_contacts
+
+    def test_read_lazy_raises_contact_load_error(self, tmp_path):
+        """Ленивое чтение тоже должно сообщать о невалидных контактах"""
+        file_path = tmp_path / 'invalid_contact.json'
+        file_path.write_text(json.dumps([{"id": 1, "name": "Alex"}]), encoding='utf-8')
+
+        with pytest.raises(ContactLoadError):
+            FileReader(file_path).read(lazy=True)
+
     @pytest.mark.parametrize("invalid_json", [
         "{ invalid json }",
         "not json at all",
@@ -99,4 +118,68 @@ class TestFileReader:
         reader = FileReader(file_path)
 
         with pytest.raises(FileCorruptedError):
-            reader.read()
\ No newline at end of file
+            reader.read()
+
+    # ==================== Тесты потокового чтения ====================
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+    def test_iter_contacts_matches_json_load_for_any_chunk_size(self, tmp_path, chunk_size):
+        """Должен давать тот же результат при любом размере куска, в т.ч. на границах чисел"""
+        file_path = tmp_path / 'contacts.json'
+        data = [
+            {"id": i, "name": f"Контакт {i}", "phone_number": 79000000000 + i, "comment": "x" * i}
+            for i in range(1, 30)
+        ]
+        file_path.write_text(' \n' + json.dumps(data, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        reader = FileReader(file_path, chunk_size=chunk_size)
+
+        contacts = list(reader.iter_contacts())
+
+        assert [c.to_dict() for c in contacts] == data
+
+    def test_iter_contacts_yields_before_end_of_file(self, tmp_path):
+        """Должен отдавать первые контакты до разбора конца файла"""
+        file_path = tmp_path / 'broken_tail.json'
+        file_path.write_text(
+            '[{"id": 1, "name": "Alex", "phone_number": 12345678, "comment": "abc"}, {broken',
+            encoding='utf-8'
+        )
+        reader = FileReader(file_path, chunk_size=16)
+
+        contacts = reader.iter_contacts()
+
+        assert next(contacts).name == 'Alex'
+        with pytest.raises(FileCorruptedError):
+            next(contacts)
+
+    @pytest.mark.parametrize("invalid_json", [
+        '[{"id": 1} {"id": 2}]',
+        '[1, 2] extra',
+        '[1, 2',
+        '[',
+    ])
+    def test_iter_contacts_raises_corrupted_error_for_broken_array(self, tmp_path, invalid_json):
+        """Должен вызвать FileCorruptedError для поврежденного массива"""
+        file_path = tmp_path / 'invalid.json'
+        file_path.write_text(invalid_json, encoding='utf-8')
+        reader = FileReader(file_path, chunk_size=4)
+
+        with pytest.raises(FileCorruptedError):
+            list(reader.iter_contacts())
+
+    def test_iter_contacts_raises_contact_load_error_after_valid_contacts(self, tmp_path):
+        """Должен отдать валидные контакты и затем вызвать ContactLoadError"""
+        file_path = tmp_path / 'partially_invalid.json'
+        data = [
+            {"id": 1, "name": "Alex", "phone_number": 12345678, "comment": "abc"},
+            {"id": 2, "name": "Bob"}
+        ]
+        file_path.write_text(json.dumps(data), encoding='utf-8')
+        reader = FileReader(file_path)
+        received = []
+
+        with pytest.raises(ContactLoadError):
+            for contact in reader.iter_contacts():
+                received.append(contact)
+
+        assert [c.id for c in received] == [1]
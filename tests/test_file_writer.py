@@ -113,4 +113,42 @@ class TestFileWriter:
         assert isinstance(data[0]['id'], int)
         assert isinstance(data[0]['name'], str)
         assert isinstance(data[0]['phone_number'], int)
-        assert isinstance(data[0]['comment'], str)
\ No newline at end of file
+        assert isinstance(data[0]['comment'], str)
+
+    # ==================== Тесты атомарной записи ====================
+
+    def test_write_keeps_original_file_when_dump_fails(self, tmp_path, sample_contacts):
+        """При ошибке записи исходный файл должен остаться нетронутым"""
+        file_path = tmp_path / 'contacts.json'
+        writer = FileWriter(file_path)
+        writer.write(sample_contacts)
+        original = file_path.read_text(encoding='utf-8')
+
+        with patch('json.dump', side_effect=Exception("JSON error")):
+            with pytest.raises(SaveFileError):
+                writer.write([])
+
+        assert file_path.read_text(encoding='utf-8') == original
+
+    def test_write_leaves_no_temp_files(self, tmp_path, sample_contacts):
+        """Не должен оставлять временные файлы ни после успеха, ни после ошибки"""
+        file_path = tmp_path / 'contacts.json'
+        writer = FileWriter(file_path)
+
+        writer.write(sample_contacts)
+        with patch('json.dump', side_effect=Exception("JSON error")):
+            with pytest.raises(SaveFileError):
+                writer.write(sample_contacts)
+
+        assert [p.name for p in tmp_path.iterdir()] == ['contacts.json']
+
+    def test_write_preserves_file_permissions(self, tmp_path, sample_contacts):
+        """Должен сохранять права доступа существующего файла"""
+        file_path = tmp_path / 'contacts.json'
+        file_path.write_text('[]', encoding='utf-8')
+        file_path.chmod(0o640)
+        writer = FileWriter(file_path)
+
+        writer.write(sample_contacts)
+
+        assert file_path.stat().st_mode & 0o777 == 0o640
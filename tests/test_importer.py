@@ -0,0 +1,93 @@
+import pytest
+from model import ContactBookModel
+from custom_errors import FileCorruptedError, InvalidFileFormatError
+from tools.importer import import_contacts, read_rows, validate_rows, validate_in_batches
+
+
+class TestImporter:
+    """Тесты импорта контактов из CSV и JSONL"""
+
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        path = tmp_path / 'import.csv'
+        path.write_text(
+            'name,phone_number,comment\n'
+            'Анна Серова,79161234567,коллега\n'
+            ',79161234568,без имени\n'
+            'Игорь Волков,12ab,\n'
+            'Мария Иванова,34987654321,\n',
+            encoding='utf-8'
+        )
+        return path
+
+    @pytest.fixture
+    def jsonl_file(self, tmp_path):
+        path = tmp_path / 'import.jsonl'
+        path.write_text(
+            '{"name": "Анна", "phone_number": 79161234567, "comment": "коллега"}\n'
+            '\n'
+            '{"name": "Игорь", "phone_number": "123"}\n',
+            encoding='utf-8'
+        )
+        return path
+
+    def test_read_rows_csv(self, csv_file):
+        """Номера строк CSV считаются с учетом заголовка"""
+        rows = list(read_rows(csv_file))
+
+        assert [line for line, _ in rows] == [2, 3, 4, 5]
+        assert rows[0][1]['name'] == 'Анна Серова'
+
+    def test_read_rows_jsonl(self, jsonl_file):
+        """Пустые строки JSONL пропускаются"""
+        rows = list(read_rows(jsonl_file))
+
+        assert [line for line, _ in rows] == [1, 3]
+
+    def test_read_rows_broken_jsonl(self, tmp_path):
+        """Невалидная строка JSONL вызывает FileCorruptedError"""
+        path = tmp_path / 'broken.jsonl'
+        path.write_text('{"name": "Анна"}\n[1, 2]\n', encoding='utf-8')
+
+        with pytest.raises(FileCorruptedError):
+            list(read_rows(path))
+
+    def test_read_rows_unsupported_format(self, tmp_path):
+        """Неизвестное расширение вызывает InvalidFileFormatError"""
+        with pytest.raises(InvalidFileFormatError):
+            list(read_rows(tmp_path / 'import.xml'))
+
+    def test_validate_rows(self, csv_file):
+        """Некорректные строки отбрасываются с указанием номера строки"""
+        contacts, errors = validate_rows(list(read_rows(csv_file)))
+
+        assert contacts == [
+            {'name': 'Анна Серова', 'phone_number': 79161234567, 'comment': 'коллега'},
+            {'name': 'Мария Иванова', 'phone_number': 34987654321, 'comment': ''},
+        ]
+        assert errors == [
+            'Строка 3: Имя не может быть пустым.',
+            'Строка 4: Номер должен быть положительным числом.',
+        ]
+
+    def test_validate_in_batches_keeps_order(self):
+        """Пачки возвращаются в исходном порядке"""
+        rows = [(i, {'name': f'N{i}', 'phone_number': str(1000000 + i)}) for i in range(10)]
+
+        batches = list(validate_in_batches(rows, batch_size=3))
+
+        assert [len(contacts) for contacts, _ in batches] == [3, 3, 3, 1]
+        assert [c['name'] for contacts, _ in batches for c in contacts] == [f'N{i}' for i in range(10)]
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_import_contacts(self, tmp_path, csv_file, workers):
+        """Корректные строки добавляются в книгу с ID подряд"""
+        book = ContactBookModel(str(tmp_path / 'book.json'))
+        book.add_contact({'name': 'Alex', 'phone_number': 12345678, 'comment': ''})
+
+        report = import_contacts(book, csv_file, batch_size=1, workers=workers)
+
+        assert report.added == range(2, 4)
+        assert len(report.errors) == 2
+        assert [c.name for c in book.data] == ['Alex', 'Анна Серова', 'Мария Иванова']
+        assert [c.id for c in book.find_contact('серова', '1')] == [2]
@@ -0,0 +1,106 @@
+import pytest
+import json
+from custom_types import Contact
+from custom_errors import FileCorruptedError
+from tools.journal import ContactJournal
+
+
+class TestContactJournal:
+    """Тесты для класса ContactJournal"""
+
+    @pytest.fixture
+    def journal(self, tmp_path):
+        """Фикстура с пустым журналом"""
+        return ContactJournal(tmp_path / 'contacts.json.journal')
+
+    def test_replay_without_journal_file(self, journal, sample_contacts):
+        """Должен вернуть контакты без изменений если журнала нет"""
+        assert journal.replay(sample_contacts) == sample_contacts
+        assert journal.size == 0
+
+    def test_append_and_replay(self, journal, sample_contacts):
+        """Должен применить добавление, изменение и удаление"""
+        journal.append([
+            {'op': 'add', 'contact': {'id': 3, 'name': 'John', 'phone_number': 1234567, 'comment': ''}},
+            {'op': 'edit', 'id': 1, 'fields': {'name': 'Александр'}},
+            {'op': 'delete', 'id': 2},
+        ])
+
+        contacts = journal.replay(sample_contacts)
+
+        assert [(c.id, c.name) for c in contacts] == [(1, 'Александр'), (3, 'John')]
+        assert journal.size == 3
+
+    def test_replay_is_idempotent(self, journal):
+        """Повторное применение журнала не должно дублировать контакты"""
+        journal.append([
+            {'op': 'add', 'contact': {'id': 1, 'name': 'John', 'phone_number': 1234567, 'comment': ''}},
+            {'op': 'delete', 'id': 5},
+            {'op': 'edit', 'id': 7, 'fields': {'name': 'Nobody'}},
+        ])
+        already_compacted = [Contact(id=1, name='John', phone_number=1234567, comment='')]
+
+        contacts = journal.replay(already_compacted)
+
+        assert contacts == already_compacted
+
+    def test_replay_ignores_torn_tail(self, journal, sample_contacts):
+        """Должен игнорировать недописанную последнюю запись"""
+        journal.append([{'op': 'delete', 'id': 1}])
+        with open(journal.file_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "delete", "id"')
+
+        contacts = journal.replay(sample_contacts)
+
+        assert [c.id for c in contacts] == [2]
+
+    def test_append_truncates_torn_tail(self, journal, sample_contacts):
+        """Должен обрезать недописанную запись перед дозаписью"""
+        journal.append([{'op': 'delete', 'id': 1}])
+        with open(journal.file_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "delete", "id"')
+
+        journal.append([{'op': 'delete', 'id': 2}])
+
+        lines = journal.file_path.read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line) for line in lines] == [{'op': 'delete', 'id': 1}, {'op': 'delete', 'id': 2}]
+
+    def test_replay_raises_on_corrupted_record(self, journal, sample_contacts):
+        """Должен вызвать FileCorruptedError для поврежденной записи"""
+        journal.file_path.write_text('{"op": "rename", "id": 1}\n', encoding='utf-8')
+
+        with pytest.raises(FileCorruptedError):
+            journal.replay(sample_contacts)
+
+    def test_clear(self, journal):
+        """Должен удалить журнал"""
+        journal.append([{'op': 'delete', 'id': 1}])
+
+        journal.clear()
+
+        assert not journal.file_path.exists()
+        assert journal.size == 0
+
+    def test_read_from_returns_only_new_records(self, journal):
+        """Должен вернуть записи, дописанные после позиции, без недописанной строки"""
+        assert journal.read_from(None) == ([], None)
+        journal.append([{'op': 'delete', 'id': 1}])
+        position = journal.position()
+
+        journal.append([{'op': 'delete', 'id': 2}])
+        with open(journal.file_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "delete", "id"')
+        records, position = journal.read_from(position)
+
+        assert records == [{'op': 'delete', 'id': 2}]
+        assert journal.read_from(position)[0] == []
+
+    def test_read_from_cleared_journal(self, journal):
+        """Для удаленного или обрезанного журнала должен вернуть None"""
+        journal.append([{'op': 'delete', 'id': 1}, {'op': 'delete', 'id': 2}])
+        position = journal.position()
+
+        journal.clear()
+        assert journal.read_from(position) is None
+        journal.append([{'op': 'delete', 'id': 3}])
+        assert journal.read_from(position) is None
@@ -0,0 +1,82 @@
+import pytest
+from custom_types import Contact
+from custom_errors import ContactLoadError
+from tools.lazy_contacts import LazyContactList, pack_contact
+
+
+@pytest.fixture
+def lazy_list():
+    """Список из двух сырых записей"""
+    return LazyContactList([(1, 'Alex', 12345678, 'abc'), (2, 'Bob', 987654321, 'abc')])
+
+
+class TestLazyContactList:
+    """Тесты для класса LazyContactList"""
+
+    def test_contact_created_on_first_access_and_cached(self, lazy_list):
+        """Должен создавать Contact при обращении и возвращать тот же объект повторно"""
+        assert not lazy_list.is_materialized(0)
+
+        contact = lazy_list[0]
+
+        assert contact == Contact(id=1, name='Alex', phone_number=12345678, comment='abc')
+        assert lazy_list.is_materialized(0)
+        assert lazy_list[0] is contact
+        assert not lazy_list.is_materialized(1)
+
+    def test_mutation_of_contact_is_kept(self, lazy_list):
+        """Изменение созданного объекта должно сохраняться в списке"""
+        lazy_list[1].name = 'Robert'
+
+        assert lazy_list[1].name == 'Robert'
+        assert lazy_list.record_at(1) == (2, 'Robert', 987654321, 'abc')
+
+    def test_fields_without_materialization(self, lazy_list):
+        """ID и записи должны читаться без создания объектов"""
+        assert lazy_list.ids() == [1, 2]
+        assert lazy_list.records()[1] == (2, 'Bob', 987654321, 'abc')
+        assert not lazy_list.is_materialized(0)
+        assert not lazy_list.is_materialized(1)
+
+    def test_list_operations(self, lazy_list, sample_contacts):
+        """Должен поддерживать добавление, удаление и сравнение как список"""
+        lazy_list.append(Contact(id=3, name='John', phone_number=1234567, comment=''))
+        del lazy_list[0]
+        lazy_list.delete_rows({1})
+
+        assert lazy_list == [sample_contacts[1]]
+        assert lazy_list[-1].id == 2
+        assert len(lazy_list) == 1
+
+    def test_copy_is_independent(self, lazy_list):
+        """Копия не должна видеть последующих изменений объектов оригинала"""
+        lazy_list[0].name = 'Changed'
+        snapshot = lazy_list.copy()
+
+        lazy_list[0].name = 'Changed again'
+
+        assert snapshot[0].name == 'Changed'
+        assert not snapshot.is_materialized(1)
+
+    # ==================== Тесты загрузки из словарей ====================
+
+    def test_from_dicts_coerces_like_from_dict(self):
+        """Значения другого типа должны приводиться как в Contact.from_dict"""
+        item = {'id': '3', 'name': 'Анна', 'phone_number': '79501234567'}
+
+        assert pack_contact(item) == (3, 'Анна', 79501234567, '')
+        assert LazyContactList.from_dicts([item])[0] == Contact.from_dict(item)
+
+    def test_from_dicts_collects_all_errors(self):
+        """Должен собрать ошибки всех некорректных словарей в один ContactLoadError"""
+        items = [
+            {'id': 1, 'name': 'Alex', 'phone_number': 12345678, 'comment': 'abc'},
+            {'id': 2, 'name': 'Bob'},
+            {'id': 'x', 'name': 'Eve', 'phone_number': 1234567},
+        ]
+
+        with pytest.raises(ContactLoadError) as error:
+            LazyContactList.from_dicts(items)
+
+        assert "'Bob'" in str(error.value)
+        assert "'Eve'" in str(error.value)
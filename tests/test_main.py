@@ -0,0 +1,30 @@
+import pytest
+from main import parse_args
+
+
+class TestParseArgs:
+    """Тесты для разбора параметров командной строки"""
+
+    def test_page_size(self):
+        """Должен принять положительный размер страницы"""
+        assert parse_args(['--page-size', '5']).page_size == 5
+        assert parse_args([]).page_size == 20
+
+    @pytest.mark.parametrize("value", ['0', '-3', 'abc'])
+    def test_rejects_invalid_page_size(self, value, capsys):
+        """Размер страницы меньше 1 или не число должен отклоняться с ошибкой argparse"""
+        with pytest.raises(SystemExit):
+            parse_args(['--page-size', value])
+
+        assert '--page-size' in capsys.readouterr().err
+
+    def test_rejects_zero_shard_size(self):
+        """Нулевой размер шарда тоже должен отклоняться"""
+        with pytest.raises(SystemExit):
+            parse_args(['--shard-size', '0'])
+
+    def test_cache_off_by_default(self):
+        """Кеш JSON-справочника включается только явно"""
+        assert parse_args([]).cache is False
+        assert parse_args(['--cache']).cache is True
+        assert parse_args(['--no-cache']).cache is False
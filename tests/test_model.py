@@ -1,7 +1,25 @@
+import sys
+import threading
+import time
 import pytest
 from unittest.mock import patch
+from dataclasses import replace
 from model import ContactBookModel
-from custom_types import ContactAdd, ContactUpdate
+from custom_types import Contact, ContactAdd, ContactUpdate
+from tools import FileWriter
+from tools.file_lock import FileLock
+from tools.query import fold_contact
+from custom_errors import BookLockedError, SaveFileError
+
+
+def assert_index_in_sync(book: ContactBookModel) -> None:
+    """Проверяет, что индекс ID -> позиция и ключи поиска соответствуют book.data"""
+    assert len(book._positions) == len(book.data)
+    assert book._keys == [fold_contact(contact) for contact in book.data]
+    for pos, contact in enumerate(book.data):
+        assert book.has_contact(contact.id)
+        assert book._position(contact.id) == pos
+        assert book.get_contact(contact.id) == contact
 
 
 class TestContactBookModel:
@@ -75,6 +93,63 @@ class TestContactBookModel:
 
         assert len(results) == expected_count
 
+    def test_add_contacts_bulk(self, contact_book):
+        """Должен добавить контакты с ID подряд и обновить индексы"""
+        added = contact_book.add_contacts([
+            {'name': 'John', 'phone_number': 1234567, 'comment': ''},
+            {'name': 'Jane', 'phone_number': 7654321, 'comment': 'сестра'},
+        ])
+
+        assert added == range(3, 5)
+        assert [c.id for c in contact_book.data] == [1, 2, 3, 4]
+        assert [c.id for c in contact_book.find_contact('сестра', '3')] == [4]
+        assert contact_book.is_changed()
+        assert [r['op'] for r in contact_book._pending] == ['add', 'add']
+        assert_index_in_sync(contact_book)
+
+    def test_add_contacts_indexes_only_new_rows(self, tmp_path):
+        """Небольшой импорт в большую книгу не должен перестраивать индексы целиком"""
+        from unittest.mock import patch
+        book = ContactBookModel(str(tmp_path / 'book.json'))
+        book.add_contacts({'name': f'User {i}', 'phone_number': 1000000 + i, 'comment': ''} for i in range(20))
+
+        with patch.object(book, '_rebuild_indexes', side_effect=AssertionError('полная перестройка')):
+            book.add_contacts([
+                {'name': 'Анна', 'phone_number': 79501234567, 'comment': 'сестра'},
+                {'name': 'Борис', 'phone_number': 79211234567, 'comment': ''},
+            ])
+
+        assert [c.id for c in book.find_contact('сестра', '3')] == [21]
+        assert [c.id for c in book.find_contact('7921', '2')] == [22]
+        assert [c.id for c in book.find_contact('Ана', '5')] == [21]
+        assert [c.name for c in book.get_sorted_contacts()][-2:] == ['Анна', 'Борис']
+        assert_index_in_sync(book)
+
+    def test_add_contacts_large_batch_rewrites_storage(self, contact_book):
+        """После большого импорта следующее сохранение перезаписывает хранилище целиком"""
+        contact_book._full_rewrite = False
+        contact_book.add_contacts(
+            {'name': f'N{i}', 'phone_number': 1000000 + i, 'comment': ''}
+            for i in range(ContactBookModel.BULK_REWRITE_THRESHOLD + 1)
+        )
+
+        assert contact_book._full_rewrite
+        assert contact_book._pending == [
+            {'op': 'add_range', 'first_id': 3, 'count': ContactBookModel.BULK_REWRITE_THRESHOLD + 1},
+        ]
+
+    def test_add_contacts_rolls_back_on_error(self, contact_book, sample_contacts):
+        """При ошибке во входных данных книга не меняется"""
+        def contacts():
+            yield {'name': 'John', 'phone_number': 1234567, 'comment': ''}
+            raise ValueError('broken row')
+
+        with pytest.raises(ValueError):
+            contact_book.add_contacts(contacts())
+
+        assert contact_book.data == sample_contacts
+        assert_index_in_sync(contact_book)
+
     # ==================== Тесты изменения контакта ====================
 
     def test_edit_contact_name(self, contact_book):
@@ -186,6 +261,245 @@ class TestContactBookModel:
 
         assert ids == [1, 2]
 
+    # ==================== Тесты индекса контактов ====================
+
+    def test_index_built_on_load(self, contact_book):
+        """Индекс должен строиться при загрузке данных"""
+        assert_index_in_sync(contact_book)
+
+    def test_index_rebuilt_on_data_assignment(self, contact_book):
+        """Индекс должен перестраиваться при присваивании data"""
+        contact_book.data = [Contact(id=10, name='Zed', phone_number=1234567, comment='')]
+
+        assert contact_book.has_contact(10)
+        assert not contact_book.has_contact(1)
+        assert_index_in_sync(contact_book)
+
+    def test_index_updated_on_add(self, contact_book):
+        """Индекс должен обновляться при добавлении контакта"""
+        contact_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+
+        assert contact_book.has_contact(3)
+        assert_index_in_sync(contact_book)
+
+    def test_index_updated_on_delete(self, contact_book):
+        """Индекс должен обновляться при удалении контакта"""
+        contact_book.delete_contact(1)
+
+        assert not contact_book.has_contact(1)
+        assert contact_book.get_contact(2).name == 'Bob'
+        assert_index_in_sync(contact_book)
+
+    def test_index_in_sync_after_mixed_mutations(self, contact_book):
+        """Индекс должен оставаться согласованным после серии изменений"""
+        for i in range(20):
+            contact_book.add_contact({'name': f'User{i}', 'phone_number': 1000000 + i, 'comment': ''})
+        for cid in (3, 10, 5, 22, 7, 8, 2):
+            contact_book.delete_contact(cid)
+            assert contact_book.get_contact(cid) is None
+        contact_book.add_contact({'name': 'Last', 'phone_number': 7654321, 'comment': ''})
+        contact_book.edit_contact(21, {'name': 'Edited'})
+
+        assert contact_book.get_contact(21).name == 'Edited'
+        assert contact_book.get_contact_ids() == [c.id for c in contact_book.data]
+        assert_index_in_sync(contact_book)
+
+    def test_index_keeps_first_contact_for_duplicate_ids(self, tmp_path):
+        """При дублях ID индекс должен указывать на первый контакт"""
+        book = ContactBookModel(str(tmp_path / 'dup.json'))
+        first = Contact(id=1, name='First', phone_number=1234567, comment='')
+        book.data = [first, Contact(id=1, name='Second', phone_number=7654321, comment='')]
+
+        assert book.get_contact(1) is first
+
+    # ==================== Тесты триграммного индекса ====================
+
+    def test_search_indexes_built_on_first_use(self, tmp_path, sample_contacts):
+        """Загрузка не должна строить триграммный индекс и BK-дерево; их строит первый поиск"""
+        file_path = tmp_path / 'lazy.json'
+        FileWriter(file_path).write(sample_contacts)
+        book = ContactBookModel(str(file_path))
+        book.load_data()
+        assert book._trigrams is None and book._fuzzy is None
+
+        book.add_contact({'name': 'Анна Серова', 'phone_number': 79501234567, 'comment': 'коллега'})
+        assert [c.id for c in book.find_contact('серов', '1')] == [3]
+        assert [c.id for c in book.find_contact('Анан', '5')] == [3]
+        assert book._trigrams is not None and book._fuzzy is not None
+
+        book.edit_contact(3, {'name': 'Анна Петрова'})
+        assert book.find_contact('серов', '1') == []
+        assert [c.id for c in book.find_contact('петров', '1')] == [3]
+
+        book.load_data()
+        assert book._trigrams is None and book._fuzzy is None
+
+    @pytest.fixture
+    def indexed_books(self, tmp_path):
+        """Одинаковые книги с триграммным индексом и без него"""
+        contacts = [
+            ('Анна Серова', 34612345678, 'коллега из отдела IT'),
+            ('Игорь Волков', 79501234567, 'старый друг'),
+            ('Мария Иванова', 34987654321, 'куратор проекта'),
+            ('Alexander Ivanov', 79211234567, 'Straße 5'),
+            ('Alex', 12345678, 'abc'),
+        ]
+        books = []
+        for indexed in (True, False):
+            book = ContactBookModel(str(tmp_path / 'book.json'), trigram_index=indexed, phone_index=indexed,
+                                    fuzzy_index=indexed, phonetic_index=indexed)
+            for name, phone, comment in contacts:
+                book.add_contact({'name': name, 'phone_number': phone, 'comment': comment})
+            books.append(book)
+        return books
+
+    @pytest.mark.parametrize("mode_id,search_term", [
+        ('1', 'иванов'), ('1', 'ALEX'), ('1', '^Alex$'), ('1', 'ал|ив'), ('1', 'Ив.*ва'),
+        ('2', '1234567'), ('2', '^7950'), ('2', r'\d{3}4567'), ('3', 'друг'), ('3', '[invalid'),
+        ('3', 'strasse'), ('4', '345'), ('4', 'Мария'), ('4', 'zzz'), ('1', 'Ан'),
+        ('4', r'иванова\s3498'), ('4', 'серова.346'), ('4', '^34.*проекта$'),
+        ('3', 'Straße$'), ('3', '^S.*ße'), ('4', 'ße 5$'),
+    ])
+    def test_find_contact_index_matches_full_scan(self, indexed_books, mode_id, search_term):
+        """Поиск по индексу должен давать тот же результат, что и полный перебор"""
+        indexed, plain = indexed_books
+
+        expected = [c.id for c in plain.find_contact(search_term, mode_id)]
+        actual = [c.id for c in indexed.find_contact(search_term, mode_id)]
+
+        if mode_id == '2' and search_term.isdigit():
+            # Поиск по цифрам номера ставит совпадения с начала номера первыми
+            assert sorted(actual) == sorted(expected)
+        else:
+            assert actual == expected
+
+    def test_find_contact_index_follows_mutations(self, indexed_books):
+        """Индекс должен обновляться при добавлении, изменении и удалении"""
+        indexed, _ = indexed_books
+
+        indexed.edit_contact(1, {'name': 'Анна Петрова'})
+        indexed.delete_contact(2)
+        indexed.add_contact({'name': 'Игорь Волков', 'phone_number': 7777777, 'comment': ''})
+
+        assert indexed.find_contact('Серова', '1') == []
+        assert [c.id for c in indexed.find_contact('Петрова', '1')] == [1]
+        assert [c.id for c in indexed.find_contact('Волков', '1')] == [6]
+        assert [c.id for c in indexed.find_contact('друг', '3')] == []
+        assert_index_in_sync(indexed)
+
+    def test_find_contact_literal_uses_folded_keys(self, indexed_books):
+        """Подстрока ищется без учета регистра, в том числе с ß -> ss"""
+        for book in indexed_books:
+            assert [c.id for c in book.find_contact('АННА', '1')] == [1]
+            assert [c.id for c in book.find_contact('STRASSE', '3')] == [4]
+
+    def test_find_contact_fuzzy(self, indexed_books):
+        """Поиск по имени с опечатками ставит ближайшие совпадения первыми"""
+        for book in indexed_books:
+            assert [c.id for c in book.find_contact('Иваноф', '5')] == [3]
+            assert [c.id for c in book.find_contact('ivnaov alexnader', '5')] == [4]
+            # В коротком слове допускается одна опечатка, alexander слишком далеко
+            assert [c.id for c in book.find_contact('alex', '5')] == [5]
+            assert [c.id for c in book.find_contact('Мраия Иванва', '5')] == [3]
+            assert [c.id for c in book.find_contact('Инна', '5')] == [1]
+            assert book.find_contact('Петров', '5') == []
+
+    def test_find_contact_fuzzy_follows_mutations(self, indexed_books):
+        """Индекс опечаток обновляется при изменении и удалении"""
+        for book in indexed_books:
+            book.edit_contact(1, {'name': 'Анна Петрова'})
+            book.delete_contact(3)
+
+            assert [c.id for c in book.find_contact('Петров', '5')] == [1]
+            assert book.find_contact('Иваноф', '5') == []
+
+    def test_find_contact_regex_on_original_text(self, indexed_books):
+        """Регулярные выражения должны проверяться по исходному тексту полей, как до индексов"""
+        for book in indexed_books:
+            assert [c.id for c in book.find_contact('Straße', '3')] == [4]
+            assert [c.id for c in book.find_contact('Straße$', '3')] == []
+            assert [c.id for c in book.find_contact('^S.*ße', '3')] == [4]
+            assert [c.id for c in book.find_contact('ße 5$', '4')] == [4]
+
+    def test_find_contact_phonetic(self, indexed_books):
+        """Поиск по звучанию работает одинаково с индексом и без него"""
+        for book in indexed_books:
+            assert [c.id for c in book.find_contact('Мария Ивонова', '6')] == [3]
+            assert [c.id for c in book.find_contact('Alexandr Iwanow', '6')] == [4]
+            assert [c.id for c in book.find_contact('Игарь', '6')] == [2]
+            assert book.find_contact('Петров', '6') == []
+
+    def test_phonetic_index_built_on_first_query(self, tmp_path, sample_contacts):
+        """Фонетический индекс должен строиться только первым поиском по звучанию"""
+        file_path = tmp_path / 'phonetic.json'
+        FileWriter(file_path).write(sample_contacts)
+        book = ContactBookModel(str(file_path))
+        book.load_data()
+        book.find_contact('alex', '1')
+        assert book._phonetic is None
+
+        assert [c.id for c in book.find_contact('Aleks', '6')] == [1]
+        assert book._phonetic is not None
+
+    def test_find_contact_phonetic_follows_mutations(self, indexed_books):
+        """Фонетические ключи пересчитываются при смене имени"""
+        for book in indexed_books:
+            book.edit_contact(2, {'name': 'Игорь Петров'})
+            book.edit_contact(3, {'comment': 'без смены имени'})
+            book.delete_contact(1)
+
+            assert [c.id for c in book.find_contact('Пётров', '6')] == [2]
+            assert book.find_contact('Волков', '6') == []
+            assert [c.id for c in book.find_contact('Мария', '6')] == [3]
+            assert book.find_contact('Анна', '6') == []
+
+    # ==================== Тесты префиксного индекса телефонов ====================
+
+    def test_find_by_phone_prefix_first(self, indexed_books):
+        """Совпадения с начала номера должны идти перед совпадениями в середине"""
+        indexed, _ = indexed_books
+
+        results = indexed.find_contact('1234567', mode_id='2')
+
+        assert [c.id for c in results] == [5, 1, 2, 4]
+
+    def test_find_by_phone_with_limit(self, indexed_books):
+        """Должен ограничить количество результатов поиска по телефону"""
+        indexed, _ = indexed_books
+
+        assert [c.id for c in indexed.find_contact('7', mode_id='2', limit=1)] == [4]
+        assert [c.id for c in indexed.find_contact('1234567', mode_id='2', limit=2)] == [5, 1]
+
+    def test_find_by_phone_limit_keeps_order(self, tmp_path):
+        """Результат с меньшим limit должен быть началом результата с большим (для постраничного вывода)"""
+        book = ContactBookModel(str(tmp_path / 'paging.json'))
+        for i in range(40):
+            # Номера идут не в порядке добавления
+            book.add_contact({'name': f'User {i}', 'phone_number': 2000000 + (i * 7919) % 1000, 'comment': ''})
+
+        full = [c.id for c in book.find_contact('2', mode_id='2')]
+        pages = [c.id for offset in range(0, 40, 10) for c in book.find_contact('2', mode_id='2', limit=offset + 10)[offset:]]
+
+        assert pages == full
+        assert len(set(full)) == 40
+        for limit in (1, 5, 17):
+            assert [c.id for c in book.find_contact('2', mode_id='2', limit=limit)] == full[:limit]
+
+    def test_find_by_phone_follows_mutations(self, indexed_books):
+        """Префиксный индекс должен обновляться при изменении и удалении"""
+        indexed, _ = indexed_books
+
+        indexed.edit_contact(1, {'phone_number': 88001234567})
+        indexed.delete_contact(2)
+
+        assert [c.id for c in indexed.find_contact('8800', mode_id='2')] == [1]
+        assert indexed.find_contact('3461', mode_id='2') == []
+        assert [c.id for c in indexed.find_contact('79', mode_id='2')] == [4]
+
+    def test_find_contact_limit(self, contact_book):
+        """Должен ограничить количество результатов в любом режиме"""
+        assert len(contact_book.find_contact('abc', mode_id='3', limit=1)) == 1
+
     # ==================== Тесты загрузки/сохранения ====================
 
     def test_load_data_from_nonexistent_file(self, tmp_path):
@@ -215,3 +529,588 @@ class TestContactBookModel:
 
         assert len(data) == 3
         assert data[2]['name'] == 'Test'
+
+    def test_load_data_is_lazy(self, tmp_path, sample_contacts):
+        """Загрузка из JSON не должна создавать объекты Contact до обращения к ним"""
+        from tools import FileWriter
+        from tools.lazy_contacts import LazyContactList
+        file_path = tmp_path / 'lazy.json'
+        FileWriter(file_path).write(sample_contacts)
+        book = ContactBookModel(str(file_path))
+        book.load_data()
+
+        assert isinstance(book.data, LazyContactList)
+        assert [c.id for c in book.find_contact('bob', '1')] == [2]
+        assert not book.data.is_materialized(0)
+        assert book.get_contact_ids() == [1, 2]
+
+        book.edit_contact(1, {'name': 'Александр'})
+        book.delete_contact(2)
+        book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        book.save_file()
+
+        reloaded = ContactBookModel(str(file_path))
+        reloaded.load_data()
+        assert [(c.id, c.name) for c in reloaded.data] == [(1, 'Александр'), (2, 'John')]
+        assert_index_in_sync(reloaded)
+
+    # ==================== Тесты журнала изменений ====================
+
+    @pytest.fixture
+    def journal_book(self, tmp_path, sample_contacts):
+        """Сохраненная книга в режиме журнала"""
+        book = ContactBookModel(str(tmp_path / 'book.json'), journal=True, compact_every=5)
+        book.data = sample_contacts
+        book.save_file()
+        return book
+
+    def test_journal_save_appends_changes(self, journal_book):
+        """Сохранение должно дописывать в журнал только изменения"""
+        import json
+        base_before = journal_book.file_path.read_text(encoding='utf-8')
+
+        journal_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        journal_book.edit_contact(1, {'comment': 'new'})
+        journal_book.delete_contact(2)
+        journal_book.save_file()
+
+        assert journal_book.file_path.read_text(encoding='utf-8') == base_before
+        lines = journal_book.journal.file_path.read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line)['op'] for line in lines] == ['add', 'edit', 'delete']
+        assert journal_book.is_changed() is False
+
+    def test_journal_replayed_on_load(self, journal_book, tmp_path):
+        """Загрузка должна применять журнал поверх основного файла"""
+        journal_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        journal_book.edit_contact(1, {'name': 'Александр'})
+        journal_book.delete_contact(2)
+        journal_book.save_file()
+
+        book = ContactBookModel(str(journal_book.file_path), journal=True)
+        book.load_data()
+
+        assert [(c.id, c.name) for c in book.data] == [(1, 'Александр'), (3, 'John')]
+        assert book.find_contact('Александр', '1')[0].id == 1
+
+    def test_journal_compacts_after_threshold(self, journal_book):
+        """После compact_every записей журнал должен сворачиваться в основной файл"""
+        import json
+        for i in range(5):
+            journal_book.add_contact({'name': f'User{i}', 'phone_number': 1000000 + i, 'comment': ''})
+            journal_book.save_file()
+
+        assert not journal_book.journal.file_path.exists()
+        with open(journal_book.file_path, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 7
+
+    def test_journal_full_rewrite_after_data_assignment(self, journal_book):
+        """После замены data целиком сохранение должно перезаписать файл"""
+        import json
+        journal_book.data = [Contact(id=10, name='Zed', phone_number=1234567, comment='')]
+
+        journal_book.save_file()
+
+        with open(journal_book.file_path, 'r', encoding='utf-8') as f:
+            assert [c['id'] for c in json.load(f)] == [10]
+
+    # ==================== Тесты автосохранения ====================
+
+    def test_autosave_writes_changes_in_background(self, contact_book):
+        """Автосохранение должно записать изменения и сбросить флаг изменений"""
+        import json
+        import time
+        contact_book.start_autosave(interval=60, threshold=1)
+        try:
+            contact_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+            deadline = time.monotonic() + 2
+            while contact_book.is_changed() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            contact_book.stop_autosave()
+
+        assert contact_book.is_changed() is False
+        with open(contact_book.file_path, 'r', encoding='utf-8') as f:
+            assert [c['name'] for c in json.load(f)] == ['Alex', 'Bob', 'John']
+
+    def test_autosave_keeps_changed_flag_for_changes_during_write(self, contact_book):
+        """Изменения, сделанные во время записи, должны остаться несохраненными"""
+        from unittest.mock import patch
+        original_write = contact_book.writer.write
+
+        def write_with_concurrent_edit(contacts):
+            contact_book.add_contact({'name': 'Late', 'phone_number': 7654321, 'comment': ''})
+            original_write(contacts)
+
+        contact_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        with patch.object(contact_book.writer, 'write', side_effect=write_with_concurrent_edit):
+            contact_book._autosave()
+
+        assert contact_book.is_changed() is True
+
+    def test_autosave_reports_errors(self, contact_book):
+        """Ошибки фонового сохранения должны быть доступны через pop_save_error"""
+        from unittest.mock import patch
+        from custom_errors import SaveFileError
+        contact_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+
+        with patch.object(contact_book.writer, 'write', side_effect=SaveFileError('disk full')):
+            contact_book._autosave()
+
+        assert str(contact_book.pop_save_error()) == 'disk full'
+        assert contact_book.pop_save_error() is None
+        assert contact_book.is_changed() is True
+
+    def test_failed_journal_save_keeps_pending_changes(self, journal_book):
+        """После ошибки записи журнала операции должны сохраниться при следующей попытке"""
+        from unittest.mock import patch
+        from custom_errors import SaveFileError
+        journal_book.delete_contact(1)
+
+        with patch.object(journal_book.journal, 'append', side_effect=SaveFileError('disk full')):
+            with pytest.raises(SaveFileError):
+                journal_book.save_file()
+        journal_book.save_file()
+
+        book = ContactBookModel(str(journal_book.file_path), journal=True)
+        book.load_data()
+        assert [c.id for c in book.data] == [2]
+
+    # ==================== Тесты компактного хранения ====================
+
+    @pytest.fixture
+    def compact_book(self, tmp_path, sample_contacts):
+        """Книга в компактном колоночном режиме"""
+        from tools.columnar_store import ColumnarContactStore
+        book = ContactBookModel(str(tmp_path / 'compact.json'), compact=True)
+        book.data = sample_contacts
+        assert isinstance(book.data, ColumnarContactStore)
+        return book
+
+    def test_compact_book_public_api(self, compact_book):
+        """Компактный режим должен сохранять поведение публичного API"""
+        compact_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        compact_book.edit_contact(1, {'name': 'Александр', 'comment': 'new'})
+        compact_book.delete_contact(2)
+
+        assert [c.to_dict() for c in compact_book.get_all_contacts()] == [
+            {'id': 1, 'name': 'Александр', 'phone_number': 12345678, 'comment': 'new'},
+            {'id': 3, 'name': 'John', 'phone_number': 1234567, 'comment': ''},
+        ]
+        assert compact_book.get_contact(3).name == 'John'
+        assert compact_book.get_contact(2) is None
+        assert [c.id for c in compact_book.find_contact('алекс', '1')] == [1]
+        assert [c.id for c in compact_book.find_contact('123', '2')] == [3, 1]
+        assert_index_in_sync(compact_book)
+
+    def test_compact_book_save_and_load(self, compact_book):
+        """Компактная книга должна сохраняться и загружаться без потерь"""
+        compact_book.add_contact({'name': 'Иван', 'phone_number': 79001234567, 'comment': 'друг'})
+        compact_book.save_file()
+
+        book = ContactBookModel(str(compact_book.file_path), compact=True)
+        book.load_data()
+
+        assert [c.to_dict() for c in book.data] == [c.to_dict() for c in compact_book.data]
+        assert book.find_contact('друг', '3')[0].name == 'Иван'
+
+    def test_compact_book_background_snapshot(self, compact_book):
+        """Снимок для фоновой записи должен быть независимой копией колонок"""
+        snapshot = compact_book._snapshot_contacts()
+
+        compact_book.edit_contact(1, {'name': 'Changed'})
+
+        assert snapshot[0].name == 'Alex'
+
+    # ==================== Тесты массовых операций ====================
+
+    @pytest.fixture(params=[False, True], ids=['list', 'compact'])
+    def bulk_book(self, request, tmp_path):
+        """Книга из шести контактов в обычном и компактном режиме"""
+        book = ContactBookModel(str(tmp_path / 'bulk.json'), compact=request.param)
+        book.add_contacts([
+            {'name': 'Анна Серова', 'phone_number': 79161234567, 'comment': 'коллега'},
+            {'name': 'Игорь Волков', 'phone_number': 79501234567, 'comment': 'старый друг'},
+            {'name': 'Мария Иванова', 'phone_number': 34987654321, 'comment': 'коллега'},
+            {'name': 'Павел Орлов', 'phone_number': 79217654321, 'comment': ''},
+            {'name': 'Елена Попова', 'phone_number': 79031112233, 'comment': 'коллега'},
+            {'name': 'Олег Смирнов', 'phone_number': 12345678, 'comment': 'сосед'},
+        ])
+        book._pending.clear()
+        return book
+
+    def test_delete_contacts(self, bulk_book):
+        """Должен удалить контакты по ID за один проход, пропуская несуществующие"""
+        deleted = bulk_book.delete_contacts([2, 5, 99, 2])
+
+        assert deleted == 2
+        assert [c.id for c in bulk_book.data] == [1, 3, 4, 6]
+        assert bulk_book._pending == [{'op': 'delete', 'id': 2}, {'op': 'delete', 'id': 5}]
+        assert bulk_book.find_contact('Попова', '1') == []
+        assert bulk_book.is_changed()
+        assert_index_in_sync(bulk_book)
+
+    def test_delete_contacts_nothing_found(self, bulk_book):
+        """Если удалять нечего, книга не помечается измененной"""
+        bulk_book._changed = False
+
+        assert bulk_book.delete_contacts([100]) == 0
+        assert not bulk_book.is_changed()
+
+    def test_delete_where(self, bulk_book):
+        """Должен удалить все найденные контакты"""
+        assert bulk_book.delete_where('коллега', '3') == 3
+        assert [c.id for c in bulk_book.data] == [2, 4, 6]
+        assert_index_in_sync(bulk_book)
+
+        # После удаления одиночные операции продолжают работать
+        bulk_book.delete_contact(4)
+        bulk_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        assert [c.id for c in bulk_book.data] == [2, 6, 7]
+        assert_index_in_sync(bulk_book)
+
+    def test_update_where(self, bulk_book):
+        """Должен изменить все найденные контакты и обновить индексы"""
+        updated = bulk_book.update_where('^79', '2', {'comment': 'мобильный'})
+
+        assert updated == 4
+        assert [c.id for c in bulk_book.find_contact('мобильный', '3')] == [1, 2, 4, 5]
+        assert [c.id for c in bulk_book.find_contact('коллега', '3')] == [3]
+        assert [r['id'] for r in bulk_book._pending] == [1, 2, 4, 5]
+        assert_index_in_sync(bulk_book)
+
+    def test_update_where_selection_is_fixed_before_changes(self, bulk_book):
+        """Изменение поля поиска не должно влиять на выборку"""
+        assert bulk_book.update_where('ова', '1', {'name': 'Иванова'}) == 3
+        assert [c.id for c in bulk_book.find_contact('Иванова', '1')] == [1, 3, 5]
+
+    # ==================== Тесты параллельного поиска ====================
+
+    def test_parallel_scan_matches_serial(self, indexed_books, tmp_path):
+        """Параллельный перебор дает тот же результат, что и последовательный"""
+        _, plain = indexed_books
+        book = ContactBookModel(str(tmp_path / 'parallel.json'), trigram_index=False, scan_workers=2)
+        book.PARALLEL_SCAN_THRESHOLD = 0
+        book.data = [replace(c) for c in plain.data]
+        try:
+            for mode_id, term in [('1', '^[АМ]'), ('4', r'\d{4}$'), ('3', 'друг|IT')]:
+                assert book.find_contact(term, mode_id) == plain.find_contact(term, mode_id)
+
+            book.delete_contact(1)
+            assert [c.id for c in book.find_contact('^[АМ]', '1')] == [3]
+        finally:
+            book.close()
+
+    # ==================== Тесты потокобезопасного режима ====================
+
+    @pytest.fixture
+    def shared_book(self, tmp_path, sample_contacts):
+        """Потокобезопасная книга с образцами контактов"""
+        book = ContactBookModel(str(tmp_path / 'shared.json'), thread_safe=True)
+        book.data = [replace(c) for c in sample_contacts]
+        return book
+
+    @staticmethod
+    def run_threads(*targets) -> None:
+        """
+        Запускает функции в отдельных потоках и пробрасывает первую ошибку.
+        Частое переключение потоков повышает шанс поймать гонку.
+        """
+        errors: list[BaseException] = []
+
+        def guarded(target):
+            try:
+                target()
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=guarded, args=(target,)) for target in targets]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        if errors:
+            raise errors[0]
+
+    def test_concurrent_adds_not_lost(self, shared_book):
+        """Параллельные добавления не должны теряться и получать одинаковые ID"""
+        def add():
+            for i in range(200):
+                shared_book.add_contact({'name': f'User {i}', 'phone_number': 1000000 + i, 'comment': ''})
+
+        self.run_threads(*[add] * 4)
+
+        ids = shared_book.get_contact_ids()
+        assert len(ids) == 802
+        assert sorted(ids) == list(range(1, 803))
+        assert len(shared_book.find_contact('user', '1')) == 800
+        assert_index_in_sync(shared_book)
+
+    def test_no_torn_reads(self, shared_book):
+        """Читатель не должен видеть контакт, измененный писателем наполовину"""
+        stop = threading.Event()
+
+        def write():
+            try:
+                for i in range(2000):
+                    shared_book.edit_contact(1, {'name': f'N{i}', 'phone_number': i})
+            finally:
+                stop.set()
+
+        def read():
+            while not stop.is_set():
+                contact = shared_book.get_contact(1)
+                name, phone_number = contact.name, contact.phone_number
+                assert name == f'N{phone_number}' or name == 'Alex'
+                # Полученный контакт не меняется у читателя в руках
+                time.sleep(0)
+                assert (contact.name, contact.phone_number) == (name, phone_number)
+                for found in shared_book.find_contact('n', '1'):
+                    assert found.name == f'N{found.phone_number}'
+
+        self.run_threads(write, read, read)
+
+        assert shared_book.get_contact(1).name == 'N1999'
+        assert_index_in_sync(shared_book)
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_concurrent_delete_and_search(self, tmp_path, compact):
+        """Удаления параллельно с поиском и чтением по ID не должны давать ошибок"""
+        book = ContactBookModel(str(tmp_path / 'shared.json'), thread_safe=True, compact=compact)
+        book.add_contacts({'name': f'User {i}', 'phone_number': 1000000 + i, 'comment': ''} for i in range(500))
+        stop = threading.Event()
+
+        def delete():
+            try:
+                for cid in range(1, 501, 2):
+                    book.delete_contact(cid)
+            finally:
+                stop.set()
+
+        def read():
+            while not stop.is_set():
+                for contact in book.find_contact('user 1', '1'):
+                    assert contact.name.startswith('User 1')
+                for cid in range(2, 501, 50):
+                    assert book.get_contact(cid).id == cid
+                assert len(book.get_all_contacts()) >= 250
+
+        self.run_threads(delete, read, read)
+
+        assert book.get_contact_ids() == list(range(2, 501, 2))
+        assert_index_in_sync(book)
+
+    # ==================== Тесты совместной работы с файлом ====================
+
+    @pytest.fixture(params=[False, True], ids=['json', 'journal'])
+    def operators(self, request, tmp_path, sample_contacts):
+        """Две модели одного справочника — как два запущенных main.py"""
+        file_path = tmp_path / 'shared.json'
+        FileWriter(file_path).write(sample_contacts)
+        books = [ContactBookModel(str(file_path), journal=request.param) for _ in range(2)]
+        for book in books:
+            book.load_data()
+        return books
+
+    @staticmethod
+    def on_disk(book: ContactBookModel) -> list[tuple]:
+        reloaded = ContactBookModel(str(book.file_path), journal=book.journal is not None)
+        reloaded.load_data()
+        return [(c.id, c.name, c.comment) for c in reloaded.data]
+
+    def test_save_keeps_other_operators_changes(self, operators):
+        """Сохранение не должно затирать изменения, сохраненные другим оператором"""
+        first, second = operators
+        first.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        first.edit_contact(1, {'comment': 'first'})
+        first.save_file()
+
+        second.add_contact({'name': 'Анна', 'phone_number': 7654321, 'comment': ''})
+        second.edit_contact(2, {'name': 'Robert'})
+        second.delete_contact(1)
+        second.save_file()
+
+        expected = [(2, 'Robert', 'abc'), (3, 'John', ''), (4, 'Анна', '')]
+        assert self.on_disk(first) == expected
+        assert [(c.id, c.name, c.comment) for c in second.data] == expected
+        assert_index_in_sync(second)
+
+    def test_add_contact_saved_returns_final_id(self, operators):
+        """ID из add_contact_saved выдается после чужих новых контактов и уже не меняется"""
+        first, second = operators
+        first.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        first.save_file()
+
+        cid = second.add_contact_saved({'name': 'Анна', 'phone_number': 7654321, 'comment': ''})
+
+        assert cid == 4
+        assert not second.is_changed()
+        first.save_file()
+        assert self.on_disk(first)[-2:] == [(3, 'John', ''), (4, 'Анна', '')]
+
+    def test_refresh_applies_changes_incrementally(self, operators):
+        """refresh должен подхватить чужие изменения без полной перестройки индексов"""
+        first, second = operators
+        assert not second.refresh()
+
+        first.edit_contact(1, {'name': 'Александр'})
+        first.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        first.save_file()
+
+        with patch.object(second, '_rebuild_indexes', side_effect=AssertionError('индексы перестроены')):
+            assert second.refresh()
+        assert not second.refresh()
+        assert [(c.id, c.name) for c in second.data] == [(1, 'Александр'), (2, 'Bob'), (3, 'John')]
+        assert second.find_contact('александр', '1')[0].id == 1
+        assert not second.is_changed()
+        assert_index_in_sync(second)
+
+    def test_own_unsaved_field_wins(self, operators):
+        """Свое несохраненное изменение поля важнее чужого, остальные поля берутся чужие"""
+        first, second = operators
+        first.edit_contact(1, {'name': 'Чужое', 'comment': 'чужой'})
+        first.save_file()
+        second.edit_contact(1, {'name': 'Свое'})
+
+        second.refresh()
+        assert (second.get_contact(1).name, second.get_contact(1).comment) == ('Свое', 'чужой')
+        second.save_file()
+
+        assert self.on_disk(first)[0] == (1, 'Свое', 'чужой')
+
+    def test_external_delete_wins_over_own_edit(self, operators):
+        """Чужое удаление важнее своей правки того же контакта"""
+        first, second = operators
+        first.delete_contact(2)
+        first.save_file()
+        second.edit_contact(2, {'name': 'Robert'})
+
+        second.save_file()
+
+        assert [cid for cid, *_ in self.on_disk(first)] == [1]
+        assert second.get_contact_ids() == [1]
+
+    def test_lock_timeout_fails_save(self, operators):
+        """Если справочник долго сохраняет другой процесс, сохранение должно завершиться ошибкой"""
+        first, _ = operators
+        first.storage.lock.timeout = 0.1
+        first.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+
+        with FileLock(first.file_path):
+            with pytest.raises(BookLockedError):
+                first.save_file()
+        first.save_file()
+
+        assert [cid for cid, *_ in self.on_disk(first)] == [1, 2, 3]
+
+    def test_large_import_keeps_other_operators_changes(self, operators, monkeypatch):
+        """Сохранение после массового импорта должно влить чужие изменения и перенумеровать свои контакты"""
+        monkeypatch.setattr(ContactBookModel, 'BULK_REWRITE_THRESHOLD', 2)
+        first, second = operators
+        first.edit_contact(1, {'comment': 'first'})
+        first.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        first.save_file()
+
+        second.add_contacts({'name': f'Импорт {i}', 'phone_number': 1000000 + i, 'comment': ''} for i in range(3))
+        second.edit_contact(4, {'comment': 'свой'})
+        second.save_file()
+
+        expected = [(1, 'Alex', 'first'), (2, 'Bob', 'abc'), (3, 'John', ''),
+                    (4, 'Импорт 0', ''), (5, 'Импорт 1', 'свой'), (6, 'Импорт 2', '')]
+        assert self.on_disk(first) == expected
+        assert [(c.id, c.name, c.comment) for c in second.data] == expected
+        assert_index_in_sync(second)
+        assert first.refresh()
+        assert [(c.id, c.name, c.comment) for c in first.data] == expected
+
+    def test_replaced_book_refuses_to_overwrite_changes(self, operators, sample_contacts):
+        """После замены data целиком сохранение не должно затирать чужие изменения"""
+        first, second = operators
+        first.delete_contact(2)
+        first.save_file()
+        second.data = sample_contacts[:1]
+
+        with pytest.raises(SaveFileError):
+            second.save_file()
+        with pytest.raises(SaveFileError):
+            second.save_file()
+        assert [cid for cid, *_ in self.on_disk(first)] == [1]
+
+        second.load_data()
+        second.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        second.save_file()
+        assert [cid for cid, *_ in self.on_disk(first)] == [1, 2]
+
+    def test_refresh_does_not_wait_for_running_save(self, operators):
+        """refresh не должен ждать сохранение, которое ждет блокировку файла"""
+        first, second = operators
+        first.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        saver = threading.Thread(target=first.save_file)
+
+        with FileLock(first.file_path):
+            saver.start()
+            while not first._save_lock.locked():
+                time.sleep(0.001)
+            started = time.monotonic()
+            assert not first.refresh()
+            assert time.monotonic() - started < 0.5
+        saver.join(5)
+
+        assert [cid for cid, *_ in self.on_disk(second)] == [1, 2, 3]
+
+    # ==================== Тесты алфавитного порядка ====================
+
+    @pytest.mark.parametrize("name_index", [True, False])
+    def test_sorted_contacts(self, tmp_path, name_index):
+        """Контакты должны идти по алфавиту и следовать за изменениями имен"""
+        book = ContactBookModel(str(tmp_path / 'sorted.json'), name_index=name_index)
+        for name in ['вера', 'Анна', 'борис', 'анна', 'Виктор']:
+            book.add_contact({'name': name, 'phone_number': 1234567, 'comment': ''})
+        book.edit_contact(3, {'name': 'Глеб'})
+        book.delete_contact(1)
+
+        assert [c.id for c in book.get_sorted_contacts()] == [2, 4, 5, 3]
+        assert [c.name for c in book.get_sorted_contacts('А', 'В')] == ['Анна', 'анна', 'Виктор']
+        assert [c.id for c in book.get_sorted_contacts('ан', 'ан')] == [2, 4]
+
+    def test_sorted_contacts_paging(self, tmp_path):
+        """Страницы должны читаться из индекса срезами"""
+        book = ContactBookModel(str(tmp_path / 'sorted.json'))
+        book.add_contacts({'name': f'Имя {i:03}', 'phone_number': 1000000 + i, 'comment': ''} for i in range(100, 0, -1))
+
+        contacts = book.get_sorted_contacts()
+        assert len(contacts) == 100
+        assert [c.name for c in contacts[20:23]] == ['Имя 021', 'Имя 022', 'Имя 023']
+        assert contacts[-1].name == 'Имя 100'
+        assert len(book.get_sorted_contacts('имя 05', 'имя 05')) == 10
+
+    def test_sorted_contacts_reverse_slices(self, tmp_path):
+        """Срезы с отрицательным шагом должны идти от конца алфавита"""
+        book = ContactBookModel(str(tmp_path / 'sorted.json'))
+        book.add_contacts({'name': f'Имя {i}', 'phone_number': 1000000 + i, 'comment': ''} for i in range(1, 6))
+        contacts = book.get_sorted_contacts()
+        names = [c.name for c in contacts]
+
+        assert [c.name for c in contacts[::-1]] == names[::-1]
+        assert [c.name for c in contacts[3:0:-2]] == names[3:0:-2]
+        assert [c.name for c in contacts[-2::-3]] == names[-2::-3]
+        assert contacts[1:1:-1] == []
+
+    def test_sorted_contacts_see_later_changes(self, tmp_path):
+        """Представление диапазона должно видеть контакты, добавленные и удаленные после его создания"""
+        book = ContactBookModel(str(tmp_path / 'sorted.json'))
+        for name in ['Борис', 'Вера']:
+            book.add_contact({'name': name, 'phone_number': 1234567, 'comment': ''})
+        contacts = book.get_sorted_contacts('а', 'б')
+
+        book.add_contact({'name': 'Аркадий', 'phone_number': 7654321, 'comment': ''})
+        assert [c.name for c in contacts] == ['Аркадий', 'Борис']
+        book.delete_contact(1)
+        assert len(contacts) == 1
+        assert contacts[0].name == 'Аркадий'
+        with pytest.raises(IndexError):
+            contacts[1]
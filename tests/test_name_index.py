@@ -0,0 +1,75 @@
+import random
+import pytest
+from tools import SortedNameIndex
+
+
+@pytest.fixture
+def index(monkeypatch):
+    """Индекс с маленькими блоками, чтобы проверить их деление и удаление"""
+    monkeypatch.setattr(SortedNameIndex, 'BLOCK_SIZE', 2)
+    index = SortedNameIndex()
+    for key, name in enumerate(['вера', 'анна', 'борис', 'анна', 'виктор', 'глеб', 'вадим'], 1):
+        index.add(key, name)
+    return index
+
+
+class TestSortedNameIndex:
+    """Тесты для отсортированного индекса имен"""
+
+    def test_iteration_order(self, index):
+        """Ключи должны идти по имени, при равных именах — по ключу"""
+        assert list(index) == [2, 4, 3, 7, 1, 5, 6]
+        assert len(index) == 7
+
+    def test_bounds(self, index):
+        """Диапазон должен включать имена, начинающиеся с верхней границы"""
+        assert index.keys_between(*index.bounds('б', 'в')) == [3, 7, 1, 5]
+        assert index.keys_between(*index.bounds('ви', 'ви')) == [5]
+        assert index.keys_between(*index.bounds('в')) == [7, 1, 5, 6]
+        assert index.bounds('я') == (7, 7)
+        assert index.bounds('в', 'а') == (3, 3)
+
+    def test_keys_between(self, index):
+        """Срез по позициям должен переходить через границы блоков"""
+        assert index.keys_between(1, 6) == [4, 3, 7, 1, 5]
+        assert index.keys_between(5, 100) == [5, 6]
+        assert index.keys_between(3, 3) == []
+
+    def test_remove(self, index):
+        """Удаление должно убирать только пару (имя, ключ)"""
+        index.remove(2, 'анна')
+        index.remove(3, 'борис')
+        index.remove(5, 'нет такого')
+
+        assert list(index) == [4, 7, 1, 5, 6]
+        assert index.keys_between(0, 2) == [4, 7]
+
+    def test_matches_sorted_list(self, monkeypatch):
+        """Случайные вставки и удаления должны давать тот же порядок, что и сортировка"""
+        monkeypatch.setattr(SortedNameIndex, 'BLOCK_SIZE', 4)
+        rng = random.Random(7)
+        index = SortedNameIndex()
+        expected: set[tuple[str, int]] = set()
+        for key in range(500):
+            name = ''.join(rng.choice('абв') for _ in range(3))
+            index.add(key, name)
+            expected.add((name, key))
+            if rng.random() < 0.3:
+                removed = rng.choice(sorted(expected))
+                index.remove(removed[1], removed[0])
+                expected.discard(removed)
+
+        ordered = sorted(expected)
+        assert list(index) == [key for _, key in ordered]
+        assert index.keys_between(*index.bounds('аб', 'б')) == [
+            key for name, key in ordered if 'аб' <= name and (name < 'б' or name.startswith('б'))
+        ]
+
+    def test_rebuild(self):
+        """rebuild должен заполнять индекс одной сортировкой"""
+        index = SortedNameIndex()
+        index.rebuild([('борис', 1), ('анна', 2)])
+
+        assert list(index) == [2, 1]
+        index.clear()
+        assert list(index) == [] and len(index) == 0
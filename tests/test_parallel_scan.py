@@ -0,0 +1,63 @@
+import re
+import pytest
+from custom_types import Contact
+from tools.parallel_scan import ParallelScanner
+from tools.query import fold_contact
+
+
+class TestParallelScanner:
+    """Тесты для класса ParallelScanner"""
+
+    @pytest.fixture
+    def scanner(self):
+        scanner = ParallelScanner(workers=2)
+        yield scanner
+        scanner.close()
+
+    @pytest.fixture
+    def keys(self):
+        return [fold_contact(Contact(id=i, name=f'Контакт {i}', phone_number=1000000 + i, comment=''))
+                for i in range(1, 101)]
+
+    def test_scan_matches_serial(self, scanner, keys):
+        """Результат совпадает с последовательной проверкой и идет по порядку"""
+        pattern = re.compile(r'контакт \d?7$')
+
+        positions = scanner.scan(keys, pattern, (0,))
+
+        assert positions == [pos for pos, key in enumerate(keys) if pattern.search(key[0])]
+        assert positions == [6, 16, 26, 36, 46, 56, 66, 76, 86, 96]
+
+    def test_changes_reach_workers_without_restart(self, scanner, keys):
+        """Изменения ключей доходят до процессов по журналу, пул не перезапускается"""
+        pattern = re.compile('^контакт (1|7|200)$')
+        assert scanner.scan(keys, pattern, (0,)) == [0, 6]
+        pool = scanner._pool
+
+        keys[6] = fold_contact(Contact(id=7, name='Седьмой', phone_number=1000007, comment=''))
+        scanner.changed(6, keys[6])
+        del keys[0]
+        scanner.removed(0)
+        keys.append(fold_contact(Contact(id=200, name='Контакт 200', phone_number=1000200, comment='')))
+        scanner.appended(keys[-1])
+
+        assert scanner.scan(keys, pattern, (0,)) == [99]
+        assert scanner._pool is pool
+
+    def test_replaced_restarts_pool(self, scanner, keys):
+        """После замены ключей целиком процессы получают новую копию"""
+        pattern = re.compile('^1000001$')
+        assert scanner.scan(keys, pattern, (1,)) == [0]
+
+        keys = keys[1:]
+        scanner.replaced()
+        assert scanner.scan(keys, pattern, (1,)) == []
+
+    def test_threaded_avoids_fork(self, keys):
+        """В многопоточном режиме процессы не запускаются через fork"""
+        scanner = ParallelScanner(workers=2, threaded=True)
+        try:
+            assert scanner.scan(keys, re.compile('^контакт 5$'), (0,)) == [4]
+            assert scanner._pool._mp_context.get_start_method() != 'fork'
+        finally:
+            scanner.close()
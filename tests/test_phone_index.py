@@ -0,0 +1,40 @@
+import pytest
+from tools import PhonePrefixIndex
+
+
+class TestPhonePrefixIndex:
+    """Тесты для класса PhonePrefixIndex"""
+
+    @pytest.fixture
+    def index(self):
+        """Фикстура с заполненным индексом"""
+        index = PhonePrefixIndex()
+        index.rebuild([('79501234567', 2), ('34612345678', 1), ('79211234567', 5), ('79501234567', 7)])
+        return index
+
+    def test_find_prefix(self, index):
+        """Должен вернуть ключи номеров с заданным префиксом в порядке номеров"""
+        assert index.find_prefix('79') == [5, 2, 7]
+        assert index.find_prefix('3461') == [1]
+        assert index.find_prefix('8') == []
+
+    def test_find_prefix_with_limit(self, index):
+        """Должен ограничить количество результатов"""
+        assert index.find_prefix('7', limit=2) == [5, 2]
+        assert index.find_prefix('7', limit=0) == []
+
+    def test_add_keeps_order(self, index):
+        """Должен вставлять номер с сохранением сортировки"""
+        index.add(3, '79300000000')
+        index.add(0, '79501234567')
+
+        assert index.find_prefix('79') == [5, 3, 0, 2, 7]
+        assert len(index) == 6
+
+    def test_remove(self, index):
+        """Должен удалить номер только для указанного ключа"""
+        index.remove(2, '79501234567')
+        index.remove(42, '79211234567')
+
+        assert index.find_prefix('7950') == [7]
+        assert index.find_prefix('7921') == [5]
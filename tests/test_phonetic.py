@@ -0,0 +1,77 @@
+import pytest
+from tools.phonetic import PhoneticIndex, double_metaphone, phonetic_keys, ru_metaphone
+
+
+class TestRuMetaphone:
+    """Тесты для функции ru_metaphone"""
+
+    @pytest.mark.parametrize("a,b", [
+        ('Иванов', 'Ивонов'),
+        ('Иванов', 'Иваноф'),
+        ('Петров', 'Пётров'),
+        ('Соловьёв', 'Соловьев'),
+        ('Дмитрий', 'Дмитрей'),
+        ('Лев', 'Леф'),
+    ])
+    def test_same_sound(self, a, b):
+        """Одинаково звучащие написания дают один ключ"""
+        assert ru_metaphone(a) == ru_metaphone(b)
+
+    @pytest.mark.parametrize("a,b", [('Иванов', 'Иванова'), ('Петров', 'Сидоров'), ('Жуков', 'Шуков')])
+    def test_different_sound(self, a, b):
+        """Разные слова и формы фамилий различаются"""
+        assert ru_metaphone(a) != ru_metaphone(b)
+
+    def test_non_cyrillic(self):
+        """Без кириллических букв ключ пустой"""
+        assert ru_metaphone('123') == ''
+
+
+class TestDoubleMetaphone:
+    """Тесты для функции double_metaphone"""
+
+    @pytest.mark.parametrize("a,b", [
+        ('Ivanov', 'Ivanoff'),
+        ('Alexander', 'Aleksandr'),
+        ('Philip', 'Filip'),
+        ('Catherine', 'Katherine'),
+        ('Knight', 'Night'),
+    ])
+    def test_same_primary(self, a, b):
+        """Одинаково звучащие написания дают один основной ключ"""
+        assert double_metaphone(a)[0] == double_metaphone(b)[0]
+
+    def test_alternate_key(self):
+        """Smith и Schmidt совпадают по альтернативному ключу"""
+        assert set(double_metaphone('Smith')) & set(double_metaphone('Schmidt'))
+
+    def test_phonetic_keys_by_alphabet(self):
+        """Ключи кириллических и латинских слов не смешиваются"""
+        assert phonetic_keys('Иванов Ivanov') == {'ru:ИВАН4', 'en:AFNF'}
+
+
+class TestPhoneticIndex:
+    """Тесты для класса PhoneticIndex"""
+
+    @pytest.fixture
+    def index(self):
+        index = PhoneticIndex()
+        index.add(1, 'Дмитрий Иванов')
+        index.add(2, 'Дмитрий Петров')
+        index.add(3, 'John Smith')
+        return index
+
+    def test_find(self, index):
+        """Каждое слово запроса должно совпасть по звучанию"""
+        assert index.find('Иваноф') == {1}
+        assert index.find('Дмитрей') == {1, 2}
+        assert index.find('Дмитрей Пётров') == {2}
+        assert index.find('Schmidt') == {3}
+        assert index.find('Сидоров') == set()
+
+    def test_remove(self, index):
+        """Удаленный ключ не находится"""
+        index.remove(1)
+
+        assert index.find('Дмитрий') == {2}
+        assert index.find('Иванов') == set()
@@ -0,0 +1,67 @@
+from custom_types import Contact
+from tools import compile_query, fold_contact
+
+
+class TestCompileQuery:
+    """Тесты для функции compile_query"""
+
+    def test_plain_term_is_literal(self):
+        """Запрос без метасимволов ищется как подстрока"""
+        query = compile_query('Иванов', 'name')
+
+        assert query.literal == 'иванов'
+        assert query.pattern is None
+        assert query.literals == ('Иванов',)
+
+    def test_regex_term(self):
+        """Запрос с метасимволами компилируется в регулярное выражение"""
+        query = compile_query('^Ив.*ва$', 'name')
+
+        assert query.literal is None
+        assert query.pattern.search('иванова')
+        assert query.literals == ('Ив', 'ва')
+
+    def test_invalid_regex_is_literal(self):
+        """Невалидное выражение ищется как подстрока"""
+        query = compile_query('[abc', 'comment')
+
+        assert query.literal == '[abc'
+        assert query.pattern is None
+
+    def test_query_is_cached(self):
+        """Повторный запрос берется из кеша"""
+        assert compile_query('abc', 'name') is compile_query('abc', 'name')
+
+    def test_fold_contact(self):
+        """Ключ поиска хранит свернутые поля и их объединение"""
+        key = fold_contact(Contact(id=1, name='Alex', phone_number=123, comment='Straße'))
+
+        assert key == ('alex', '123', 'strasse', 'alex\n123\nstrasse', 'Alex', 'Straße')
+
+    def test_literal_matcher(self):
+        """Литеральный запрос проверяет только свое поле ключа"""
+        key = fold_contact(Contact(id=1, name='Alex', phone_number=123, comment='друг'))
+
+        assert compile_query('ALEX', 'name').matcher()(key)
+        assert not compile_query('друг', 'name').matcher()(key)
+        assert compile_query('друг', 'all').matcher()(key)
+
+    def test_regex_matcher(self):
+        """В режиме all выражение проверяется по каждому полю отдельно"""
+        key = fold_contact(Contact(id=1, name='Alex', phone_number=123, comment='друг'))
+
+        assert compile_query('^12', 'phone_number').matcher()(key)
+        assert not compile_query('^12', 'name').matcher()(key)
+        assert compile_query('^12', 'all').matcher()(key)
+        assert compile_query('^ДРУГ$', 'all').matcher()(key)
+        assert not compile_query(r'alex\s12', 'all').matcher()(key)
+        assert not compile_query('alex.123', 'all').matcher()(key)
+
+    def test_regex_matches_original_text(self):
+        """Выражение должно проверяться по исходному тексту, а не по свернутому"""
+        key = fold_contact(Contact(id=1, name='Straße', phone_number=123, comment=''))
+
+        assert compile_query('Straße$', 'name').matcher()(key)
+        assert compile_query('^S.*ße', 'name').matcher()(key)
+        assert compile_query('STRASSE|straße', 'all').matcher()(key)
+        assert compile_query('strasse', 'name').matcher()(key)
@@ -0,0 +1,99 @@
+import threading
+import pytest
+from tools.rwlock import ReadWriteLock
+
+
+class TestReadWriteLock:
+    """Тесты для блокировки «читатели-писатель»"""
+
+    def test_readers_share_lock(self):
+        """Несколько читателей должны держать блокировку одновременно"""
+        lock = ReadWriteLock()
+        inside = threading.Barrier(3, timeout=2)
+
+        def read():
+            with lock.reader:
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        # Барьер пройдет, только если оба читателя внутри одновременно
+        inside.wait()
+        for thread in threads:
+            thread.join()
+
+    def test_writer_excludes_readers(self):
+        """Пока держится запись, читатель должен ждать"""
+        lock = ReadWriteLock()
+        entered = threading.Event()
+
+        def read():
+            with lock.reader:
+                entered.set()
+
+        with lock.writer:
+            thread = threading.Thread(target=read)
+            thread.start()
+            assert not entered.wait(0.05)
+        assert entered.wait(2)
+        thread.join()
+
+    def test_waiting_writer_blocks_new_readers(self):
+        """Ожидающий писатель должен пропускаться вперед новых читателей"""
+        lock = ReadWriteLock()
+        order: list[str] = []
+
+        def write():
+            with lock.writer:
+                order.append('writer')
+
+        def read():
+            with lock.reader:
+                order.append('reader')
+
+        with lock.reader:
+            writer = threading.Thread(target=write)
+            writer.start()
+            while not lock._writers_waiting:
+                pass
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(0.05)
+            assert not order
+        writer.join(2)
+        reader.join(2)
+
+        assert order == ['writer', 'reader']
+
+    def test_reentrant(self):
+        """Писатель может повторно брать запись и брать чтение"""
+        lock = ReadWriteLock()
+        with lock.writer:
+            with lock.writer:
+                with lock.reader:
+                    pass
+        with lock.reader:
+            with lock.reader:
+                pass
+
+        assert lock._writer is None
+        assert lock._readers == 0
+
+    def test_upgrade_is_error(self):
+        """Повышение чтения до записи должно вызывать RuntimeError"""
+        lock = ReadWriteLock()
+        with lock.reader:
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+
+        with lock.writer:
+            pass
+
+    def test_release_without_acquire(self):
+        """Освобождение незахваченной блокировки должно вызывать RuntimeError"""
+        lock = ReadWriteLock()
+        with pytest.raises(RuntimeError):
+            lock.release_read()
+        with pytest.raises(RuntimeError):
+            lock.release_write()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import pytest
+from model import ContactBookModel
+from server import ContactBookServer, parse_args
+from main import create_storage
+from tools.sharded_storage import ShardedStorage
+
+
+def http_request(method: str, path: str, body: dict | None = None, close: bool = False) -> bytes:
+    """Собирает запрос HTTP/1.1"""
+    data = b'' if body is None else json.dumps(body).encode('utf-8')
+    head = f'{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n'
+    if close:
+        head += 'Connection: close\r\n'
+    return (head + '\r\n').encode('latin-1') + data
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple[int, dict[str, str], object]:
+    """Читает один ответ: код, заголовки и разобранное JSON-тело"""
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+    status_line, *lines = head.strip().split('\r\n')
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(':') for line in lines)}
+    body = await reader.readexactly(int(headers['content-length']))
+    return int(status_line.split()[1]), headers, json.loads(body) if body else None
+
+
+def exchange(server: ContactBookServer, *requests: bytes) -> list[tuple[int, dict[str, str], object]]:
+    """
+    Запускает сервер, отправляет все запросы одним пакетом по одному соединению
+    (pipelining) и возвращает ответы по порядку
+    """
+    async def run():
+        tcp_server = await server.start('127.0.0.1', 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        async with tcp_server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b''.join(requests))
+            await writer.drain()
+            responses = [await read_response(reader) for _ in requests]
+            writer.close()
+            await writer.wait_closed()
+        return responses
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def server(contact_book):
+    server = ContactBookServer(contact_book, search_workers=2)
+    yield server
+    server.close()
+
+
+class TestContactBookServer:
+    """Тесты для HTTP/JSON сервера"""
+
+    def test_get_contact(self, server):
+        """Должен вернуть контакт по ID и 404 для несуществующего"""
+        (status, _, body), (missing, _, error) = exchange(
+            server, http_request('GET', '/contacts/1'), http_request('GET', '/contacts/99')
+        )
+
+        assert status == 200
+        assert body == {'id': 1, 'name': 'Alex', 'phone_number': 12345678, 'comment': 'abc'}
+        assert missing == 404
+        assert 'error' in error
+
+    def test_pipelined_requests_answered_in_order(self, server):
+        """Запросы, отправленные подряд, должны получить ответы по порядку на одном соединении"""
+        responses = exchange(
+            server,
+            http_request('POST', '/contacts', {'name': 'Анна', 'phone_number': '79501234567'}),
+            http_request('GET', '/contacts/3'),
+            http_request('PATCH', '/contacts/3', {'comment': 'коллега'}),
+            http_request('DELETE', '/contacts/2'),
+            http_request('GET', '/contacts/2', close=True),
+        )
+
+        assert [status for status, _, _ in responses] == [201, 200, 200, 204, 404]
+        assert responses[0][2] == {'id': 3}
+        assert responses[1][2]['name'] == 'Анна'
+        assert responses[2][2]['comment'] == 'коллега'
+        assert responses[0][1]['connection'] == 'keep-alive'
+        assert responses[-1][1]['connection'] == 'close'
+
+    def test_search_with_pagination(self, server, contact_book):
+        """Поиск должен отдавать страницы и ссылку на следующую"""
+        for i in range(5):
+            contact_book.add_contact({'name': f'Иван {i}', 'phone_number': 1000000 + i, 'comment': ''})
+
+        (_, _, first), (_, _, last), (_, _, everyone) = exchange(
+            server,
+            http_request('GET', '/contacts?q=%D0%B8%D0%B2%D0%B0%D0%BD&mode=1&limit=2'),
+            http_request('GET', '/contacts?q=%D0%B8%D0%B2%D0%B0%D0%BD&mode=1&limit=2&offset=4'),
+            http_request('GET', '/contacts?limit=100'),
+        )
+
+        assert [c['id'] for c in first['items']] == [3, 4]
+        assert first['next_offset'] == 2
+        assert [c['id'] for c in last['items']] == [7]
+        assert last['next_offset'] is None
+        assert len(everyone['items']) == 7
+
+    def test_offloaded_search(self, server, contact_book, monkeypatch):
+        """На большой книге поиск должен выполняться в пуле потоков с тем же результатом"""
+        monkeypatch.setattr(ContactBookServer, 'OFFLOAD_THRESHOLD', 1)
+        (status, _, body), = exchange(server, http_request('GET', '/contacts?q=bob'))
+
+        assert status == 200
+        assert [c['id'] for c in body['items']] == [2]
+
+    @pytest.mark.parametrize("request_bytes,expected", [
+        (http_request('POST', '/contacts', {'name': '', 'phone_number': '1234567'}), 400),
+        (http_request('POST', '/contacts', {'name': 'Ann', 'phone_number': '12ab'}), 400),
+        (b'POST /contacts HTTP/1.1\r\nContent-Length: 3\r\n\r\n[1]', 400),
+        (http_request('PATCH', '/contacts/1', {}), 400),
+        (http_request('PATCH', '/contacts/99', {'name': 'X'}), 404),
+        (http_request('GET', '/contacts?mode=9&q=x'), 400),
+        (http_request('GET', '/contacts?limit=-1'), 400),
+        (http_request('PUT', '/contacts/1'), 405),
+        (http_request('GET', '/unknown'), 404),
+    ])
+    def test_errors(self, server, request_bytes, expected):
+        """Некорректные запросы должны получать код ошибки и JSON с описанием"""
+        (status, _, body), = exchange(server, request_bytes)
+
+        assert status == expected
+        assert 'error' in body
+
+    def test_post_saves_contact(self, server, contact_book):
+        """POST /contacts должен сразу сохранить контакт — выданный ID окончательный"""
+        (status, _, body), = exchange(
+            server, http_request('POST', '/contacts', {'name': 'Анна', 'phone_number': '79501234567'})
+        )
+
+        assert (status, body) == (201, {'id': 3})
+        assert not contact_book.is_changed()
+        reloaded = ContactBookModel(str(contact_book.file_path))
+        reloaded.load_data()
+        assert reloaded.get_contact(3).name == 'Анна'
+
+    def test_save(self, server, contact_book):
+        """POST /save должен сохранить справочник"""
+        contact_book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+
+        (status, _, _), = exchange(server, http_request('POST', '/save'))
+
+        assert status == 200
+        assert not contact_book.is_changed()
+        reloaded = ContactBookModel(str(contact_book.file_path))
+        reloaded.load_data()
+        assert [c.name for c in reloaded.data] == ['Alex', 'Bob', 'John']
+
+    def test_parse_args_sharded_storage(self, tmp_path):
+        """Параметры сервера должны позволять открыть шардированный справочник"""
+        directory = tmp_path / 'book.shards'
+        directory.mkdir()
+
+        storage = create_storage(parse_args([str(directory), '--shard-size', '500']))
+        assert isinstance(storage, ShardedStorage)
+        assert storage.shard_size == 500
+        assert isinstance(create_storage(parse_args([str(tmp_path / 'new.shards')])), ShardedStorage)
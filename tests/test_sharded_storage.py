@@ -0,0 +1,195 @@
+import json
+import pytest
+from unittest.mock import patch
+from custom_types import Contact
+from custom_errors import FileCorruptedError, InvalidFileFormatError, SaveFileError
+from model import ContactBookModel
+from tools.file_writer import FileWriter
+from tools.sharded_storage import MANIFEST_NAME, ShardManifest, ShardedStorage, rebalance
+
+
+def make_contacts(count: int) -> list[Contact]:
+    return [Contact(id=i, name=f'User {i}', phone_number=1000000 + i, comment='') for i in range(1, count + 1)]
+
+
+def read_manifest(directory) -> dict:
+    return json.loads((directory / MANIFEST_NAME).read_text(encoding='utf-8'))
+
+
+def shard_file(directory, first_id: int) -> str:
+    """Имя файла шарда с заданным началом диапазона по манифесту"""
+    return next(s['file'] for s in read_manifest(directory)['shards'] if s['first_id'] == first_id)
+
+
+@pytest.fixture
+def book_dir(tmp_path):
+    """Справочник из 5 контактов по 2 в шарде"""
+    directory = tmp_path / 'book.shards'
+    ShardedStorage(directory, shard_size=2).write_all(make_contacts(5))
+    return directory
+
+
+class TestShardedStorage:
+    """Тесты для шардированного хранилища"""
+
+    def test_write_all_and_load(self, book_dir):
+        """Книга должна делиться на шарды по размеру и читаться обратно"""
+        manifest = read_manifest(book_dir)
+
+        assert [(s['first_id'], s['count']) for s in manifest['shards']] == [(1, 2), (3, 2), (5, 1)]
+        assert sorted(p.name for p in book_dir.glob('shard-*.json')) == [s['file'] for s in manifest['shards']]
+        assert ShardedStorage(book_dir).load() == make_contacts(5)
+        assert list(ShardedStorage(book_dir).load(stream=True)) == make_contacts(5)
+
+    def test_write_changes_touches_only_dirty_shards(self, book_dir):
+        """Сохранение изменений должно переписывать только затронутые шарды и манифест"""
+        storage = ShardedStorage(book_dir)
+        storage.load()
+        untouched = {first_id: shard_file(book_dir, first_id) for first_id in (1, 5)}
+        old = shard_file(book_dir, 3)
+        with patch.object(FileWriter, 'write', autospec=True, side_effect=FileWriter.write) as write:
+            storage.write_changes([
+                {'op': 'edit', 'id': 3, 'fields': {'name': 'Анна'}},
+                {'op': 'delete', 'id': 4},
+            ])
+
+        assert [call.args[0].file_path.name for call in write.call_args_list] == [shard_file(book_dir, 3)]
+        assert {first_id: shard_file(book_dir, first_id) for first_id in (1, 5)} == untouched
+        assert not (book_dir / old).exists()
+        assert [(c.id, c.name) for c in ShardedStorage(book_dir).load()][2:] == [(3, 'Анна'), (5, 'User 5')]
+        assert [s['count'] for s in read_manifest(book_dir)['shards']] == [2, 1, 1]
+
+    def test_adds_start_new_shard_when_last_is_full(self, book_dir):
+        """Новые контакты сверх размера шарда должны начинать новый шард"""
+        storage = ShardedStorage(book_dir)
+        storage.load()
+        storage.write_changes([
+            {'op': 'add', 'contact': c.to_dict()} for c in make_contacts(8)[5:]
+        ])
+
+        shards = read_manifest(book_dir)['shards']
+        assert [(s['first_id'], s['count']) for s in shards] == [(1, 2), (3, 2), (5, 2), (7, 2)]
+        assert ShardedStorage(book_dir).load() == make_contacts(8)
+
+    def test_open_reads_only_needed_shard(self, book_dir):
+        """Чтение по ID и позиции должно загружать только нужный шард"""
+        book = ShardedStorage(book_dir).open()
+
+        assert len(book) == 5
+        assert book.get(4).name == 'User 4'
+        assert book.get(3).name == 'User 3'
+        assert book.loaded_shards == 1
+        assert book[4].id == 5
+        assert book.get(42) is None
+        assert book.loaded_shards == 2
+        assert list(book) == make_contacts(5)
+
+    def test_rebalance_splits_oversized_shards(self, tmp_path):
+        """Перебалансировка должна делить только шарды больше нового размера"""
+        directory = tmp_path / 'book.shards'
+        storage = ShardedStorage(directory, shard_size=4)
+        storage.write_all(make_contacts(6))
+        untouched = shard_file(directory, 5)
+        mtime = (directory / untouched).stat().st_mtime_ns
+
+        assert rebalance(directory, shard_size=2) == 1
+
+        manifest = read_manifest(directory)
+        assert manifest['shard_size'] == 2
+        assert [(s['first_id'], s['count']) for s in manifest['shards']] == [(1, 2), (3, 2), (5, 2)]
+        assert shard_file(directory, 5) == untouched
+        assert (directory / untouched).stat().st_mtime_ns == mtime
+        assert sorted(p.name for p in directory.glob('shard-*.json')) == sorted(s['file'] for s in manifest['shards'])
+        assert ShardedStorage(directory).load() == make_contacts(6)
+        assert rebalance(directory) == 0
+
+    def test_failed_rebalance_keeps_book(self, tmp_path):
+        """Сбой при записи части шарда не должен терять контакты исходного шарда"""
+        directory = tmp_path / 'book.shards'
+        ShardedStorage(directory, shard_size=10).write_all(make_contacts(10))
+        original = FileWriter.write
+        calls = []
+
+        def fail_second(writer, contacts):
+            calls.append(1)
+            if len(calls) == 2:
+                raise SaveFileError('disk full')
+            original(writer, contacts)
+
+        with patch.object(FileWriter, 'write', autospec=True, side_effect=fail_second):
+            with pytest.raises(SaveFileError):
+                rebalance(directory, shard_size=3)
+
+        assert ShardedStorage(directory).load() == make_contacts(10)
+        assert rebalance(directory, shard_size=3) == 1
+        assert ShardedStorage(directory).load() == make_contacts(10)
+        assert len(list(directory.glob('shard-*.json'))) == 4
+
+    def test_missing_shard(self, book_dir):
+        """Отсутствующий файл шарда должен считаться повреждением"""
+        (book_dir / shard_file(book_dir, 3)).unlink()
+
+        with pytest.raises(FileCorruptedError):
+            ShardedStorage(book_dir).load()
+
+    def test_unknown_manifest_version(self, book_dir):
+        """Манифест неизвестной версии должен вызывать InvalidFileFormatError"""
+        (book_dir / MANIFEST_NAME).write_text('{"version": 99, "shards": []}', encoding='utf-8')
+
+        with pytest.raises(InvalidFileFormatError):
+            ShardManifest.read(book_dir)
+
+
+class TestShardedModel:
+    """Тесты модели на шардированном хранилище"""
+
+    def test_model_saves_only_dirty_shards(self, book_dir):
+        """save_file должен переписать только шарды измененных контактов"""
+        book = ContactBookModel(str(book_dir), storage=ShardedStorage(book_dir))
+        book.load_data()
+        book.edit_contact(1, {'comment': 'друг'})
+        book.add_contact({'name': 'Анна', 'phone_number': 79501234567, 'comment': ''})
+        untouched = shard_file(book_dir, 3)
+
+        with patch.object(FileWriter, 'write', autospec=True, side_effect=FileWriter.write) as write:
+            book.save_file()
+
+        written = sorted(call.args[0].file_path.name for call in write.call_args_list)
+        assert written == sorted([shard_file(book_dir, 1), shard_file(book_dir, 5)])
+        assert shard_file(book_dir, 3) == untouched
+        reloaded = ContactBookModel(str(book_dir), storage=ShardedStorage(book_dir))
+        reloaded.load_data()
+        assert reloaded.get_contact(1).comment == 'друг'
+        assert [c.id for c in reloaded.find_contact('анна', '1')] == [6]
+
+    def test_new_book(self, tmp_path):
+        """Для пустого каталога модель должна создать шардированный справочник"""
+        directory = tmp_path / 'new.shards'
+        book = ContactBookModel(str(directory), storage=ShardedStorage(directory))
+        book.load_data()
+        book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        book.save_file()
+        book.add_contact({'name': 'Анна', 'phone_number': 7654321, 'comment': ''})
+        book.save_file()
+
+        assert [c.name for c in ShardedStorage(directory).load()] == ['John', 'Анна']
+
+    def test_refresh_reads_only_changed_shards(self, book_dir):
+        """Чужое сохранение должно дочитываться по измененным шардам, а не всей книгой"""
+        first, second = (ContactBookModel(str(book_dir), storage=ShardedStorage(book_dir)) for _ in range(2))
+        first.load_data()
+        second.load_data()
+        first.edit_contact(3, {'name': 'Анна'})
+        first.delete_contact(4)
+        first.add_contact({'name': 'Борис', 'phone_number': 7654321, 'comment': ''})
+        first.save_file()
+        second.edit_contact(1, {'comment': 'свой'})
+
+        with patch.object(ShardManifest, 'read_shard', autospec=True, side_effect=ShardManifest.read_shard) as read:
+            assert second.refresh()
+
+        assert sorted(call.args[1].first_id for call in read.call_args_list) == [3, 5]
+        assert [(c.id, c.name, c.comment) for c in second.data] == [
+            (1, 'User 1', 'свой'), (2, 'User 2', ''), (3, 'Анна', ''), (5, 'User 5', ''), (6, 'Борис', ''),
+        ]
+        assert not second.refresh()
@@ -0,0 +1,123 @@
+import pytest
+import json
+from custom_types import Contact
+from custom_errors import FileCorruptedError
+from model import ContactBookModel
+from tools.sqlite_storage import SqliteStorage, migrate_json_to_sqlite
+
+
+class TestSqliteStorage:
+    """Тесты для класса SqliteStorage"""
+
+    @pytest.fixture
+    def storage(self, tmp_path, sample_contacts):
+        """Фикстура с базой из образцов контактов"""
+        storage = SqliteStorage(tmp_path / 'contacts.db')
+        storage.write_all(sample_contacts + [
+            Contact(id=3, name='Анна Серова', phone_number=79501234567, comment='коллега из отдела IT'),
+        ])
+        yield storage
+        storage.close()
+
+    def test_load_returns_contacts_in_id_order(self, storage):
+        """Должен загрузить все контакты в порядке ID"""
+        assert [c.id for c in storage.load()] == [1, 2, 3]
+        assert storage.get(3).name == 'Анна Серова'
+        assert storage.get(99) is None
+
+    def test_write_changes(self, storage):
+        """Должен применить операции без полной перезаписи"""
+        storage.write_changes([
+            {'op': 'add', 'contact': {'id': 4, 'name': 'John', 'phone_number': 1234567, 'comment': ''}},
+            {'op': 'edit', 'id': 1, 'fields': {'name': 'Александр', 'phone_number': 79001234567}},
+            {'op': 'delete', 'id': 2},
+        ])
+
+        assert [(c.id, c.name) for c in storage.load()] == [(1, 'Александр'), (3, 'Анна Серова'), (4, 'John')]
+        assert [c.id for c in storage.find_by_phone_prefix('7900')] == [1]
+
+    def test_find_by_phone_prefix(self, storage):
+        """Должен искать по началу номера с ограничением количества"""
+        assert [c.id for c in storage.find_by_phone_prefix('12345')] == [1]
+        assert [c.id for c in storage.find_by_phone_prefix('9')] == [2]
+        assert [c.id for c in storage.find_by_phone_prefix('', limit=2)] == [1, 3]
+
+    @pytest.mark.parametrize("term,fields,expected", [
+        ('серов', ('name', 'comment'), [3]),
+        ('АННА', ('name',), [3]),
+        ('отдел', ('name',), []),
+        ('отдел', ('comment',), [3]),
+        ('ab', ('comment',), [1, 2]),
+        ('"x', ('name',), []),
+    ])
+    def test_search_text(self, storage, term, fields, expected):
+        """Должен искать подстроку без учета регистра по выбранным полям"""
+        assert [c.id for c in storage.search_text(term, fields)] == expected
+
+    def test_search_index_follows_changes(self, storage):
+        """FTS-индекс должен обновляться вместе с таблицей"""
+        storage.write_changes([{'op': 'edit', 'id': 3, 'fields': {'name': 'Анна Петрова'}}])
+
+        assert storage.search_text('серов') == []
+        assert [c.id for c in storage.search_text('петров')] == [3]
+
+    def test_raises_corrupted_error_for_non_database(self, tmp_path):
+        """Должен вызвать FileCorruptedError, если файл не является базой"""
+        file_path = tmp_path / 'broken.db'
+        file_path.write_text('definitely not sqlite' * 100, encoding='utf-8')
+
+        with pytest.raises(FileCorruptedError):
+            SqliteStorage(file_path)
+
+    def test_model_with_sqlite_storage(self, tmp_path):
+        """Модель должна сохранять в базу только изменения и загружать их обратно"""
+        db_path = tmp_path / 'book.db'
+        book = ContactBookModel(str(db_path), storage=SqliteStorage(db_path))
+        book.load_data()
+        book.add_contact({'name': 'John', 'phone_number': 1234567, 'comment': ''})
+        book.add_contact({'name': 'Mary', 'phone_number': 7654321, 'comment': 'x'})
+        book.save_file()
+        book.delete_contact(1)
+        book.save_file()
+
+        reloaded = ContactBookModel(str(db_path), storage=SqliteStorage(db_path))
+        reloaded.load_data()
+
+        assert [c.name for c in reloaded.data] == ['Mary']
+        assert reloaded.is_changed() is False
+
+    def test_model_searches_through_database_indexes(self, tmp_path, storage):
+        """Поиск модели по имени, телефону и комментарию должен идти по индексам базы с учетом несохраненных изменений"""
+        book = ContactBookModel(str(storage.file_path), storage=storage)
+        book.load_data()
+        book.edit_contact(3, {'name': 'Анна Петрова'})
+        book.add_contact({'name': 'Петр Серов', 'phone_number': 79507654321, 'comment': 'из отдела продаж'})
+        book.delete_contact(1)
+
+        assert [c.id for c in book.find_contact('серов', '1')] == [4]
+        assert [c.id for c in book.find_contact('петров', '1')] == [3]
+        assert [c.id for c in book.find_contact('из отдела', '3')] == [3, 4]
+        assert [c.id for c in book.find_contact('^Пет.*ров$', '1')] == [4]
+        assert [c.id for c in book.find_contact('7950', '2')] == [3, 4]
+        assert [c.id for c in book.find_contact('7950', '2', limit=1)] == [3]
+        assert book.find_contact('111', '2') == []
+        assert [c.id for c in book.find_contact('9876', '2')] == [2]
+        assert book._trigrams is None and book._phones is None
+
+        book.save_file()
+        assert [c.id for c in book.find_contact('петр', '1')] == [3, 4]
+        assert [c.id for c in book.find_contact('79507', '2')] == [4]
+
+    def test_migrate_json_to_sqlite(self, tmp_path, sample_contacts):
+        """Должен перенести контакты из JSON вместе с журналом"""
+        json_path = tmp_path / 'data.json'
+        json_path.write_text(json.dumps([c.to_dict() for c in sample_contacts]), encoding='utf-8')
+        (tmp_path / 'data.json.journal').write_text('{"op": "delete", "id": 1}\n', encoding='utf-8')
+        db_path = tmp_path / 'data.db'
+
+        count = migrate_json_to_sqlite(json_path, db_path)
+
+        storage = SqliteStorage(db_path)
+        assert count == 1
+        assert [c.name for c in storage.load()] == ['Bob']
+        storage.close()
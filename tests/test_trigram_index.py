@@ -0,0 +1,66 @@
+import pytest
+from tools import TrigramIndex, extract_literals
+
+
+class TestTrigramIndex:
+    """Тесты для класса TrigramIndex"""
+
+    @pytest.fixture
+    def index(self):
+        """Фикстура с заполненным индексом"""
+        index = TrigramIndex()
+        index.add(1, 'Анна Серова')
+        index.add(2, 'Игорь Волков')
+        index.add(3, 'Alex')
+        return index
+
+    def test_candidates_by_literal(self, index):
+        """Должен вернуть ключи текстов, содержащих литерал"""
+        assert index.candidates(['серов']) == {1}
+
+    def test_candidates_case_insensitive(self, index):
+        """Должен искать без учета регистра"""
+        assert index.candidates(['ALE']) == {3}
+
+    def test_candidates_intersects_literals(self, index):
+        """Должен пересекать кандидатов по всем литералам"""
+        assert index.candidates(['Анна', 'Волк']) == set()
+        assert index.candidates(['Игорь', 'Волк']) == {2}
+
+    def test_candidates_none_for_short_literals(self, index):
+        """Должен вернуть None, если литералы короче трех символов"""
+        assert index.candidates(['Al', 'x']) is None
+        assert index.candidates([]) is None
+
+    def test_remove(self, index):
+        """Должен удалить ключ из индекса"""
+        index.remove(1, 'Анна Серова')
+
+        assert index.candidates(['Анна']) == set()
+        assert index._postings.get('анн') is None
+
+
+class TestExtractLiterals:
+    """Тесты для функции extract_literals"""
+
+    @pytest.mark.parametrize("pattern,expected", [
+        ('Alex', ['Alex']),
+        ('^Алекс.*ндр$', ['Алекс', 'ндр']),
+        ('colou?r', ['colo', 'r']),
+        ('ab*cd', ['a', 'cd']),
+        ('ab+cd', ['ab', 'cd']),
+        ('ab{0,2}cd', ['a', 'cd']),
+        (r'a\.b', ['a.b']),
+        (r'\d+abc', ['abc']),
+        ('[abc]def', ['def']),
+        ('[]x]yz', ['yz']),
+        ('x(abc)?yz', ['x', 'yz']),
+    ])
+    def test_extract_literals(self, pattern, expected):
+        """Должен выделить обязательные литеральные фрагменты"""
+        assert extract_literals(pattern) == expected
+
+    @pytest.mark.parametrize("pattern", ['abc|def', '(?i)abc', '(?x)a b c'])
+    def test_extract_literals_unsupported(self, pattern):
+        """Должен вернуть None для альтернатив и флагов"""
+        assert extract_literals(pattern) is None
@@ -0,0 +1,37 @@
+import io
+from view import ContactBookView
+import view
+
+
+class TestContactBookView:
+    """Тесты для класса ContactBookView"""
+
+    def test_show_contacts_format(self, sample_contacts):
+        """Карточки контактов разделяются звездочками"""
+        out = io.StringIO()
+        ContactBookView.show_contacts(sample_contacts, out)
+
+        assert out.getvalue() == (
+            '\nID: 1\nИмя: Alex\nТелефон: 12345678\nКомментарий: abc\n'
+            '\n***\n'
+            '\nID: 2\nИмя: Bob\nТелефон: 987654321\nКомментарий: abc\n\n'
+        )
+
+    def test_show_contacts_empty(self):
+        """Пустой список выводит сообщение"""
+        out = io.StringIO()
+        ContactBookView.show_contacts([], out)
+
+        assert out.getvalue() == 'Список контактов пуст\n\n'
+
+    def test_show_contacts_writes_in_chunks(self, sample_contacts, monkeypatch):
+        """Текст пишется в поток частями, а не одной строкой"""
+        monkeypatch.setattr(view, 'CHUNK_SIZE', 1)
+        out = io.StringIO()
+        writes = []
+        monkeypatch.setattr(out, 'write', writes.append)
+
+        ContactBookView.show_contacts(iter(sample_contacts), out)
+
+        assert len(writes) == 3
+        assert ''.join(writes).count('ID: ') == 2
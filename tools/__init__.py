@@ -1,2 +1,18 @@
 from .file_reader import FileReader
-from .file_writer import FileWriter
\ No newline at end of file
+from .file_writer import FileWriter
+from .trigram_index import TrigramIndex, extract_literals
+from .phone_index import PhonePrefixIndex
+from .journal import ContactJournal
+from .columnar_store import ColumnarContactStore, ContactRecord
+from .autosave import AutoSaver
+from .storage import ContactStorage, ExternalChanges, JsonStorage
+from .sqlite_storage import SqliteStorage, migrate_json_to_sqlite
+from .query import SearchKey, SearchQuery, compile_query, fold_contact
+from .importer import ImportReport, import_contacts, read_rows, validate_rows
+from .binary_book import BinaryFileWriter, BinaryStorage, MappedContactBook
+from .lazy_contacts import LazyContactList
+from .book_cache import BookCache
+from .rwlock import ReadWriteLock
+from .file_lock import FileLock
+from .sharded_storage import ShardedContactBook, ShardedStorage, rebalance
+from .name_index import SortedNameIndex
\ No newline at end of file
@@ -0,0 +1,61 @@
+import threading
+from time import monotonic
+from typing import Callable
+
+
+class AutoSaver:
+    """
+    Фоновый поток, периодически вызывающий функцию сохранения.
+
+    Сохранение запускается по истечении interval секунд, после threshold
+    изменений или по явному запросу — смотря что наступит раньше. Функция
+    сохранения сама обрабатывает свои ошибки: исключение завершит поток.
+    """
+
+    def __init__(self, save: Callable[[], None], interval: float = 30.0, threshold: int = 100):
+        self._save = save
+        self.interval = interval
+        self.threshold = threshold
+        self._condition = threading.Condition()
+        self._changes = 0
+        self._requested = False
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает поток, дожидаясь окончания текущего сохранения"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def notify_change(self) -> None:
+        with self._condition:
+            self._changes += 1
+            if self._changes >= self.threshold:
+                self._condition.notify()
+
+    def request_save(self) -> None:
+        with self._condition:
+            self._requested = True
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            deadline = monotonic() + self.interval
+            with self._condition:
+                while not (self._stopped or self._requested or self._changes >= self.threshold):
+                    timeout = deadline - monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                self._requested = False
+                self._changes = 0
+
+            self._save()
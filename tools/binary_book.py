@@ -0,0 +1,223 @@
+import mmap
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import IO, Iterable, Iterator, overload
+from custom_types import Contact
+from custom_errors import FileCorruptedError, InvalidFileFormatError
+from .file_writer import FileWriter
+from .lazy_contacts import ContactTuple, LazyContactList
+from .storage import ContactStorage
+
+# Формат файла:
+#   заголовок  — сигнатура, версия, флаги, количество контактов, размер кучи строк;
+#   записи     — по одной фиксированной записи на контакт: ID, телефон,
+#                смещение и длина имени, смещение и длина комментария;
+#   куча строк — имена и комментарии в UTF-8 подряд, смещения отсчитываются от ее начала.
+MAGIC = b'PBK1'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHQQ')
+RECORD = struct.Struct('<qqQIQI')
+# ID записей строго возрастают — контакт по ID ищется двоичным поиском
+FLAG_SORTED_IDS = 1
+
+
+class BinaryFileWriter(FileWriter):
+    """Класс для записи контактов в бинарный файл справочника (см. MappedContactBook)"""
+
+    def write(self, contacts: Iterable[Contact]) -> None:
+        """
+        Атомарно записывает контакты в бинарный файл.
+
+        Raises:
+            SaveFileError: Если не удалось сохранить файл
+        """
+        self._replace_file(lambda file: self._dump(contacts, file), binary=True)
+
+    @staticmethod
+    def _dump(contacts: Iterable[Contact], file: IO[bytes]) -> None:
+        records = bytearray()
+        heap = bytearray()
+        flags = FLAG_SORTED_IDS
+        count = 0
+        previous_id: int | None = None
+        for contact in contacts:
+            name = contact.name.encode('utf-8')
+            comment = contact.comment.encode('utf-8')
+            name_offset = len(heap)
+            heap += name
+            heap += comment
+            records += RECORD.pack(
+                contact.id, contact.phone_number, name_offset, len(name), name_offset + len(name), len(comment)
+            )
+            if previous_id is not None and contact.id <= previous_id:
+                flags &= ~FLAG_SORTED_IDS
+            previous_id = contact.id
+            count += 1
+
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, count, len(heap)))
+        file.write(records)
+        file.write(heap)
+
+
+class MappedContactBook(Sequence[Contact]):
+    """
+    Бинарный файл справочника, отображенный в память через mmap.
+
+    При открытии читается только заголовок; записи и строки декодируются при
+    обращении к конкретной позиции, поэтому время открытия и память на поиск
+    по позиции или ID не зависят от размера книги. Содержимое доступно только
+    для чтения; после перезаписи файла открытое отображение продолжает
+    показывать старую версию.
+    """
+
+    def __init__(self, file_path: Path):
+        """
+        Raises:
+            FileNotFoundError: Если файл не существует
+            InvalidFileFormatError: Если файл не является бинарным справочником
+            FileCorruptedError: Если файл обрезан или поврежден
+        """
+        with open(file_path, 'rb') as file:
+            size = file.seek(0, 2)
+            if size < HEADER.size:
+                raise FileCorruptedError(f'Файл {file_path} поврежден или пуст')
+            # Отображение остается действительным и после закрытия файла
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, flags, count, heap_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise InvalidFileFormatError(f'Файл {file_path} не является бинарным справочником')
+        self._heap_start = HEADER.size + count * RECORD.size
+        if size != self._heap_start + heap_size:
+            self._mmap.close()
+            raise FileCorruptedError(f'Файл {file_path} поврежден: размер не совпадает с заголовком')
+
+        self._count = count
+        self._flags = flags
+        # memoryview позволяет декодировать строки прямо из отображения, без копии в bytes
+        self._view = memoryview(self._mmap)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Contact: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Contact]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._contact_at(pos) for pos in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('Позиция вне справочника')
+        return self._contact_at(index)
+
+    def __iter__(self) -> Iterator[Contact]:
+        for pos in range(self._count):
+            yield self._contact_at(pos)
+
+    @property
+    def sorted_ids(self) -> bool:
+        return bool(self._flags & FLAG_SORTED_IDS)
+
+    def record(self, pos: int) -> tuple[int, int, int, int, int, int]:
+        """Сырая запись: ID, телефон, смещение и длина имени, смещение и длина комментария"""
+        return RECORD.unpack_from(self._mmap, HEADER.size + pos * RECORD.size)
+
+    def records(self) -> Iterator[ContactTuple]:
+        """Сырые записи контактов (ID, имя, телефон, комментарий) по порядку, без создания Contact"""
+        for pos in range(self._count):
+            cid, phone_number, name_offset, name_length, comment_offset, comment_length = self.record(pos)
+            yield cid, self._text(name_offset, name_length), phone_number, self._text(comment_offset, comment_length)
+
+    def id_at(self, pos: int) -> int:
+        return struct.unpack_from('<q', self._mmap, HEADER.size + pos * RECORD.size)[0]
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._heap_start + offset
+        return str(self._view[start:start + length], 'utf-8')
+
+    def _contact_at(self, pos: int) -> Contact:
+        cid, phone_number, name_offset, name_length, comment_offset, comment_length = self.record(pos)
+        return Contact(
+            id=cid,
+            name=self._text(name_offset, name_length),
+            phone_number=phone_number,
+            comment=self._text(comment_offset, comment_length),
+        )
+
+    def position(self, cid: int) -> int | None:
+        """
+        Позиция контакта с данным ID или None.
+
+        Если ID в файле возрастают (так пишет модель), используется двоичный
+        поиск по записям; иначе — линейный просмотр.
+        """
+        if not self.sorted_ids:
+            return next((pos for pos in range(self._count) if self.id_at(pos) == cid), None)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.id_at(middle) < cid:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self._count and self.id_at(low) == cid else None
+
+    def get(self, cid: int) -> Contact | None:
+        pos = self.position(cid)
+        return None if pos is None else self._contact_at(pos)
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'MappedContactBook':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BinaryStorage(ContactStorage):
+    """
+    Бинарный файл справочника: записи фиксированной длины и куча строк UTF-8.
+
+    Сохранение всегда перезаписывает файл целиком. Для точечного чтения без
+    загрузки всей книги файл можно открыть через open().
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self.writer = BinaryFileWriter(file_path)
+
+    def open(self) -> MappedContactBook:
+        """Отображает файл в память; отображение нужно закрыть через close()"""
+        return MappedContactBook(self.file_path)
+
+    def load(self, stream: bool = False) -> Iterable[Contact]:
+        """
+        Загружает контакты из файла.
+
+        Без stream возвращает LazyContactList сырых записей, как и JsonStorage:
+        объекты Contact создаются при первом обращении, а ключи поиска модель
+        строит прямо по записям.
+        """
+        book = self.open()
+        if stream:
+            return self._iter_and_close(book)
+        with book:
+            return LazyContactList(book.records())
+
+    @staticmethod
+    def _iter_and_close(book: MappedContactBook) -> Iterator[Contact]:
+        with book:
+            yield from book
+
+    def write_all(self, contacts: Iterable[Contact]) -> None:
+        self.writer.write(contacts)
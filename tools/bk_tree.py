@@ -0,0 +1,117 @@
+from typing import Iterator
+
+
+def damerau_levenshtein(a: str, b: str) -> int:
+    """
+    Расстояние Дамерау — Левенштейна: вставка, удаление, замена и перестановка
+    соседних символов (алгоритм Лоуранса — Вагнера). В отличие от упрощенного
+    варианта OSA это метрика, поэтому на ней корректно работает BK-дерево.
+    """
+    if a == b:
+        return 0
+    if not a or not b:
+        return len(a) or len(b)
+
+    infinity = len(a) + len(b)
+    # Таблица со сдвигом на две строки и столбца; нулевые строка и столбец — «бесконечность»
+    d = [[infinity] * (len(b) + 2)] + [[infinity] + [0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i + 1][1] = i
+    for j in range(len(b) + 1):
+        d[1][j + 1] = j
+
+    # Последняя строка таблицы, в которой встречался символ a
+    last_row: dict[str, int] = {}
+    for i in range(1, len(a) + 1):
+        # Последний столбец в текущей строке, где символы совпали
+        last_match_column = 0
+        for j in range(1, len(b) + 1):
+            k = last_row.get(b[j - 1], 0)
+            m = last_match_column
+            if a[i - 1] == b[j - 1]:
+                cost = 0
+                last_match_column = j
+            else:
+                cost = 1
+            d[i + 1][j + 1] = min(
+                d[i][j] + cost,
+                d[i + 1][j] + 1,
+                d[i][j + 1] + 1,
+                d[k][m] + (i - k - 1) + 1 + (j - m - 1),
+            )
+        last_row[a[i - 1]] = i
+    return d[len(a) + 1][len(b) + 1]
+
+
+class _Node:
+    __slots__ = ('word', 'keys', 'children')
+
+    def __init__(self, word: str):
+        self.word = word
+        self.keys: set[int] = set()
+        self.children: dict[int, '_Node'] = {}
+
+
+class BKTree:
+    """
+    BK-дерево слов для поиска с опечатками по расстоянию damerau_levenshtein.
+
+    Каждое слово хранится один раз вместе с ключами (ID контактов), в которых
+    оно встречается. Удаление убирает только ключ: узел без ключей остается
+    в дереве, но не попадает в результаты.
+    """
+
+    def __init__(self):
+        self._root: _Node | None = None
+        self._nodes: dict[str, _Node] = {}
+
+    def add(self, key: int, word: str) -> None:
+        node = self._nodes.get(word)
+        if node is None:
+            node = self._insert(word)
+        node.keys.add(key)
+
+    def remove(self, key: int, word: str) -> None:
+        node = self._nodes.get(word)
+        if node is not None:
+            node.keys.discard(key)
+
+    def clear(self) -> None:
+        self._root = None
+        self._nodes.clear()
+
+    def _insert(self, word: str) -> _Node:
+        new_node = _Node(word)
+        self._nodes[word] = new_node
+        if self._root is None:
+            self._root = new_node
+            return new_node
+
+        node = self._root
+        while True:
+            distance = damerau_levenshtein(word, node.word)
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = new_node
+                return new_node
+            node = child
+
+    def search(self, word: str, max_distance: int) -> Iterator[tuple[int, str, set[int]]]:
+        """
+        Находит слова на расстоянии не больше max_distance.
+
+        Yields:
+            tuple: Расстояние, найденное слово и ключи, в которых оно встречается
+        """
+        if self._root is None:
+            return
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = damerau_levenshtein(word, node.word)
+            if distance <= max_distance and node.keys:
+                yield distance, node.word, node.keys
+            # Неравенство треугольника: подходящие слова лежат только в этих поддеревьях
+            for edge, child in node.children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
@@ -0,0 +1,95 @@
+import hashlib
+import marshal
+import os
+from pathlib import Path
+from typing import Iterable
+from custom_types import Contact
+from custom_errors import PhoneBookBaseException
+from .columnar_store import ColumnarContactStore
+from .file_writer import FileWriter
+from .lazy_contacts import LazyContactList
+
+# Версия формата кеша; кеш другой версии считается промахом
+CACHE_VERSION = 1
+
+# Отпечаток файла справочника: mtime в наносекундах, размер и blake2b содержимого
+Fingerprint = tuple[int, int, bytes]
+# Колонки книги: ID, имена, телефоны, комментарии
+Columns = tuple[list[int], list[str], list[int], list[str]]
+
+
+def contact_columns(contacts: Iterable[Contact]) -> Columns:
+    """Раскладывает контакты по колонкам"""
+    if isinstance(contacts, LazyContactList):
+        records = contacts.records()
+    else:
+        records = [(c.id, c.name, c.phone_number, c.comment) for c in contacts]
+    if not records:
+        return [], [], [], []
+    ids, names, phones, comments = map(list, zip(*records))
+    return ids, names, phones, comments
+
+
+class BookCache:
+    """
+    Кеш разобранного справочника в файле <файл>.cache рядом с ним.
+
+    Хранит колонки контактов, сериализованные marshal, вместе с отпечатком
+    JSON-файла (mtime, размер и хеш blake2b содержимого). Если отпечаток
+    совпадает с текущим файлом, книгу можно взять из кеша без разбора JSON
+    и проверки контактов. Кеш необязателен: поврежденный или устаревший кеш
+    считается промахом, а ошибка его записи не мешает сохранению книги.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self.cache_path = file_path.with_name(file_path.name + '.cache')
+        self._writer = FileWriter(self.cache_path)
+
+    def fingerprint(self) -> Fingerprint:
+        """
+        Отпечаток текущего файла справочника.
+
+        Raises:
+            FileNotFoundError: Если файл не существует
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.file_path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            while chunk := file.read(1024 * 1024):
+                digest.update(chunk)
+        return stat.st_mtime_ns, stat.st_size, digest.digest()
+
+    def load(self) -> Columns | None:
+        """Колонки из кеша, если он соответствует текущему файлу; иначе None"""
+        try:
+            with open(self.cache_path, 'rb') as file:
+                # marshal.load читает файл мелкими порциями; одно чтение целиком в разы быстрее
+                version, fingerprint, columns = marshal.loads(file.read())
+            if version != CACHE_VERSION or tuple(fingerprint) != self.fingerprint():
+                return None
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return columns
+
+    def store(self, fingerprint: Fingerprint, columns: Columns) -> None:
+        """Записывает колонки с отпечатком файла, из которого они получены"""
+        try:
+            self._writer._replace_file(
+                lambda file: file.write(marshal.dumps((CACHE_VERSION, fingerprint, columns))), binary=True
+            )
+        except PhoneBookBaseException:
+            # Без кеша книга просто разбирается заново при следующем запуске
+            self.clear()
+
+    def clear(self) -> None:
+        self.cache_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def to_contacts(columns: Columns, compact: bool = False, lazy: bool = True):
+        """Строит из колонок колоночное хранилище, LazyContactList или список Contact"""
+        ids, names, phones, comments = columns
+        if compact:
+            return ColumnarContactStore.from_columns(ids, names, phones, comments)
+        records = zip(ids, names, phones, comments)
+        return LazyContactList(records) if lazy else [Contact(*record) for record in records]
@@ -0,0 +1,246 @@
+from array import array
+from collections.abc import MutableSequence
+from typing import Any, Iterable, Iterator, overload
+from custom_types import Contact
+
+
+class ContactRecord:
+    """
+    Легковесное представление строки колоночного хранилища.
+
+    Поля читаются и записываются прямо в колонки хранилища. Представление
+    ссылается на номер строки, поэтому действительно только до удаления
+    или вставки строк перед ним.
+    """
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: 'ColumnarContactStore', row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._store._ids[self._row]
+
+    @property
+    def name(self) -> str:
+        return self._store._get_name(self._row)
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._store._set_name(self._row, value)
+
+    @property
+    def phone_number(self) -> int:
+        return self._store._phones[self._row]
+
+    @phone_number.setter
+    def phone_number(self, value: int) -> None:
+        self._store._phones[self._row] = value
+
+    @property
+    def comment(self) -> str:
+        return self._store._get_comment(self._row)
+
+    @comment.setter
+    def comment(self, value: str) -> None:
+        self._store._set_comment(self._row, value)
+
+    def to_dict(self) -> dict:
+        return {'id': self.id, 'name': self.name, 'phone_number': self.phone_number, 'comment': self.comment}
+
+    def to_contact(self) -> Contact:
+        return Contact(id=self.id, name=self.name, phone_number=self.phone_number, comment=self.comment)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (ContactRecord, Contact)):
+            return NotImplemented
+        return (self.id, self.name, self.phone_number, self.comment) == \
+            (other.id, other.name, other.phone_number, other.comment)
+
+    def __repr__(self) -> str:
+        return (f'ContactRecord(id={self.id!r}, name={self.name!r}, '
+                f'phone_number={self.phone_number!r}, comment={self.comment!r})')
+
+
+class ColumnarContactStore(MutableSequence):
+    """
+    Компактное колоночное хранилище контактов.
+
+    ID и телефоны лежат в массивах array('q'), имя и комментарий — в общей
+    куче UTF-8 байтов со смещениями и длинами. На контакт приходится 40 байт
+    служебных данных плюс сам текст вместо отдельного объекта со словарем
+    атрибутов и тремя-четырьмя вложенными объектами.
+
+    Телефон должен помещаться в знаковое 64-битное целое (до 18 цифр).
+    """
+
+    def __init__(self, contacts: Iterable[Any] = ()):
+        self._ids = array('q')
+        self._phones = array('q')
+        self._name_offsets = array('Q')
+        self._name_lengths = array('I')
+        self._comment_offsets = array('Q')
+        self._comment_lengths = array('I')
+        self._heap = bytearray()
+        # Байты кучи, на которые больше не ссылается ни одна строка
+        self._garbage = 0
+        for contact in contacts:
+            self.append(contact)
+
+    @classmethod
+    def from_columns(cls,
+                     ids: list[int],
+                     names: list[str],
+                     phones: list[int],
+                     comments: list[str]) -> 'ColumnarContactStore':
+        """Строит хранилище из готовых колонок без промежуточных объектов контактов"""
+        store = cls()
+        store._ids = array('q', ids)
+        store._phones = array('q', phones)
+        for texts, offsets, lengths in ((names, store._name_offsets, store._name_lengths),
+                                        (comments, store._comment_offsets, store._comment_lengths)):
+            for text in texts:
+                offset, length = store._put_text(text)
+                offsets.append(offset)
+                lengths.append(length)
+        return store
+
+    # --------- Работа с кучей строк ---------
+
+    def _put_text(self, text: str) -> tuple[int, int]:
+        encoded = text.encode('utf-8')
+        offset = len(self._heap)
+        self._heap += encoded
+        return offset, len(encoded)
+
+    def _get_text(self, offset: int, length: int) -> str:
+        return self._heap[offset:offset + length].decode('utf-8')
+
+    def _get_name(self, row: int) -> str:
+        return self._get_text(self._name_offsets[row], self._name_lengths[row])
+
+    def _get_comment(self, row: int) -> str:
+        return self._get_text(self._comment_offsets[row], self._comment_lengths[row])
+
+    def _set_name(self, row: int, value: str) -> None:
+        self._garbage += self._name_lengths[row]
+        self._name_offsets[row], self._name_lengths[row] = self._put_text(value)
+        self._maybe_compact_heap()
+
+    def _set_comment(self, row: int, value: str) -> None:
+        self._garbage += self._comment_lengths[row]
+        self._comment_offsets[row], self._comment_lengths[row] = self._put_text(value)
+        self._maybe_compact_heap()
+
+    def _maybe_compact_heap(self) -> None:
+        """Переупаковывает кучу, когда мусора в ней больше половины"""
+        if self._garbage * 2 <= len(self._heap) or len(self._heap) < 4096:
+            return
+        heap = bytearray()
+        for offsets, lengths in ((self._name_offsets, self._name_lengths),
+                                 (self._comment_offsets, self._comment_lengths)):
+            for row in range(len(self._ids)):
+                start = offsets[row]
+                offsets[row] = len(heap)
+                heap += self._heap[start:start + lengths[row]]
+        self._heap = heap
+        self._garbage = 0
+
+    # --------- Протокол последовательности ---------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> ContactRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ContactRecord]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ContactRecord(self, row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('ColumnarContactStore index out of range')
+        return ContactRecord(self, index)
+
+    def __iter__(self) -> Iterator[ContactRecord]:
+        for row in range(len(self)):
+            yield ContactRecord(self, row)
+
+    def __setitem__(self, index: int, contact: Any) -> None:
+        record = self[index]
+        row = record._row
+        self._ids[row] = contact.id
+        self._phones[row] = contact.phone_number
+        record.name = contact.name
+        record.comment = contact.comment
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, slice):
+            for row in sorted(range(*index.indices(len(self))), reverse=True):
+                del self[row]
+            return
+        row = self[index]._row
+        self._garbage += self._name_lengths[row] + self._comment_lengths[row]
+        for column in self._columns():
+            del column[row]
+        self._maybe_compact_heap()
+
+    def insert(self, index: int, contact: Any) -> None:
+        index = max(0, min(index + len(self) if index < 0 else index, len(self)))
+        name_offset, name_length = self._put_text(contact.name)
+        comment_offset, comment_length = self._put_text(contact.comment)
+        values = (contact.id, contact.phone_number, name_offset, name_length, comment_offset, comment_length)
+        for column, value in zip(self._columns(), values):
+            column.insert(index, value)
+
+    def append(self, contact: Any) -> None:
+        name_offset, name_length = self._put_text(contact.name)
+        comment_offset, comment_length = self._put_text(contact.comment)
+        self._ids.append(contact.id)
+        self._phones.append(contact.phone_number)
+        self._name_offsets.append(name_offset)
+        self._name_lengths.append(name_length)
+        self._comment_offsets.append(comment_offset)
+        self._comment_lengths.append(comment_length)
+
+    def _columns(self) -> tuple[array, ...]:
+        return (self._ids, self._phones, self._name_offsets, self._name_lengths,
+                self._comment_offsets, self._comment_lengths)
+
+    # --------- Дополнительные методы ---------
+
+    def id_at(self, index: int) -> int:
+        """ID контакта в строке index без создания представления"""
+        return self._ids[index]
+
+    def delete_rows(self, rows: set[int]) -> None:
+        """Удаляет строки с номерами из rows за один проход по колонкам"""
+        if not rows:
+            return
+        keep = [row for row in range(len(self)) if row not in rows]
+        self._garbage += sum(self._name_lengths[row] + self._comment_lengths[row] for row in rows)
+        for column in self._columns():
+            column[:] = array(column.typecode, [column[row] for row in keep])
+        self._maybe_compact_heap()
+
+    def copy(self) -> 'ColumnarContactStore':
+        """Независимая копия хранилища (копируются колонки, а не объекты)"""
+        clone = ColumnarContactStore()
+        clone._ids, clone._phones = array('q', self._ids), array('q', self._phones)
+        clone._name_offsets, clone._name_lengths = array('Q', self._name_offsets), array('I', self._name_lengths)
+        clone._comment_offsets = array('Q', self._comment_offsets)
+        clone._comment_lengths = array('I', self._comment_lengths)
+        clone._heap = bytearray(self._heap)
+        clone._garbage = self._garbage
+        return clone
+
+    def memory_usage(self) -> int:
+        """Объем данных колонок и кучи строк в байтах"""
+        columns = sum(column.itemsize * len(column) for column in self._columns())
+        return columns + len(self._heap)
@@ -0,0 +1,72 @@
+import os
+import time
+from pathlib import Path
+from custom_errors import BookLockedError, SaveFileError
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка между процессами не поддерживается
+    fcntl = None
+
+
+class FileLock:
+    """
+    Рекомендательная блокировка справочника между процессами (fcntl.flock).
+
+    Блокируется отдельный файл <файл>.lock: сам справочник при сохранении
+    подменяется новым файлом, и блокировка старого файла ничего бы не защищала.
+    Блокировка привязана к открытому файлу, поэтому два объекта FileLock даже
+    в одном процессе исключают друг друга. Без fcntl блокировка ничего не делает.
+
+    Использование:
+        with FileLock(path):
+            ...
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, file_path: Path, timeout: float = 10.0):
+        self.lock_path = file_path.with_name(file_path.name + '.lock')
+        self.timeout = timeout
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        """
+        Захватывает блокировку, ожидая не дольше timeout секунд.
+
+        Raises:
+            BookLockedError: Если блокировку держит другой процесс дольше timeout
+            SaveFileError: Если не удалось открыть файл блокировки
+        """
+        if fcntl is None:
+            return
+        try:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            raise SaveFileError(f'Невозможно открыть файл блокировки {self.lock_path}: {e}')
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise BookLockedError(f'Справочник сохраняет другой процесс: {self.lock_path}')
+                time.sleep(self.POLL_INTERVAL)
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is not None:
+            # Закрытие файла снимает блокировку
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
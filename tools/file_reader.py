@@ -1,21 +1,101 @@
 import json
 from pathlib import Path
+from typing import Any, Iterator, TextIO
 from custom_types import Contact
 from custom_errors import FileCorruptedError, InvalidFileFormatError, ContactLoadError
+from .journal import ContactJournal
+from .lazy_contacts import LazyContactList
+
+
+_JSON_WHITESPACE = ' \t\n\r'
+
+
+class _JsonArrayStream:
+    """Потоковый разбор JSON-массива верхнего уровня по одному элементу"""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """Дочитывает следующий кусок файла. Возвращает False в конце файла."""
+        # Кусок не меньше уже накопленного буфера, чтобы большой элемент
+        # дочитывался за логарифмическое число попыток
+        chunk = self._file.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Пропускает пробельные символы и возвращает следующий символ ('' в конце файла)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def read_rest(self) -> str:
+        return self._buffer[self._pos:] + self._file.read()
+
+    def _decode_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Число на границе куска могло оборваться: дочитываем и разбираем заново
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def __iter__(self) -> Iterator[Any]:
+        self._pos += 1  # '['
+        if self.peek() == ']':
+            self._pos += 1
+        else:
+            while True:
+                yield self._decode_value()
+                delimiter = self.peek()
+                self._pos += 1
+                if delimiter == ']':
+                    break
+                if delimiter != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos - 1)
+
+        if self.peek():
+            raise json.JSONDecodeError('Extra data', self._buffer, self._pos)
 
 
 class FileReader:
     """Класс для чтения данных контактов из JSON файла"""
 
-    def __init__(self, file_path: Path):
+    def __init__(self, file_path: Path, chunk_size: int = 64 * 1024, journal: ContactJournal | None = None):
         self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.journal = journal
 
-    def read(self) -> list[Contact]:
+    def read(self, lazy: bool = False) -> list[Contact] | LazyContactList:
         """
         Читает и парсит данные контактов из JSON файла.
+        Если задан журнал изменений, его записи применяются поверх файла.
+
+        Args:
+            lazy: Вернуть LazyContactList — объекты Contact создаются при первом
+                обращении. Если журнал непуст, контакты создаются сразу для его применения.
 
         Returns:
-            list[Contact]: Список валидных контактов из файла
+            list[Contact] | LazyContactList: Список валидных контактов из файла
 
         Raises:
             FileNotFoundError: Если файл не существует
@@ -23,30 +103,56 @@ class FileReader:
             InvalidFileFormatError: Если формат файла некорректен
             ContactLoadError: Если не удалось загрузить контакты
         """
-        if not self.file_path.exists():
-            raise FileNotFoundError(f'Файл {self.file_path} не найден')
+        contacts = LazyContactList.from_dicts(self._iter_items()) if lazy else list(self.iter_contacts())
+        if self.journal is not None:
+            contacts = self.journal.replay(contacts)
+        return contacts
 
-        try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                raw = json.load(file)
-        except json.JSONDecodeError as e:
-            raise FileCorruptedError(f'Файл поврежден или пуст: {e}')
+    def iter_contacts(self) -> Iterator[Contact]:
+        """
+        Потоково читает контакты из JSON файла, разбирая массив поэлементно.
+        Журнал изменений при этом не применяется.
 
-        if not isinstance(raw, list):
-            raise InvalidFileFormatError('Некорректный формат файла данных (ожидался список).')
+        В памяти одновременно держится только текущий кусок файла, а первые
+        контакты доступны до окончания разбора. Ошибки отдельных контактов
+        собираются и выбрасываются после чтения всего файла.
 
-        contacts: list[Contact] = []
-        errors: list[str] = []
+        Yields:
+            Contact: Очередной валидный контакт из файла
 
-        for item in raw:
-            if not isinstance(item, dict):
-                continue
+        Raises:
+            FileNotFoundError: Если файл не существует
+            FileCorruptedError: Если файл поврежден или пуст
+            InvalidFileFormatError: Если формат файла некорректен
+            ContactLoadError: Если не удалось загрузить контакты
+        """
+        errors: list[str] = []
+        for item in self._iter_items():
             try:
-                contacts.append(Contact.from_dict(item))
+                contact = Contact.from_dict(item)
             except Exception as e:
                 errors.append(f'Контакт {item}: {e}')
+            else:
+                yield contact
 
         if errors:
             raise ContactLoadError('\n'.join(errors))
 
-        return contacts
+    def _iter_items(self) -> Iterator[dict[str, Any]]:
+        """Потоково читает словари контактов из JSON-массива без их проверки"""
+        if not self.file_path.exists():
+            raise FileNotFoundError(f'Файл {self.file_path} не найден')
+
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            stream = _JsonArrayStream(file, self.chunk_size)
+            try:
+                if stream.peek() != '[':
+                    # Не массив: отличаем валидный JSON другого типа от поврежденного файла
+                    json.loads(stream.read_rest())
+                    raise InvalidFileFormatError('Некорректный формат файла данных (ожидался список).')
+
+                for item in stream:
+                    if isinstance(item, dict):
+                        yield item
+            except json.JSONDecodeError as e:
+                raise FileCorruptedError(f'Файл поврежден или пуст: {e}')
@@ -1,5 +1,8 @@
 import json
+import os
+import tempfile
 from pathlib import Path
+from typing import IO, Callable
 from custom_types import Contact
 from custom_errors import SaveFileError, CreateEmptyBookError
 
@@ -10,23 +13,25 @@ class FileWriter:
     def __init__(self, file_path: Path):
         self.file_path = file_path
 
-    def _ensure_file_exists(self) -> None:
+    def _ensure_directory_exists(self) -> None:
         """
-        Создает пустой файл и необходимые директории, если они не существуют.
+        Создает необходимые директории, если они не существуют.
 
         Raises:
-            CreateEmptyBookError: Если не удалось создать файл или директории
+            CreateEmptyBookError: Если не удалось создать директории
         """
         try:
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            if not self.file_path.exists():
-                self.file_path.touch()
         except OSError as e:
             raise CreateEmptyBookError(f'Ошибка в создании пустого справочника по пути {self.file_path}: {e}')
 
     def write(self, contacts: list[Contact]) -> None:
         """
-        Записывает список контактов в JSON файл.
+        Атомарно записывает список контактов в JSON файл.
+
+        Данные пишутся во временный файл рядом с целевым, сбрасываются на диск
+        и подменяют целевой файл через os.replace, поэтому при сбое на диске
+        остается либо старая, либо новая версия справочника целиком.
 
         Args:
             contacts: Список контактов для сохранения
@@ -34,9 +39,56 @@ class FileWriter:
         Raises:
             SaveFileError: Если не удалось сохранить файл
         """
-        self._ensure_file_exists()
+        self._replace_file(
+            lambda file: json.dump([c.to_dict() for c in contacts], file, ensure_ascii=False)
+        )
+
+    def _replace_file(self, dump: Callable[[IO], None], binary: bool = False) -> None:
+        """
+        Пишет файл через dump во временный файл и атомарно подменяет им целевой.
+
+        Raises:
+            SaveFileError: Если не удалось сохранить файл
+        """
+        self._ensure_directory_exists()
+        tmp_path: str | None = None
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                json.dump([c.to_dict() for c in contacts], file, ensure_ascii=False)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.file_path.parent, prefix=f'.{self.file_path.name}.', suffix='.tmp'
+            )
+            os.close(fd)
+            with open(tmp_path, 'wb') if binary else open(tmp_path, 'w', encoding='utf-8') as file:
+                dump(file)
+                file.flush()
+                os.fsync(file.fileno())
+            self._copy_permissions(tmp_path)
+            os.replace(tmp_path, self.file_path)
+            tmp_path = None
+            self._fsync_directory()
         except Exception as e:
             raise SaveFileError(f'Невозможно сохранить файл: {e}')
+        finally:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def _copy_permissions(self, tmp_path: str) -> None:
+        """mkstemp создает файл с правами 0600 — возвращаем права исходного файла"""
+        try:
+            mode = self.file_path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+
+    def _fsync_directory(self) -> None:
+        """Сбрасывает на диск запись каталога, чтобы переименование пережило сбой питания"""
+        try:
+            fd = os.open(self.file_path.parent, os.O_RDONLY)
+        except OSError:
+            # На некоторых платформах каталог нельзя открыть для fsync
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -0,0 +1,145 @@
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from custom_types import Contact, ContactAdd
+from custom_errors import FileCorruptedError, InvalidFileFormatError, PhoneBookValueError
+
+CSV_SUFFIXES = {'.csv'}
+JSONL_SUFFIXES = {'.jsonl', '.ndjson'}
+
+# Строка исходного файла: номер строки и сырые значения полей
+Row = tuple[int, dict[str, Any]]
+
+
+@dataclass
+class ImportReport:
+    """Итог импорта: ID добавленных контактов и ошибки в отброшенных строках"""
+
+    added: range
+    errors: list[str] = field(default_factory=list)
+
+
+def read_rows(file_path: Path) -> Iterator[Row]:
+    """
+    Читает строки CSV (с заголовком name,phone_number,comment) или JSONL файла.
+
+    Raises:
+        FileNotFoundError: Если файл не существует
+        InvalidFileFormatError: Если формат файла не поддерживается
+        FileCorruptedError: Если строка JSONL не является JSON-объектом
+    """
+    suffix = file_path.suffix.lower()
+    if suffix in CSV_SUFFIXES:
+        with open(file_path, encoding='utf-8-sig', newline='') as file:
+            # Первая строка — заголовок, данные начинаются со второй
+            for line, row in enumerate(csv.DictReader(file), 2):
+                yield line, row
+    elif suffix in JSONL_SUFFIXES:
+        with open(file_path, encoding='utf-8') as file:
+            for line, text in enumerate(file, 1):
+                if not text.strip():
+                    continue
+                try:
+                    row = json.loads(text)
+                except json.JSONDecodeError as e:
+                    raise FileCorruptedError(f'Строка {line} не является JSON: {e}')
+                if not isinstance(row, dict):
+                    raise FileCorruptedError(f'Строка {line} должна быть JSON-объектом')
+                yield line, row
+    else:
+        raise InvalidFileFormatError(f'Поддерживаются только файлы CSV и JSONL: {file_path}')
+
+
+def validate_rows(rows: list[Row]) -> tuple[list[ContactAdd], list[str]]:
+    """
+    Проверяет пачку строк теми же правилами, что и ручной ввод.
+
+    Returns:
+        tuple: Данные корректных контактов и сообщения об ошибках в остальных строках
+    """
+    contacts: list[ContactAdd] = []
+    errors: list[str] = []
+    for line, row in rows:
+        name = str(row.get('name') or '').strip()
+        comment = str(row.get('comment') or '').strip()
+        try:
+            Contact.validate_name(name)
+            phone_number = Contact.parse_phone_number(str(row.get('phone_number') or '').strip())
+        except PhoneBookValueError as e:
+            errors.append(f'Строка {line}: {e}')
+        else:
+            contacts.append({'name': name, 'phone_number': phone_number, 'comment': comment})
+    return contacts, errors
+
+
+def _batches(rows: Iterable[Row], batch_size: int) -> Iterator[list[Row]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def validate_in_batches(rows: Iterable[Row],
+                        batch_size: int = 10_000,
+                        executor: Executor | None = None,
+                        max_pending: int = 8) -> Iterator[tuple[list[ContactAdd], list[str]]]:
+    """
+    Проверяет строки пачками, сохраняя их порядок.
+
+    С executor пачки проверяются параллельно; одновременно в работе не больше
+    max_pending пачек, чтобы не читать весь файл в память заранее.
+    """
+    if executor is None:
+        yield from map(validate_rows, _batches(rows, batch_size))
+        return
+
+    in_flight: deque[Future] = deque()
+    for batch in _batches(rows, batch_size):
+        in_flight.append(executor.submit(validate_rows, batch))
+        if len(in_flight) >= max_pending:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def import_contacts(model,
+                    file_path: Path,
+                    batch_size: int = 10_000,
+                    workers: int | None = None) -> ImportReport:
+    """
+    Импортирует контакты из CSV или JSONL файла в модель.
+
+    Строки проверяются пачками в пуле процессов (workers=1 — без пула),
+    корректные контакты добавляются одним вызовом add_contacts.
+
+    Args:
+        model: Модель справочника
+        file_path: Путь к файлу импорта
+        batch_size: Размер пачки строк для проверки
+        workers: Количество процессов; по умолчанию — по числу ядер
+
+    Returns:
+        ImportReport: ID добавленных контактов и ошибки
+    """
+    errors: list[str] = []
+
+    def valid_contacts(batches: Iterable[tuple[list[ContactAdd], list[str]]]) -> Iterator[ContactAdd]:
+        for contacts, batch_errors in batches:
+            errors.extend(batch_errors)
+            yield from contacts
+
+    rows = read_rows(file_path)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        added = model.add_contacts(valid_contacts(validate_in_batches(rows, batch_size)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            added = model.add_contacts(valid_contacts(
+                validate_in_batches(rows, batch_size, executor, max_pending=2 * workers)
+            ))
+    return ImportReport(added, errors)
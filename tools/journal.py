@@ -0,0 +1,198 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+from custom_types import Contact
+from custom_errors import SaveFileError, FileCorruptedError
+
+# Конец прочитанной части журнала: (inode файла, смещение в байтах)
+JournalPosition = tuple[int, int]
+
+
+def apply_records(contacts: Iterable[Contact], records: list[dict[str, Any]]) -> list[Contact]:
+    """
+    Применяет записи об операциях к контактам. Повтор уже примененной записи ничего не меняет.
+
+    Raises:
+        KeyError, TypeError, ValueError: Если запись некорректна
+    """
+    # dict сохраняет порядок вставки, поэтому порядок контактов не меняется
+    by_id = {contact.id: contact for contact in contacts}
+    for record in records:
+        op = record['op']
+        if op == 'add':
+            contact = Contact.from_dict(record['contact'])
+            by_id[contact.id] = contact
+        elif op == 'edit':
+            contact = by_id.get(record['id'])
+            if contact is not None:
+                for field, value in record['fields'].items():
+                    setattr(contact, field, value)
+        elif op == 'delete':
+            by_id.pop(record['id'], None)
+        else:
+            raise ValueError(f'неизвестная операция {op!r}')
+    return list(by_id.values())
+
+
+class ContactJournal:
+    """
+    Журнал изменений справочника рядом с основным файлом.
+
+    Каждая строка — JSON-запись об одной операции:
+        {"op": "add", "contact": {...}}
+        {"op": "edit", "id": 1, "fields": {...}}
+        {"op": "delete", "id": 1}
+
+    Воспроизведение записей идемпотентно, поэтому журнал безопасно применять
+    поверх файла, в который он уже был свернут.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self._size: int | None = None
+
+    @property
+    def size(self) -> int:
+        """Количество записей в журнале"""
+        if self._size is None:
+            self._size = len(self._read_records())
+        return self._size
+
+    def append(self, records: list[dict[str, Any]]) -> None:
+        """
+        Дописывает записи в конец журнала и сбрасывает их на диск.
+
+        Args:
+            records: Записи об операциях
+
+        Raises:
+            SaveFileError: Если не удалось записать журнал
+        """
+        if not records:
+            return
+        payload = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        try:
+            with open(self.file_path, 'a+b') as file:
+                self._truncate_torn_tail(file)
+                file.write(payload.encode('utf-8'))
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError as e:
+            raise SaveFileError(f'Невозможно записать журнал изменений: {e}')
+        self._size = self.size + len(records)
+
+    def clear(self) -> None:
+        """
+        Удаляет журнал после сворачивания в основной файл.
+
+        Raises:
+            SaveFileError: Если не удалось удалить журнал
+        """
+        try:
+            self.file_path.unlink(missing_ok=True)
+        except OSError as e:
+            raise SaveFileError(f'Невозможно очистить журнал изменений: {e}')
+        self._size = 0
+
+    def position(self) -> JournalPosition | None:
+        """Текущий конец журнала или None, если журнала нет"""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def read_from(self, position: JournalPosition | None) -> tuple[list[dict[str, Any]], JournalPosition | None] | None:
+        """
+        Читает записи, дописанные после position (None — с начала журнала).
+
+        Returns:
+            Записи и новая позиция или None, если журнал с тех пор был заменен
+            или обрезан — тогда новые записи не отделить от старых
+
+        Raises:
+            FileCorruptedError: Если журнал поврежден
+        """
+        try:
+            file = open(self.file_path, 'rb')
+        except FileNotFoundError:
+            return ([], None) if position is None else None
+        with file:
+            stat = os.fstat(file.fileno())
+            if position is None:
+                offset = 0
+            elif position[0] != stat.st_ino or position[1] > stat.st_size:
+                return None
+            else:
+                offset = position[1]
+            file.seek(offset)
+            data = file.read()
+
+        # Последняя строка без перевода строки еще дописывается — ее прочитаем в следующий раз
+        end = data.rfind(b'\n') + 1
+        try:
+            records = [json.loads(line) for line in data[:end].split(b'\n') if line]
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise FileCorruptedError(f'Журнал изменений поврежден: {e}')
+        if self._size is not None:
+            self._size += len(records)
+        return records, (stat.st_ino, offset + end)
+
+    def replay(self, contacts: list[Contact]) -> list[Contact]:
+        """
+        Применяет записи журнала к списку контактов.
+
+        Args:
+            contacts: Контакты из основного файла
+
+        Returns:
+            list[Contact]: Контакты с учетом всех операций журнала
+
+        Raises:
+            FileCorruptedError: Если журнал поврежден
+        """
+        records = self._read_records()
+        self._size = len(records)
+        if not records:
+            return contacts
+        try:
+            return apply_records(contacts, records)
+        except (KeyError, TypeError, ValueError) as e:
+            raise FileCorruptedError(f'Журнал изменений поврежден: {e}')
+
+    def _read_records(self) -> list[dict[str, Any]]:
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as file:
+                lines = file.read().split('\n')
+        except FileNotFoundError:
+            return []
+
+        # Последняя строка без перевода строки — недописанная запись, ее отбрасываем
+        lines.pop()
+        try:
+            return [json.loads(line) for line in lines if line]
+        except json.JSONDecodeError as e:
+            raise FileCorruptedError(f'Журнал изменений поврежден: {e}')
+
+    @staticmethod
+    def _truncate_torn_tail(file) -> None:
+        """Обрезает недописанную последнюю строку, оставшуюся после сбоя"""
+        end = file.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        file.seek(end - 1)
+        if file.read(1) == b'\n':
+            return
+
+        pos = end
+        while pos > 0:
+            step = min(4096, pos)
+            file.seek(pos - step)
+            block = file.read(step)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                file.truncate(pos - step + newline + 1)
+                return
+            pos -= step
+        file.truncate(0)
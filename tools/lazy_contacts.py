@@ -0,0 +1,124 @@
+from collections.abc import MutableSequence
+from typing import Any, Iterable, Iterator, overload
+from custom_types import Contact
+from custom_errors import ContactLoadError
+
+# Сырая запись контакта: ID, имя, телефон, комментарий (в порядке полей Contact)
+ContactTuple = tuple[int, str, int, str]
+
+
+def pack_contact(item: dict[str, Any]) -> ContactTuple:
+    """
+    Приводит словарь из файла к сырой записи.
+
+    Значения уже нужных типов (обычный случай для файла, записанного FileWriter)
+    берутся как есть; остальные приводятся теми же правилами, что и в Contact.from_dict.
+    """
+    cid, name, phone_number = item['id'], item['name'], item['phone_number']
+    comment = item.get('comment', '')
+    if type(cid) is int and type(phone_number) is int and type(name) is str and type(comment) is str:
+        return cid, name, phone_number, comment
+    contact = Contact.from_dict(item)
+    return contact.id, contact.name, contact.phone_number, contact.comment
+
+
+class LazyContactList(MutableSequence[Contact]):
+    """
+    Список контактов, создающий объекты Contact при первом обращении.
+
+    Загруженные контакты хранятся сырыми записями (кортежами полей). Обращение
+    по позиции превращает запись в Contact и запоминает его на ее месте, поэтому
+    изменения объекта сохраняются. Служебные методы (id_at, record_at, ids)
+    читают поля без создания объектов.
+    """
+
+    def __init__(self, records: Iterable[ContactTuple | Contact] = ()):
+        self._items: list[ContactTuple | Contact] = list(records)
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[dict[str, Any]]) -> 'LazyContactList':
+        """
+        Строит список из словарей файла, проверяя типы полей без создания Contact.
+
+        Raises:
+            ContactLoadError: Если часть контактов некорректна; ошибки собираются по всем словарям
+        """
+        records: list[ContactTuple] = []
+        errors: list[str] = []
+        for item in items:
+            try:
+                records.append(pack_contact(item))
+            except Exception as e:
+                errors.append(f'Контакт {item}: {e}')
+        if errors:
+            raise ContactLoadError('\n'.join(errors))
+        return cls(records)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> Contact: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Contact]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[pos] for pos in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if type(item) is tuple:
+            item = self._items[index] = Contact(*item)
+        return item
+
+    def __setitem__(self, index, value) -> None:
+        self._items[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._items[index]
+
+    def insert(self, index: int, value: Contact) -> None:
+        self._items.insert(index, value)
+
+    def append(self, value: Contact) -> None:
+        self._items.append(value)
+
+    def __iter__(self) -> Iterator[Contact]:
+        for pos in range(len(self._items)):
+            yield self[pos]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (LazyContactList, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def is_materialized(self, pos: int) -> bool:
+        """Создан ли уже объект Contact для позиции pos"""
+        return type(self._items[pos]) is not tuple
+
+    def id_at(self, pos: int) -> int:
+        item = self._items[pos]
+        return item[0] if type(item) is tuple else item.id
+
+    def record_at(self, pos: int) -> ContactTuple:
+        item = self._items[pos]
+        if type(item) is tuple:
+            return item
+        return item.id, item.name, item.phone_number, item.comment
+
+    def ids(self) -> list[int]:
+        return [item[0] if type(item) is tuple else item.id for item in self._items]
+
+    def records(self) -> list[ContactTuple]:
+        return [
+            item if type(item) is tuple else (item.id, item.name, item.phone_number, item.comment)
+            for item in self._items
+        ]
+
+    def delete_rows(self, rows: set[int]) -> None:
+        """Удаляет строки с переданными номерами за один проход"""
+        self._items = [item for pos, item in enumerate(self._items) if pos not in rows]
+
+    def copy(self) -> 'LazyContactList':
+        """Независимая копия: созданные объекты Contact снова сворачиваются в записи"""
+        return LazyContactList(self.records())
@@ -0,0 +1,139 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterator
+
+# Больше любого символа имени: верхняя граница для всех имен, начинающихся с префикса
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class SortedNameIndex:
+    """
+    Нормализованные имена контактов в порядке (имя, ключ) — блочный отсортированный список.
+
+    Элементы лежат в блоках не длиннее 2 * BLOCK_SIZE, для блоков хранятся
+    максимумы, поэтому вставка и удаление стоят O(log n + BLOCK_SIZE) без
+    сдвига всего массива. Позиция по имени и срез из k ключей — O(log n + k);
+    после изменения первый такой запрос пересчитывает смещения блоков за
+    O(n / BLOCK_SIZE).
+    """
+
+    BLOCK_SIZE = 512
+
+    def __init__(self):
+        self._blocks: list[list[tuple[str, int]]] = []
+        # Последний (наибольший) элемент каждого блока
+        self._maxes: list[tuple[str, int]] = []
+        # Позиция первого элемента каждого блока; None — пересчитать при запросе
+        self._offsets: list[int] | None = None
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        """Ключи в порядке имен"""
+        for block in self._blocks:
+            for _, key in block:
+                yield key
+
+    def add(self, key: int, name: str) -> None:
+        item = (name, key)
+        self._len += 1
+        self._offsets = None
+        if not self._blocks:
+            self._blocks.append([item])
+            self._maxes.append(item)
+            return
+
+        i = bisect_left(self._maxes, item)
+        if i == len(self._maxes):
+            # Больше всех — в конец последнего блока
+            i -= 1
+            self._blocks[i].append(item)
+            self._maxes[i] = item
+        else:
+            insort(self._blocks[i], item)
+
+        block = self._blocks[i]
+        if len(block) > 2 * self.BLOCK_SIZE:
+            half = len(block) // 2
+            self._blocks[i:i + 1] = [block[:half], block[half:]]
+            self._maxes[i:i + 1] = [block[half - 1], block[-1]]
+
+    def remove(self, key: int, name: str) -> None:
+        item = (name, key)
+        i = bisect_left(self._maxes, item)
+        if i == len(self._maxes):
+            return
+        block = self._blocks[i]
+        j = bisect_left(block, item)
+        if j == len(block) or block[j] != item:
+            return
+
+        del block[j]
+        self._len -= 1
+        self._offsets = None
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._maxes.clear()
+        self._offsets = None
+        self._len = 0
+
+    def rebuild(self, items: list[tuple[str, int]]) -> None:
+        """Заполняет индекс парами (имя, ключ) одной сортировкой"""
+        items.sort()
+        size = self.BLOCK_SIZE
+        self._blocks = [items[i:i + size] for i in range(0, len(items), size)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._offsets = None
+        self._len = len(items)
+
+    def _block_offsets(self) -> list[int]:
+        if self._offsets is None:
+            offsets, total = [], 0
+            for block in self._blocks:
+                offsets.append(total)
+                total += len(block)
+            self._offsets = offsets
+        return self._offsets
+
+    def _position(self, bound: tuple) -> int:
+        """Количество элементов меньше bound"""
+        i = bisect_left(self._maxes, bound)
+        if i == len(self._maxes):
+            return self._len
+        return self._block_offsets()[i] + bisect_left(self._blocks[i], bound)
+
+    def bounds(self, first: str = '', last: str | None = None) -> tuple[int, int]:
+        """
+        Позиции [start, stop) имен от first до last включительно.
+        Имена, начинающиеся с last, тоже входят: bounds('а', 'в') включает «Вера».
+
+        Args:
+            first: Нижняя граница (нормализованная)
+            last: Верхняя граница-префикс (нормализованная); None — до конца
+        """
+        start = self._position((first,)) if first else 0
+        stop = self._len if last is None else self._position((last + _MAX_CHAR,))
+        return start, max(start, stop)
+
+    def keys_between(self, start: int, stop: int) -> list[int]:
+        """Ключи в позициях [start, stop) порядка имен"""
+        start, stop = max(0, start), min(stop, self._len)
+        if start >= stop:
+            return []
+        offsets = self._block_offsets()
+        i = bisect_right(offsets, start) - 1
+        j = start - offsets[i]
+        result: list[int] = []
+        count = stop - start
+        while len(result) < count:
+            block = self._blocks[i]
+            result.extend(key for _, key in block[j:j + count - len(result)])
+            i, j = i + 1, 0
+        return result
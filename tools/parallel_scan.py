@@ -0,0 +1,149 @@
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Sequence
+
+# Копия ключей поиска в процессе-обработчике; задается при запуске процесса
+# и дальше догоняет книгу по журналу изменений, приходящему с заданиями
+_worker_keys: list[tuple[str, ...]] = []
+# Сколько изменений журнала уже применено к копии
+_worker_applied = 0
+
+# Изменение ключей: ('set', позиция, ключ), ('append', None, ключ) или ('delete', позиция, None)
+KeyChange = tuple[str, int | None, Any]
+
+
+def _init_worker(keys: list[tuple[str, ...]]) -> None:
+    global _worker_keys, _worker_applied
+    _worker_keys = keys
+    _worker_applied = 0
+
+
+def _apply_changes(changes: list[KeyChange]) -> None:
+    """Догоняет копию ключей процесса по журналу изменений с момента запуска пула"""
+    global _worker_applied
+    keys = _worker_keys
+    for op, pos, key in changes[_worker_applied:]:
+        if op == 'set':
+            keys[pos] = key
+        elif op == 'append':
+            keys.append(key)
+        else:
+            del keys[pos]
+    _worker_applied = len(changes)
+
+
+def _scan_shard(start: int, stop: int, pattern: re.Pattern, columns: tuple[int, ...],
+                changes: list[KeyChange]) -> list[int]:
+    """Позиции ключей из [start, stop), в которых хотя бы одно из полей columns подходит под pattern"""
+    _apply_changes(changes)
+    search, keys = pattern.search, _worker_keys
+    return [pos for pos in range(start, stop) if any(search(keys[pos][column]) is not None for column in columns)]
+
+
+class ParallelScanner:
+    """
+    Параллельная проверка регулярного выражения по ключам поиска в пуле процессов.
+
+    Ключи передаются процессам один раз при запуске пула. Изменения книги
+    модель сообщает через changed/appended/removed: они копятся в журнале,
+    который уходит с каждым заданием, и процессы применяют к своей копии
+    только новые записи, оставаясь «теплыми». Пул перезапускается при
+    следующем поиске, только если журнал длиннее MAX_CHANGES или ключи
+    заменены целиком (replaced).
+
+    При threaded=True (в процессе работают другие потоки — потокобезопасная
+    модель, автосохранение) процессы запускаются через forkserver или spawn:
+    fork копирует блокировки, которые в момент fork держат другие потоки,
+    и процесс-обработчик может на них зависнуть.
+    """
+
+    # Длина журнала изменений, после которой пул перезапускается со свежей копией ключей
+    MAX_CHANGES = 500
+
+    def __init__(self, workers: int, threaded: bool = False):
+        self.workers = workers
+        self.threaded = threaded
+        self._pool: ProcessPoolExecutor | None = None
+        self._changes: list[KeyChange] = []
+        # Пул общий для потоков-читателей: перезапуск пула и поиск в нем не должны пересекаться
+        self._lock = threading.Lock()
+
+    # --------- Изменения ключей ---------
+
+    def changed(self, pos: int, key: tuple[str, ...]) -> None:
+        self._record(('set', pos, key))
+
+    def appended(self, key: tuple[str, ...]) -> None:
+        self._record(('append', None, key))
+
+    def removed(self, pos: int) -> None:
+        self._record(('delete', pos, None))
+
+    def replaced(self) -> None:
+        """Ключи заменены целиком — копии процессов больше не догнать"""
+        with self._lock:
+            self._shutdown()
+
+    def _record(self, change: KeyChange) -> None:
+        with self._lock:
+            if self._pool is None:
+                return
+            if len(self._changes) >= self.MAX_CHANGES:
+                self._shutdown()
+            else:
+                self._changes.append(change)
+
+    # --------- Поиск ---------
+
+    def scan(self, keys: Sequence[tuple[str, ...]], pattern: re.Pattern, columns: tuple[int, ...]) -> list[int]:
+        """
+        Возвращает позиции подходящих ключей в порядке возрастания.
+
+        Args:
+            keys: Ключи поиска всей книги; копия уходит процессам при запуске пула
+            pattern: Скомпилированное регулярное выражение
+            columns: Номера проверяемых полей ключа
+        """
+        with self._lock:
+            pool = self._ensure_pool(keys)
+            size = len(keys)
+            # Список журнала неизменяем для уже отправленных заданий: новые изменения его копируют
+            changes = self._changes = list(self._changes)
+            # Шардов больше, чем процессов, чтобы неравномерные шарды не задерживали остальные
+            shard = max(1, -(-size // (self.workers * 4)))
+            futures = [
+                pool.submit(_scan_shard, start, min(start + shard, size), pattern, columns, changes)
+                for start in range(0, size, shard)
+            ]
+            positions: list[int] = []
+            for future in futures:
+                positions.extend(future.result())
+            return positions
+
+    def _ensure_pool(self, keys: Sequence[tuple[str, ...]]) -> ProcessPoolExecutor:
+        if self._pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            if 'fork' in methods and not self.threaded:
+                method = 'fork'
+            else:
+                method = 'forkserver' if 'forkserver' in methods else 'spawn'
+            # Копия: процессы, запущенные позже первого, должны получить те же ключи, что и первый
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context(method),
+                initializer=_init_worker, initargs=(list(keys),)
+            )
+            self._changes = []
+        return self._pool
+
+    def _shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self._changes = []
+
+    def close(self) -> None:
+        """Останавливает пул процессов"""
+        with self._lock:
+            self._shutdown()
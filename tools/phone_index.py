@@ -0,0 +1,58 @@
+from bisect import bisect_left, bisect_right
+
+
+class PhonePrefixIndex:
+    """Отсортированный массив номеров телефонов для поиска по префиксу за O(log n + k)"""
+
+    def __init__(self):
+        # Параллельные массивы, отсортированные по (номер, ключ)
+        self._phones: list[str] = []
+        self._keys: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._phones)
+
+    def add(self, key: int, phone: str) -> None:
+        lo = bisect_left(self._phones, phone)
+        hi = bisect_right(self._phones, phone, lo)
+        pos = bisect_left(self._keys, key, lo, hi)
+        self._phones.insert(pos, phone)
+        self._keys.insert(pos, key)
+
+    def remove(self, key: int, phone: str) -> None:
+        lo = bisect_left(self._phones, phone)
+        hi = bisect_right(self._phones, phone, lo)
+        pos = bisect_left(self._keys, key, lo, hi)
+        if pos < hi and self._keys[pos] == key:
+            del self._phones[pos]
+            del self._keys[pos]
+
+    def clear(self) -> None:
+        self._phones.clear()
+        self._keys.clear()
+
+    def rebuild(self, items: list[tuple[str, int]]) -> None:
+        """Заполняет индекс парами (номер, ключ) одной сортировкой"""
+        items.sort()
+        self._phones = [phone for phone, _ in items]
+        self._keys = [key for _, key in items]
+
+    def find_prefix(self, prefix: str, limit: int | None = None) -> list[int]:
+        """
+        Возвращает ключи номеров, начинающихся с prefix, в порядке номеров.
+
+        Args:
+            prefix: Начало номера телефона
+            limit: Максимальное количество результатов
+
+        Returns:
+            list[int]: Ключи найденных номеров
+        """
+        result: list[int] = []
+        pos = bisect_left(self._phones, prefix)
+        while pos < len(self._phones) and self._phones[pos].startswith(prefix):
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(self._keys[pos])
+            pos += 1
+        return result
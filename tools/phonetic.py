@@ -0,0 +1,272 @@
+# --------- Русский Metaphone ---------
+
+# Типичные окончания фамилий заменяются одним символом; длинные проверяются раньше
+RU_ENDINGS = [
+    ('ОВСКИЙ', '@'), ('ЕВСКИЙ', '#'), ('ОВСКАЯ', '$'), ('ЕВСКАЯ', '%'),
+    ('ИЕВА', '9'), ('ЕЕВА', '9'), ('ОВА', '9'), ('ЕВА', '9'), ('ИНА', '1'),
+    ('ИЕВ', '4'), ('ЕЕВ', '4'), ('НКО', '3'), ('ОВ', '4'), ('ЕВ', '4'),
+    ('АЯ', '6'), ('ИЙ', '7'), ('ЫЙ', '7'), ('ЕЙ', '7'), ('ЫХ', '5'), ('ИХ', '5'),
+    ('ИН', '8'), ('ИК', '2'), ('ЕК', '2'), ('УК', '0'), ('ЮК', '0'),
+]
+RU_VOWELS = {'О': 'А', 'Ы': 'А', 'Я': 'А', 'Е': 'И', 'Э': 'И', 'Ю': 'У'}
+# Звонкие согласные оглушаются перед глухими и в конце слова
+RU_DEVOICE = {'Б': 'П', 'В': 'Ф', 'Г': 'К', 'Д': 'Т', 'Ж': 'Ш', 'З': 'С'}
+RU_VOICELESS = set('ПФКТШСХЦЧЩ')
+
+
+def ru_metaphone(word: str) -> str:
+    """
+    Фонетический ключ русского слова (вариант «русского Metaphone»):
+    окончания фамилий сжимаются в код, гласные сводятся к А/И/У, звонкие
+    согласные оглушаются в слабой позиции, повторы схлопываются.
+    """
+    text = ''.join(ch for ch in word.upper().replace('Ё', 'Е') if 'А' <= ch <= 'Я')
+    if not text:
+        return ''
+
+    # Оглушенное окончание (Иваноф) приводим к написанию, чтобы сработала таблица окончаний
+    if text.endswith(('ОФ', 'ЕФ')):
+        text = text[:-1] + 'В'
+    ending = ''
+    for suffix, code in RU_ENDINGS:
+        if len(text) > len(suffix) and text.endswith(suffix):
+            text, ending = text[:-len(suffix)], code
+            break
+
+    for diphthong in ('ЙО', 'ИО', 'ЙЕ', 'ИЕ'):
+        text = text.replace(diphthong, 'И')
+    letters = [ch for ch in text if ch not in 'ЬЪ']
+
+    code: list[str] = []
+    for i, ch in enumerate(letters):
+        if ch in RU_VOWELS:
+            ch = RU_VOWELS[ch]
+        elif ch in RU_DEVOICE:
+            following = letters[i + 1] if i + 1 < len(letters) else None
+            # Конец основы перед отброшенным окончанием — не конец слова
+            if following in RU_VOICELESS or (following is None and not ending):
+                ch = RU_DEVOICE[ch]
+        if not code or code[-1] != ch:
+            code.append(ch)
+    return ''.join(code).replace('ТС', 'Ц').replace('ДС', 'Ц') + ending
+
+
+# --------- Double Metaphone (основные правила) ---------
+
+LATIN_VOWELS = set('AEIOUY')
+
+
+def double_metaphone(word: str, max_length: int = 4) -> tuple[str, str]:
+    """
+    Основной и альтернативный фонетические ключи латинского слова по основным
+    правилам Double Metaphone: немые начальные сочетания, CH/SH/TH/PH/GH,
+    мягкие C и G, X -> KS, J/Й и W/V. Редкие исключения для отдельных
+    языков не реализованы.
+    """
+    w = ''.join(ch for ch in word.upper() if 'A' <= ch <= 'Z')
+    if not w:
+        return '', ''
+    primary: list[str] = []
+    alternate: list[str] = []
+
+    def add(main: str, alt: str | None = None) -> None:
+        primary.append(main)
+        alternate.append(main if alt is None else alt)
+
+    def at(pos: int, *variants: str) -> bool:
+        return pos >= 0 and any(w.startswith(variant, pos) for variant in variants)
+
+    def vowel(pos: int) -> bool:
+        return 0 <= pos < len(w) and w[pos] in LATIN_VOWELS
+
+    i = 0
+    if at(0, 'GN', 'KN', 'PN', 'WR', 'PS'):
+        i = 1
+    elif w[0] == 'X':
+        add('S')
+        i = 1
+
+    while i < len(w):
+        ch = w[i]
+        step = 2 if i + 1 < len(w) and w[i + 1] == ch and ch != 'C' else 1
+        if ch in LATIN_VOWELS:
+            if i == 0:
+                add('A')
+        elif ch == 'B':
+            add('P')
+        elif ch == 'C':
+            if at(i, 'CH'):
+                # Греческие корни (Christ, Chemistry) — K; иначе «Ч» с альтернативой K
+                if i == 0 and at(i, 'CHR', 'CHEM', 'CHOR', 'CHAR', 'CHYM'):
+                    add('K')
+                else:
+                    add('X', 'K')
+                step = 2
+            elif at(i, 'CZ'):
+                add('S', 'X')
+                step = 2
+            elif at(i, 'CK', 'CQ', 'CC') and not at(i, 'CCI', 'CCE'):
+                add('K')
+                step = 2
+            elif at(i, 'CI', 'CE', 'CY'):
+                add('S')
+            else:
+                add('K')
+        elif ch == 'D':
+            if at(i, 'DGE', 'DGI', 'DGY'):
+                add('J')
+                step = 3
+            else:
+                add('T')
+                step = 2 if at(i, 'DT', 'DD') else 1
+        elif ch == 'F' or ch == 'V':
+            add('F')
+            step = 2 if at(i + 1, ch) else 1
+        elif ch == 'G':
+            if at(i, 'GH'):
+                # Немое GH после гласной (Wright, Hugh) и K в начале слова (Ghana)
+                if i == 0 or not vowel(i - 1):
+                    add('K')
+                step = 2
+            elif at(i, 'GN'):
+                add('N', 'KN')
+                step = 2
+            elif at(i + 1, 'E', 'I', 'Y'):
+                add('K', 'J')
+            else:
+                add('K')
+                step = 2 if at(i + 1, 'G') else 1
+        elif ch == 'H':
+            # H произносится только перед гласной и не после согласной
+            if vowel(i + 1) and (i == 0 or vowel(i - 1)):
+                add('H')
+        elif ch == 'J':
+            add('J', 'H' if i == 0 else 'J')
+        elif ch in 'KLMNR':
+            add(ch)
+        elif ch == 'P':
+            if at(i, 'PH'):
+                add('F')
+                step = 2
+            else:
+                add('P')
+                step = 2 if at(i + 1, 'P', 'B') else 1
+        elif ch == 'Q':
+            add('K')
+        elif ch == 'S':
+            if at(i, 'SCH'):
+                # Перед гласной — «СК» (Schenker), перед согласной — «Ш» (Schmidt)
+                if vowel(i + 3):
+                    add('SK')
+                else:
+                    add('X', 'S')
+                step = 3
+            elif at(i, 'SH'):
+                add('X')
+                step = 2
+            elif at(i, 'SIO', 'SIA'):
+                add('S', 'X')
+                step = 3
+            elif at(i, 'SCI', 'SCE', 'SCY'):
+                add('S')
+                step = 2
+            elif i == 0 and at(i + 1, 'M', 'N', 'L', 'W'):
+                # Smith может звучать как немецкое Schmidt
+                add('S', 'X')
+            else:
+                add('S')
+                step = 2 if at(i + 1, 'S', 'Z') else 1
+        elif ch == 'T':
+            if at(i, 'TIO', 'TIA', 'TCH'):
+                add('X')
+                step = 3
+            elif at(i, 'THOM', 'THAM'):
+                add('T')
+                step = 2
+            elif at(i, 'TH'):
+                add('0', 'T')
+                step = 2
+            else:
+                add('T')
+                step = 2 if at(i + 1, 'T', 'D') else 1
+        elif ch == 'W':
+            # W перед гласной в начале слова (Wasserman) — A или F
+            if i == 0 and vowel(1):
+                add('A', 'F')
+            elif at(i, 'WICZ', 'WITZ'):
+                add('TS', 'FX')
+                step = 4
+            elif vowel(i - 1) and (vowel(i + 1) or i + 1 == len(w)):
+                # В немецких и польских фамилиях W звучит как V (Iwanow)
+                add('', 'F')
+        elif ch == 'X':
+            add('KS')
+        elif ch == 'Z':
+            if at(i, 'ZH'):
+                add('J')
+                step = 2
+            else:
+                add('S', 'TS' if at(i + 1, 'Z') else 'S')
+                step = 2 if at(i + 1, 'Z') else 1
+        i += step
+
+    return ''.join(primary)[:max_length], ''.join(alternate)[:max_length]
+
+
+# --------- Индекс ---------
+
+def phonetic_keys(text: str) -> set[str]:
+    """
+    Фонетические ключи всех слов текста: для кириллических слов — русский
+    Metaphone, для латинских — основной и альтернативный ключи Double Metaphone.
+    Ключи помечаются алфавитом, чтобы коды разных алгоритмов не смешивались.
+    """
+    keys: set[str] = set()
+    for word in text.split():
+        if any('а' <= ch <= 'я' or ch == 'ё' for ch in word.lower()):
+            if code := ru_metaphone(word):
+                keys.add('ru:' + code)
+        else:
+            keys.update('en:' + code for code in double_metaphone(word) if code)
+    return keys
+
+
+class PhoneticIndex:
+    """
+    Хеш-индекс фонетических ключей: ключ -> множество ID контактов.
+
+    Ключи контакта вычисляются один раз при добавлении и хранятся до его
+    изменения, поэтому поиск — это несколько обращений к словарю.
+    """
+
+    def __init__(self):
+        self._buckets: dict[str, set[int]] = {}
+        self._keys: dict[int, frozenset[str]] = {}
+
+    def add(self, key: int, text: str) -> None:
+        codes = frozenset(phonetic_keys(text))
+        self._keys[key] = codes
+        for code in codes:
+            self._buckets.setdefault(code, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        for code in self._keys.pop(key, ()):
+            bucket = self._buckets.get(code)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[code]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._keys.clear()
+
+    def find(self, text: str) -> set[int]:
+        """Ключи, у которых каждое слово text совпадает по звучанию с каким-то словом имени"""
+        result: set[int] | None = None
+        for word in text.split():
+            found = set().union(*(self._buckets.get(code, ()) for code in phonetic_keys(word)))
+            result = found if result is None else result & found
+            if not result:
+                return set()
+        return result or set()
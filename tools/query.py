@@ -0,0 +1,107 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, NamedTuple
+from .trigram_index import extract_literals
+
+# Символы, которые делают запрос регулярным выражением
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+class SearchKey(NamedTuple):
+    """
+    Запись контакта для поиска: имя и комментарий, свернутые casefold для
+    поиска подстроки, телефон строкой, все поля через перевод строки для
+    подстроки в режиме «все данные» и исходные имя и комментарий — регулярные
+    выражения проверяются по ним с re.IGNORECASE, как в исходной версии.
+    """
+
+    name: str
+    phone_number: str
+    comment: str
+    all: str
+    name_text: str
+    comment_text: str
+
+
+# Поля ключа, по которым регулярное выражение проверяет каждое поле контакта
+REGEX_COLUMNS = {'name': 'name_text', 'phone_number': 'phone_number', 'comment': 'comment_text'}
+
+
+def fold_fields(name: str, phone_number: int, comment: str) -> SearchKey:
+    """Строит ключ поиска по полям контакта"""
+    folded_name, phone, folded_comment = name.casefold(), str(phone_number), comment.casefold()
+    return SearchKey(folded_name, phone, folded_comment, f'{folded_name}\n{phone}\n{folded_comment}',
+                     name, comment)
+
+
+def fold_contact(contact) -> SearchKey:
+    """Строит ключ поиска контакта"""
+    return fold_fields(contact.name, contact.phone_number, contact.comment)
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """
+    Разобранный поисковый запрос.
+
+    Attributes:
+        field: Поле ключа поиска (см. SearchKey), по которому идет поиск
+        literal: Свернутая подстрока, если запрос не содержит метасимволов; иначе None
+        pattern: Скомпилированное регулярное выражение для остальных запросов
+        literals: Подстроки, обязательные для совпадения (для триграммного индекса)
+    """
+
+    field: str
+    literal: str | None
+    pattern: re.Pattern | None
+    literals: tuple[str, ...] | None
+
+    @property
+    def columns(self) -> tuple[int, ...]:
+        """
+        Номера полей SearchKey, которые проверяет запрос. Подстрока ищется в
+        свернутом поле (в режиме «все данные» — в объединенном поле all).
+        Выражение проверяется по исходному тексту каждого поля отдельно, чтобы
+        не совпадать через границу полей.
+        """
+        if self.pattern is None:
+            return (SearchKey._fields.index(self.field),)
+        fields = REGEX_COLUMNS.values() if self.field == 'all' else (REGEX_COLUMNS[self.field],)
+        return tuple(SearchKey._fields.index(field) for field in fields)
+
+    def matcher(self) -> Callable[[SearchKey], bool]:
+        """Проверка ключа поиска: str.find для подстроки, иначе регулярное выражение"""
+        columns = self.columns
+        if self.literal is not None:
+            literal, (column,) = self.literal, columns
+            return lambda key: key[column].find(literal) != -1
+        search = self.pattern.search
+        if len(columns) == 1:
+            (column,) = columns
+            return lambda key: search(key[column]) is not None
+        return lambda key: any(search(key[column]) is not None for column in columns)
+
+
+@lru_cache(maxsize=256)
+def compile_query(search_term: str, field: str) -> SearchQuery:
+    """
+    Строит план поиска: запросы без метасимволов ищутся как подстрока через str.find,
+    остальные — как регулярное выражение без учета регистра. Невалидное выражение
+    тоже ищется как подстрока. Результат кешируется.
+
+    Args:
+        search_term: Строка запроса
+        field: Поле ключа поиска
+
+    Returns:
+        SearchQuery: План поиска
+    """
+    if REGEX_METACHARACTERS.isdisjoint(search_term):
+        return SearchQuery(field, search_term.casefold(), None, (search_term,))
+    try:
+        pattern = re.compile(search_term, re.IGNORECASE)
+    except re.error:
+        return SearchQuery(field, search_term.casefold(), None, (search_term,))
+    literals = extract_literals(search_term)
+    return SearchQuery(field, None, pattern, None if literals is None else tuple(literals))
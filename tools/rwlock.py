@@ -0,0 +1,86 @@
+import threading
+
+
+class _LockSide:
+    """Контекстный менеджер для одной стороны блокировки: `with lock.reader:`"""
+
+    __slots__ = ('_acquire', '_release')
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self) -> None:
+        self._acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self._release()
+
+
+class ReadWriteLock:
+    """
+    Блокировка «много читателей или один писатель» с приоритетом писателя.
+
+    Ожидающий писатель не пропускает вперед новых читателей, поэтому поток
+    чтений его не вытесняет. Обе стороны реентерабельны в пределах потока;
+    писатель может брать и блокировку чтения. Повысить чтение до записи
+    нельзя — это взаимная блокировка двух таких потоков, поэтому вызывается
+    RuntimeError.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: int | None = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        # Глубина вложенных чтений текущего потока
+        self._local = threading.local()
+        self.reader = _LockSide(self.acquire_read, self.release_read)
+        self.writer = _LockSide(self.acquire_write, self.release_write)
+
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        depth = getattr(self._local, 'depth', 0)
+        with self._condition:
+            if depth == 0:
+                if self._writer != me:
+                    self._condition.wait_for(lambda: self._writer is None and not self._writers_waiting)
+                self._readers += 1
+        self._local.depth = depth + 1
+
+    def release_read(self) -> None:
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            raise RuntimeError('Блокировка чтения не захвачена этим потоком')
+        self._local.depth = depth - 1
+        if depth == 1:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, 'depth', 0):
+                raise RuntimeError('Нельзя повысить блокировку чтения до записи')
+            self._writers_waiting += 1
+            try:
+                self._condition.wait_for(lambda: self._writer is None and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError('Блокировка записи не захвачена этим потоком')
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._condition.notify_all()
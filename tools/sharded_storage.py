@@ -0,0 +1,391 @@
+import json
+import os
+import secrets
+from bisect import bisect_right
+from collections.abc import Sequence
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from custom_types import Contact
+from custom_errors import FileCorruptedError, InvalidFileFormatError
+from .file_reader import FileReader
+from .file_writer import FileWriter
+from .file_lock import FileLock
+from .journal import apply_records
+from .lazy_contacts import LazyContactList
+from .storage import ContactStorage, ExternalChanges, FileStamp
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+DEFAULT_SHARD_SIZE = 10_000
+
+
+@dataclass
+class ShardInfo:
+    """Шард справочника: файл с контактами, ID которых не меньше first_id и меньше first_id следующего"""
+    file: str
+    first_id: int
+    count: int
+
+
+class ShardManifest:
+    """
+    Манифест шардированного справочника (manifest.json в каталоге шардов).
+
+    Шарды упорядочены по first_id; контакт с ID меньше first_id первого шарда
+    тоже относится к первому шарду, последний шард открыт сверху.
+
+    Шард никогда не переписывается на месте: новое содержимое пишется в файл
+    с новым именем, и только запись манифеста делает его действующим. Сбой до
+    записи манифеста оставляет прежнюю книгу целой.
+    """
+
+    def __init__(self, directory: Path, shard_size: int, shards: list[ShardInfo]):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.shards = shards
+
+    @property
+    def path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    @classmethod
+    def read(cls, directory: Path) -> 'ShardManifest':
+        """
+        Читает манифест каталога.
+
+        Raises:
+            FileNotFoundError: Если манифеста нет
+            FileCorruptedError: Если манифест поврежден
+            InvalidFileFormatError: Если версия или структура манифеста неизвестны
+        """
+        path = directory / MANIFEST_NAME
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            raise FileNotFoundError(f'Манифест {path} не найден')
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise FileCorruptedError(f'Манифест {path} поврежден: {e}')
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            raise InvalidFileFormatError(f'Неизвестный формат манифеста {path}')
+        try:
+            shards = [ShardInfo(item['file'], item['first_id'], item['count']) for item in data['shards']]
+            return cls(directory, data['shard_size'], shards)
+        except (KeyError, TypeError) as e:
+            raise InvalidFileFormatError(f'Некорректный манифест {path}: {e}')
+
+    def write(self) -> None:
+        """
+        Атомарно записывает манифест.
+
+        Raises:
+            SaveFileError: Если не удалось сохранить файл
+        """
+        data = {
+            'version': MANIFEST_VERSION,
+            'shard_size': self.shard_size,
+            'shards': [{'file': s.file, 'first_id': s.first_id, 'count': s.count} for s in self.shards],
+        }
+        FileWriter(self.path)._replace_file(lambda file: json.dump(data, file, ensure_ascii=False))
+
+    def shard_index(self, cid: int) -> int:
+        """Номер шарда, к которому относится ID (шарды должны быть)"""
+        first_ids = [shard.first_id for shard in self.shards]
+        return max(0, bisect_right(first_ids, cid) - 1)
+
+    def shard_path(self, shard: ShardInfo) -> Path:
+        return self.directory / shard.file
+
+    def read_shard(self, shard: ShardInfo) -> LazyContactList:
+        """
+        Читает контакты шарда.
+
+        Raises:
+            FileCorruptedError: Если файла шарда нет или он поврежден
+            InvalidFileFormatError: Если формат файла некорректен
+            ContactLoadError: Если не удалось загрузить контакты
+        """
+        try:
+            return FileReader(self.shard_path(shard)).read(lazy=True)
+        except FileNotFoundError:
+            raise FileCorruptedError(f'Шард {shard.file} из манифеста не найден')
+
+    def write_shard(self, shard: ShardInfo, contacts: list[Contact]) -> None:
+        """Пишет контакты шарда в новый файл; старый удалится после записи манифеста"""
+        shard.file = self.shard_name(shard.first_id)
+        FileWriter(self.shard_path(shard)).write(contacts)
+        shard.count = len(contacts)
+
+    def remove_stale_shards(self) -> None:
+        """Удаляет файлы шардов, которых больше нет в манифесте"""
+        files = {shard.file for shard in self.shards}
+        for path in self.directory.glob('shard-*.json'):
+            if path.name not in files:
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def shard_name(first_id: int) -> str:
+        """Новое имя файла шарда: начало диапазона и случайный суффикс"""
+        return f'shard-{first_id:010d}-{secrets.token_hex(4)}.json'
+
+
+class ShardedContactBook(Sequence[Contact]):
+    """
+    Шардированный справочник только для чтения: шард читается при первом
+    обращении к его контактам, чтение по ID затрагивает только один шард.
+    """
+
+    def __init__(self, manifest: ShardManifest):
+        self.manifest = manifest
+        self._shards: dict[int, LazyContactList] = {}
+        self._shard_positions: dict[int, dict[int, int]] = {}
+        # Позиция первого контакта каждого шарда в книге
+        self._starts = [0, *accumulate(shard.count for shard in manifest.shards)]
+
+    @property
+    def loaded_shards(self) -> int:
+        return len(self._shards)
+
+    def _shard(self, index: int) -> LazyContactList:
+        if index not in self._shards:
+            self._shards[index] = self.manifest.read_shard(self.manifest.shards[index])
+        return self._shards[index]
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Индекс вне книги')
+        shard = bisect_right(self._starts, index) - 1
+        return self._shard(shard)[index - self._starts[shard]]
+
+    def __iter__(self) -> Iterator[Contact]:
+        for index in range(len(self.manifest.shards)):
+            yield from self._shard(index)
+
+    def get(self, cid: int) -> Contact | None:
+        """Контакт по ID; читается только шард с этим ID"""
+        if not self.manifest.shards:
+            return None
+        index = self.manifest.shard_index(cid)
+        shard = self._shard(index)
+        if index not in self._shard_positions:
+            self._shard_positions[index] = {contact_id: pos for pos, contact_id in enumerate(shard.ids())}
+        pos = self._shard_positions[index].get(cid)
+        return None if pos is None else shard[pos]
+
+
+class ShardedStorage(ContactStorage):
+    """
+    Справочник в каталоге: JSON-файлы шардов по диапазонам ID и манифест.
+
+    Полная запись делит книгу на шарды по shard_size контактов. Сохранение
+    изменений переписывает только шарды, которых касаются операции, и
+    манифест; новые контакты начинают новый шард, когда последний заполнен.
+    Для чтения отдельных контактов без загрузки всей книги есть open().
+    """
+
+    def __init__(self, directory: Path, shard_size: int | None = None):
+        self.directory = directory
+        # None — размер из манифеста, а для нового справочника DEFAULT_SHARD_SIZE
+        self.shard_size = shard_size
+        self.lock = FileLock(directory / MANIFEST_NAME)
+        self._manifest: ShardManifest | None = None
+        self._stamp: FileStamp | None = None
+        # ID контактов в файлах шардов, прочитанных или записанных нами. Файл шарда
+        # не переписывается на месте, поэтому по имени файла ID не устаревают
+        self._shard_ids: dict[str, list[int]] = {}
+
+    def open(self) -> ShardedContactBook:
+        return ShardedContactBook(ShardManifest.read(self.directory))
+
+    def _read_manifest(self) -> ShardManifest:
+        self._stamp = self._manifest_state()
+        manifest = ShardManifest.read(self.directory)
+        if self.shard_size is not None:
+            manifest.shard_size = self.shard_size
+        self._manifest = manifest
+        return manifest
+
+    def load(self, stream: bool = False) -> Iterable[Contact]:
+        manifest = self._read_manifest()
+        self._shard_ids = {}
+        if stream:
+            return (contact for shard in manifest.shards for contact in self._read_shard(manifest, shard))
+        return LazyContactList(
+            record for shard in manifest.shards for record in self._read_shard(manifest, shard).records()
+        )
+
+    def _read_shard(self, manifest: ShardManifest, shard: ShardInfo) -> LazyContactList:
+        contacts = manifest.read_shard(shard)
+        self._shard_ids[shard.file] = contacts.ids()
+        return contacts
+
+    def write_all(self, contacts: Iterable[Contact]) -> None:
+        manifest = ShardManifest(self.directory, self._shard_size(), [])
+        chunk: list[Contact] = []
+        for contact in contacts:
+            chunk.append(contact)
+            if len(chunk) == manifest.shard_size:
+                self._write_new_shard(manifest, chunk)
+                chunk = []
+        if chunk:
+            self._write_new_shard(manifest, chunk)
+        self._commit(manifest)
+
+    def _shard_size(self) -> int:
+        if self.shard_size is not None:
+            return self.shard_size
+        return self._manifest.shard_size if self._manifest is not None else DEFAULT_SHARD_SIZE
+
+    def _write_new_shard(self, manifest: ShardManifest, contacts: list[Contact]) -> None:
+        shard = ShardInfo('', contacts[0].id, 0)
+        self._write_shard(manifest, shard, contacts)
+        manifest.shards.append(shard)
+
+    def _write_shard(self, manifest: ShardManifest, shard: ShardInfo, contacts: list[Contact]) -> None:
+        manifest.write_shard(shard, contacts)
+        self._shard_ids[shard.file] = [contact.id for contact in contacts]
+
+    def _commit(self, manifest: ShardManifest) -> None:
+        """Записывает манифест после файлов шардов и удаляет ненужные шарды"""
+        manifest.write()
+        manifest.remove_stale_shards()
+        self._manifest = manifest
+        self._stamp = self._manifest_state()
+        self._forget_stale_shards(manifest)
+
+    def _forget_stale_shards(self, manifest: ShardManifest) -> None:
+        files = {shard.file for shard in manifest.shards}
+        self._shard_ids = {file: ids for file, ids in self._shard_ids.items() if file in files}
+
+    def accepts_changes(self, count: int) -> bool:
+        return (self.directory / MANIFEST_NAME).exists()
+
+    def write_changes(self, changes: list[dict[str, Any]]) -> None:
+        manifest = self._manifest or self._read_manifest()
+        existing = len(manifest.shards)
+        try:
+            # Операции по номерам шардов; новый контакт при заполненном последнем шарде начинает новый
+            dirty: dict[int, list[dict[str, Any]]] = {}
+            for record in changes:
+                cid = record['contact']['id'] if record['op'] == 'add' else record['id']
+                if record['op'] == 'add' and (not manifest.shards or self._last_shard_full(manifest, dirty)):
+                    manifest.shards.append(ShardInfo('', cid, 0))
+                elif not manifest.shards:
+                    # В пустом справочнике изменять и удалять нечего
+                    continue
+                dirty.setdefault(manifest.shard_index(cid), []).append(record)
+
+            for index, records in dirty.items():
+                shard = manifest.shards[index]
+                contacts = manifest.read_shard(shard) if index < existing else []
+                try:
+                    contacts = apply_records(contacts, records)
+                except (KeyError, TypeError, ValueError) as e:
+                    raise FileCorruptedError(f'Некорректная операция для шарда {shard.file}: {e}')
+                self._write_shard(manifest, shard, contacts)
+            self._commit(manifest)
+        except BaseException:
+            # Манифест в памяти мог разойтись с диском — перечитаем его при следующей записи
+            self._manifest = None
+            raise
+
+    @staticmethod
+    def _last_shard_full(manifest: ShardManifest, dirty: dict[int, list[dict[str, Any]]]) -> bool:
+        if not manifest.shards:
+            return False
+        last = len(manifest.shards) - 1
+        added = sum(record['op'] == 'add' for record in dirty.get(last, ()))
+        return manifest.shards[last].count + added >= manifest.shard_size
+
+    def _manifest_state(self) -> FileStamp | None:
+        try:
+            stat = os.stat(self.directory / MANIFEST_NAME)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def locked(self) -> AbstractContextManager:
+        return self.lock
+
+    def poll_changes(self) -> ExternalChanges | None:
+        """
+        Каждое сохранение переписывает манифест, поэтому достаточно его отпечатка.
+
+        Измененный шард всегда получает новый файл, поэтому при смене манифеста
+        читаются только шарды, файлов которых не было в прежнем манифесте. Их
+        контакты сравниваются с ID из замененных файлов: новые ID становятся
+        записями добавления, пропавшие — удаления, остальные — правки всех полей
+        (модель применит только отличающиеся).
+        """
+        state = self._manifest_state()
+        if state == self._stamp or state is None:
+            return None
+        old = self._manifest
+        if old is None or any(shard.file not in self._shard_ids for shard in old.shards):
+            return ExternalChanges(contacts=self.load())
+
+        manifest = self._read_manifest()
+        old_files = {shard.file for shard in old.shards}
+        new_files = {shard.file for shard in manifest.shards}
+        replaced_ids = {cid for file in old_files - new_files for cid in self._shard_ids[file]}
+        records: list[dict[str, Any]] = []
+        for shard in manifest.shards:
+            if shard.file in old_files:
+                continue
+            for cid, name, phone_number, comment in self._read_shard(manifest, shard).records():
+                if cid in replaced_ids:
+                    replaced_ids.discard(cid)
+                    records.append({'op': 'edit', 'id': cid,
+                                    'fields': {'name': name, 'phone_number': phone_number, 'comment': comment}})
+                else:
+                    records.append({'op': 'add', 'contact': Contact(cid, name, phone_number, comment).to_dict()})
+        records.extend({'op': 'delete', 'id': cid} for cid in sorted(replaced_ids))
+        self._forget_stale_shards(manifest)
+        return ExternalChanges(records=records) if records else None
+
+
+def rebalance(directory: Path, shard_size: int | None = None) -> int:
+    """
+    Делит шарды, в которых больше shard_size контактов, на шарды по shard_size.
+    Остальные шарды не переписываются. Части пишутся в новые файлы, исходные
+    удаляются только после записи манифеста.
+
+    Args:
+        directory: Каталог шардированного справочника
+        shard_size: Новый размер шарда; None — размер из манифеста
+
+    Returns:
+        int: Количество разделенных шардов
+    """
+    storage = ShardedStorage(directory, shard_size)
+    with storage.locked():
+        manifest = storage._read_manifest()
+        size = manifest.shard_size
+        shards: list[ShardInfo] = []
+        split = 0
+        for shard in manifest.shards:
+            if shard.count <= size:
+                shards.append(shard)
+                continue
+            contacts = list(manifest.read_shard(shard))
+            for start in range(0, len(contacts), size):
+                piece = contacts[start:start + size]
+                # Первая часть сохраняет нижнюю границу диапазона исходного шарда
+                first_id = shard.first_id if start == 0 else piece[0].id
+                new_shard = ShardInfo('', first_id, 0)
+                manifest.write_shard(new_shard, piece)
+                shards.append(new_shard)
+            split += 1
+        manifest.shards = shards
+        storage._commit(manifest)
+    return split
@@ -0,0 +1,225 @@
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from custom_types import Contact
+from custom_errors import SaveFileError, FileCorruptedError
+from .storage import ContactStorage
+from .file_reader import FileReader
+from .journal import ContactJournal
+
+
+class SqliteStorage(ContactStorage):
+    """
+    Хранилище справочника в базе SQLite.
+
+    Контакты лежат в таблице contacts с индексом по текстовому представлению
+    телефона, имя и комментарий дополнительно проиндексированы в FTS5-таблице
+    с триграммным токенизатором. Сохранение применяет накопленные операции
+    одной транзакцией, не переписывая всю книгу.
+    """
+
+    EDITABLE_FIELDS = ('name', 'phone_number', 'comment')
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS contacts (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            phone_number INTEGER NOT NULL,
+            comment TEXT NOT NULL DEFAULT '',
+            phone_text TEXT GENERATED ALWAYS AS (CAST(phone_number AS TEXT)) VIRTUAL
+        );
+        CREATE INDEX IF NOT EXISTS contacts_phone_text ON contacts(phone_text);
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+            name, comment, content='contacts', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+            INSERT INTO contacts_fts(rowid, name, comment) VALUES (new.id, new.name, new.comment);
+        END;
+        CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+            INSERT INTO contacts_fts(contacts_fts, rowid, name, comment)
+            VALUES ('delete', old.id, old.name, old.comment);
+        END;
+        CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+            INSERT INTO contacts_fts(contacts_fts, rowid, name, comment)
+            VALUES ('delete', old.id, old.name, old.comment);
+            INSERT INTO contacts_fts(rowid, name, comment) VALUES (new.id, new.name, new.comment);
+        END;
+    '''
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        try:
+            # Сохранение может идти из потока автосохранения; записи
+            # сериализует модель, поэтому проверку потока отключаем
+            self.connection = sqlite3.connect(file_path, check_same_thread=False)
+            self.connection.executescript(self.SCHEMA)
+        except sqlite3.DatabaseError as e:
+            raise FileCorruptedError(f'Файл поврежден или не является базой SQLite: {e}')
+
+    def close(self) -> None:
+        self.connection.close()
+
+    # --------- ContactStorage ---------
+
+    def load(self, stream: bool = False) -> Iterable[Contact]:
+        rows = self._iter_rows('SELECT id, name, phone_number, comment FROM contacts ORDER BY id')
+        return rows if stream else list(rows)
+
+    def write_all(self, contacts: Iterable[Contact]) -> None:
+        try:
+            with self.connection:
+                self.connection.execute('DELETE FROM contacts')
+                self.connection.executemany(
+                    'INSERT INTO contacts (id, name, phone_number, comment) VALUES (?, ?, ?, ?)',
+                    ((c.id, c.name, c.phone_number, c.comment) for c in contacts)
+                )
+        except sqlite3.Error as e:
+            raise SaveFileError(f'Невозможно сохранить базу: {e}')
+
+    def accepts_changes(self, count: int) -> bool:
+        return True
+
+    def write_changes(self, changes: list[dict[str, Any]]) -> None:
+        try:
+            with self.connection:
+                for change in changes:
+                    self._apply_change(change)
+        except sqlite3.Error as e:
+            raise SaveFileError(f'Невозможно сохранить базу: {e}')
+
+    def _apply_change(self, change: dict[str, Any]) -> None:
+        op = change['op']
+        if op == 'add':
+            c = change['contact']
+            self.connection.execute(
+                'INSERT OR REPLACE INTO contacts (id, name, phone_number, comment) VALUES (?, ?, ?, ?)',
+                (c['id'], c['name'], c['phone_number'], c['comment'])
+            )
+        elif op == 'edit':
+            fields = {k: v for k, v in change['fields'].items() if k in self.EDITABLE_FIELDS}
+            if fields:
+                assignments = ', '.join(f'{field} = ?' for field in fields)
+                self.connection.execute(
+                    f'UPDATE contacts SET {assignments} WHERE id = ?', (*fields.values(), change['id'])
+                )
+        elif op == 'delete':
+            self.connection.execute('DELETE FROM contacts WHERE id = ?', (change['id'],))
+
+    # --------- Запросы по индексам ---------
+
+    def count(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM contacts').fetchone()[0]
+
+    def get(self, cid: int) -> Contact | None:
+        rows = list(self._iter_rows(
+            'SELECT id, name, phone_number, comment FROM contacts WHERE id = ?', (cid,)
+        ))
+        return rows[0] if rows else None
+
+    # ':' идет в ASCII сразу за '9', поэтому диапазон покрывает все продолжения префикса
+    PHONE_PREFIX_CONDITION = 'phone_text >= ? AND phone_text < ? ORDER BY phone_text, id LIMIT ?'
+
+    def find_by_phone_prefix(self, prefix: str, limit: int | None = None) -> list[Contact]:
+        """Контакты, чей номер начинается с prefix, в порядке номеров"""
+        return list(self._iter_rows(
+            f'SELECT id, name, phone_number, comment FROM contacts WHERE {self.PHONE_PREFIX_CONDITION}',
+            (prefix, prefix + ':', -1 if limit is None else limit)
+        ))
+
+    # --------- Поиск для модели ---------
+
+    indexed_search = True
+
+    def phone_prefix_ids(self, prefix: str, limit: int | None = None) -> list[int]:
+        rows = self.connection.execute(
+            f'SELECT id FROM contacts WHERE {self.PHONE_PREFIX_CONDITION}',
+            (prefix, prefix + ':', -1 if limit is None else limit)
+        )
+        return [cid for cid, in rows]
+
+    def find_ids(self, field: str, literals: tuple[str, ...]) -> set[int] | None:
+        """
+        Кандидаты по FTS-таблице для имени и комментария. Подстроки короче трех
+        символов триграммный токенизатор не ищет — они пропускаются, а если
+        не остается ни одной, хранилище не сужает поиск (None). FTS сравнивает
+        символы без учета регистра, не раскрывая ß и лигатуры, как и re.IGNORECASE.
+        """
+        phrases = ['"' + literal.replace('"', '""') + '"' for literal in literals if len(literal) >= 3]
+        if field not in ('name', 'comment') or not phrases:
+            return None
+        rows = self.connection.execute(
+            'SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?',
+            (f'{{{field}}} : ({" AND ".join(phrases)})',)
+        )
+        return {cid for cid, in rows}
+
+    def search_text(self,
+                    term: str,
+                    fields: tuple[str, ...] = ('name', 'comment'),
+                    limit: int | None = None) -> list[Contact]:
+        """
+        Полнотекстовый поиск подстроки без учета регистра по имени и/или комментарию.
+
+        Args:
+            term: Искомая подстрока
+            fields: Поля для поиска — 'name' и/или 'comment'
+            limit: Максимальное количество результатов
+
+        Returns:
+            list[Contact]: Найденные контакты в порядке ID
+        """
+        fields = tuple(field for field in fields if field in ('name', 'comment'))
+        if not term or not fields:
+            return []
+
+        if len(term) >= 3:
+            quoted = '"' + term.replace('"', '""') + '"'
+            query = f'{{{" ".join(fields)}}} : {quoted}'
+            sql = ('SELECT c.id, c.name, c.phone_number, c.comment FROM contacts_fts '
+                   'JOIN contacts c ON c.id = contacts_fts.rowid '
+                   'WHERE contacts_fts MATCH ? ORDER BY c.id LIMIT ?')
+            params: tuple = (query, -1 if limit is None else limit)
+        else:
+            # Триграммный индекс не ищет подстроки короче трех символов
+            escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            condition = ' OR '.join(f"{field} LIKE ? ESCAPE '\\'" for field in fields)
+            sql = (f'SELECT id, name, phone_number, comment FROM contacts '
+                   f'WHERE {condition} ORDER BY id LIMIT ?')
+            params = (*[f'%{escaped}%'] * len(fields), -1 if limit is None else limit)
+        return list(self._iter_rows(sql, params))
+
+    def _iter_rows(self, sql: str, params: tuple = ()) -> Iterator[Contact]:
+        for cid, name, phone_number, comment in self.connection.execute(sql, params):
+            yield Contact(id=cid, name=name, phone_number=phone_number, comment=comment)
+
+
+def migrate_json_to_sqlite(json_path: Path, db_path: Path) -> int:
+    """
+    Переносит контакты из JSON-справочника в базу SQLite.
+    Если рядом с файлом есть журнал изменений, он тоже учитывается.
+
+    Args:
+        json_path: Путь к исходному JSON-файлу
+        db_path: Путь к базе; существующие в ней контакты заменяются
+
+    Returns:
+        int: Количество перенесенных контактов
+
+    Raises:
+        FileNotFoundError: Если JSON-файл не существует
+        FileCorruptedError, InvalidFileFormatError, ContactLoadError: Ошибки чтения JSON
+        SaveFileError: Если не удалось записать базу
+    """
+    journal_path = json_path.with_name(json_path.name + '.journal')
+    if journal_path.exists():
+        contacts: Iterable[Contact] = FileReader(json_path, journal=ContactJournal(journal_path)).read()
+    else:
+        contacts = FileReader(json_path).iter_contacts()
+
+    storage = SqliteStorage(db_path)
+    try:
+        storage.write_all(contacts)
+        return storage.count()
+    finally:
+        storage.close()
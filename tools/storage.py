@@ -0,0 +1,196 @@
+import os
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+from custom_types import Contact
+from .file_reader import FileReader
+from .file_writer import FileWriter
+from .file_lock import FileLock
+from .journal import ContactJournal, JournalPosition
+from .book_cache import BookCache, contact_columns
+
+# Отпечаток файла для обнаружения чужих изменений: (inode, mtime в нс, размер)
+FileStamp = tuple[int, int, int]
+
+
+@dataclass
+class ExternalChanges:
+    """Изменения хранилища, сделанные другим процессом после нашей загрузки или записи"""
+    # Новые записи журнала — их можно применить поверх уже загруженной книги
+    records: list[dict[str, Any]] = field(default_factory=list)
+    # Книга целиком, если файл был перезаписан и отдельные операции неизвестны
+    contacts: Iterable[Contact] | None = None
+
+
+class ContactStorage(ABC):
+    """
+    Интерфейс хранилища справочника.
+
+    Хранилище умеет загрузить и целиком записать контакты, а если
+    поддерживает — сохранить только операции с момента прошлой записи
+    (в формате записей журнала, см. ContactJournal).
+    """
+
+    @abstractmethod
+    def load(self, stream: bool = False) -> Iterable[Contact]:
+        """
+        Загружает контакты.
+
+        Args:
+            stream: Разрешает вернуть ленивый итератор вместо списка
+
+        Raises:
+            FileNotFoundError: Если хранилище еще не создано
+        """
+
+    @abstractmethod
+    def write_all(self, contacts: Iterable[Contact]) -> None:
+        """Заменяет содержимое хранилища переданными контактами"""
+
+    def accepts_changes(self, count: int) -> bool:
+        """Можно ли сохранить count операций через write_changes вместо полной записи"""
+        return False
+
+    def write_changes(self, changes: list[dict[str, Any]]) -> None:
+        """Сохраняет только операции с момента прошлой записи"""
+        raise NotImplementedError
+
+    def locked(self) -> AbstractContextManager:
+        """Блокировка хранилища от записи другими процессами на время сохранения"""
+        return nullcontext()
+
+    def poll_changes(self) -> ExternalChanges | None:
+        """Изменения других процессов с момента прошлой загрузки или записи; None — их нет"""
+        return None
+
+    # Хранилище само ищет по своим индексам (find_ids, phone_prefix_ids):
+    # модель не строит для этих поисков индексы в памяти
+    indexed_search = False
+    # Чужое сохранение заставляет poll_changes перечитать книгу целиком
+    reloads_on_change = False
+
+    def find_ids(self, field: str, literals: tuple[str, ...]) -> set[int] | None:
+        """
+        ID сохраненных контактов, поле field которых может содержать все literals
+        (без учета регистра). Результат может быть шире точного — модель проверяет
+        кандидатов сама. None — хранилище не ищет по этому полю.
+        """
+        return None
+
+    def phone_prefix_ids(self, prefix: str, limit: int | None = None) -> list[int] | None:
+        """ID сохраненных контактов с номером, начинающимся с prefix, в порядке номеров; None — не ищет"""
+        return None
+
+
+class JsonStorage(ContactStorage):
+    """JSON-файл справочника с необязательными журналом изменений и кешем разбора рядом"""
+
+    def __init__(self,
+                 file_path: Path,
+                 journal: bool = False,
+                 compact_every: int = 1000,
+                 lazy: bool = False,
+                 cache: bool = False):
+        self.file_path = file_path
+        # Загружать контакты в LazyContactList, создавая Contact при первом обращении
+        self.lazy = lazy
+        # В режиме журнала операции дописываются в <файл>.journal,
+        # а полная перезапись происходит раз в compact_every записей
+        self.journal: ContactJournal | None = (
+            ContactJournal(file_path.with_name(file_path.name + '.journal')) if journal else None
+        )
+        self.compact_every = compact_every
+        self.reader = FileReader(file_path, journal=self.journal)
+        self.writer = FileWriter(file_path)
+        # Кеш разобранной книги в <файл>.cache: при неизменном файле JSON не разбирается
+        self.cache: BookCache | None = BookCache(file_path) if cache else None
+        self.lock = FileLock(file_path)
+        # Состояние файла и журнала на момент нашей последней загрузки или записи
+        self._file_stamp: FileStamp | None = None
+        self._journal_position: JournalPosition | None = None
+
+    def load(self, stream: bool = False) -> Iterable[Contact]:
+        # Отпечатки снимаются до чтения: изменение во время чтения заметит следующая проверка
+        self._remember_state()
+        if self.cache is not None:
+            return self._load_cached(compact=stream)
+        if stream and self.journal is None:
+            return self.reader.iter_contacts()
+        return self.reader.read(lazy=self.lazy)
+
+    def _file_state(self) -> FileStamp | None:
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _remember_state(self) -> None:
+        self._file_stamp = self._file_state()
+        if self.journal is not None:
+            self._journal_position = self.journal.position()
+
+    @property
+    def reloads_on_change(self) -> bool:
+        # Без журнала другой процесс перезаписывает файл целиком, и в изменениях
+        # не разобраться без разбора всей книги
+        return self.journal is None
+
+    def locked(self) -> AbstractContextManager:
+        return self.lock
+
+    def poll_changes(self) -> ExternalChanges | None:
+        """
+        Дешевая проверка по отпечатку файла (один stat) и позиции журнала.
+
+        Если файл перезаписан — возвращает книгу целиком, если другой процесс
+        только дописал журнал — лишь новые записи.
+        """
+        state = self._file_state()
+        if state != self._file_stamp:
+            if state is None:
+                # Файл удален — вливать нечего, следующее сохранение создаст его заново
+                self._remember_state()
+                return None
+            return ExternalChanges(contacts=self.load())
+        if self.journal is None:
+            return None
+        tail = self.journal.read_from(self._journal_position)
+        if tail is None:
+            return ExternalChanges(contacts=self.load())
+        records, self._journal_position = tail
+        return ExternalChanges(records=records) if records else None
+
+    def _load_cached(self, compact: bool) -> Iterable[Contact]:
+        """Загружает книгу из кеша, а при промахе разбирает файл и обновляет кеш"""
+        columns = self.cache.load()
+        if columns is None:
+            # Отпечаток снимается до чтения: если файл изменится во время разбора,
+            # кеш не совпадет с ним при следующей загрузке
+            fingerprint = self.cache.fingerprint()
+            columns = contact_columns(FileReader(self.file_path).read(lazy=True))
+            self.cache.store(fingerprint, columns)
+        contacts = BookCache.to_contacts(columns, compact=compact, lazy=self.lazy)
+        if self.journal is not None:
+            contacts = self.journal.replay(contacts)
+        return contacts
+
+    def write_all(self, contacts: Iterable[Contact]) -> None:
+        self.writer.write(contacts)
+        if self.journal is not None:
+            self.journal.clear()
+        # Запись идет под блокировкой, поэтому новое состояние — наше
+        self._remember_state()
+        if self.cache is not None:
+            self.cache.store(self.cache.fingerprint(), contact_columns(contacts))
+
+    def accepts_changes(self, count: int) -> bool:
+        return (self.journal is not None
+                and self.file_path.exists()
+                and self.journal.size + count < self.compact_every)
+
+    def write_changes(self, changes: list[dict[str, Any]]) -> None:
+        self.journal.append(changes)
+        self._journal_position = self.journal.position()
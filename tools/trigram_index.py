@@ -0,0 +1,147 @@
+from typing import Iterable
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм для быстрого отбора кандидатов при поиске подстрок"""
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.casefold()
+
+    @staticmethod
+    def trigrams(text: str) -> set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, key: int, text: str) -> None:
+        for trigram in self.trigrams(self.normalize(text)):
+            self._postings.setdefault(trigram, set()).add(key)
+
+    def remove(self, key: int, text: str) -> None:
+        for trigram in self.trigrams(self.normalize(text)):
+            keys = self._postings.get(trigram)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._postings[trigram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+
+    def candidates(self, literals: Iterable[str]) -> set[int] | None:
+        """
+        Возвращает ключи, тексты которых содержат все триграммы всех литералов.
+
+        Args:
+            literals: Фрагменты, обязательно входящие в искомую строку
+
+        Returns:
+            set[int] | None: Множество кандидатов или None, если ни один
+            литерал не короче трех символов и сузить поиск нельзя
+        """
+        trigrams: set[str] = set()
+        for literal in literals:
+            trigrams |= self.trigrams(self.normalize(literal))
+        if not trigrams:
+            return None
+
+        postings = []
+        for trigram in trigrams:
+            keys = self._postings.get(trigram)
+            if not keys:
+                return set()
+            postings.append(keys)
+
+        postings.sort(key=len)
+        result = set(postings[0])
+        for keys in postings[1:]:
+            result &= keys
+            if not result:
+                break
+        return result
+
+
+def _skip_char_class(pattern: str, i: int) -> int:
+    """Возвращает позицию сразу за классом символов, начинающимся на pattern[i] == '['"""
+    i += 1
+    if i < len(pattern) and pattern[i] == '^':
+        i += 1
+    # ']' сразу после открывающей скобки — обычный символ класса
+    if i < len(pattern) and pattern[i] == ']':
+        i += 1
+    while i < len(pattern) and pattern[i] != ']':
+        i += 2 if pattern[i] == '\\' else 1
+    return i + 1
+
+
+def extract_literals(pattern: str) -> list[str] | None:
+    """
+    Выделяет из регулярного выражения литеральные фрагменты, без которых совпадение невозможно.
+
+    Разбор консервативный: все, что может быть необязательным (группы,
+    альтернативы, символ под квантификатором с нулевым минимумом), отбрасывается.
+
+    Args:
+        pattern: Регулярное выражение
+
+    Returns:
+        list[str] | None: Обязательные фрагменты или None, если выражение
+        содержит альтернативы или флаги и безопасно выделить литералы нельзя
+    """
+    if '|' in pattern or '(?' in pattern:
+        return None
+
+    literals: list[str] = []
+    current: list[str] = []
+
+    def flush() -> None:
+        if current:
+            literals.append(''.join(current))
+            current.clear()
+
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            escaped = pattern[i + 1:i + 2]
+            if escaped and not escaped.isalnum() and depth == 0:
+                current.append(escaped)
+            else:
+                flush()
+            i += 2
+            continue
+        if ch == '[':
+            flush()
+            i = _skip_char_class(pattern, i)
+            continue
+        if ch == '{':
+            # Символ под квантификатором {m,n} может повторяться ноль раз
+            if current:
+                current.pop()
+            flush()
+            end = pattern.find('}', i)
+            i = len(pattern) if end == -1 else end + 1
+            continue
+
+        if ch in '*?':
+            if current:
+                current.pop()
+            flush()
+        elif ch == '(':
+            depth += 1
+            flush()
+        elif ch == ')':
+            depth = max(depth - 1, 0)
+            flush()
+        elif ch in '+.^$':
+            flush()
+        elif depth == 0:
+            current.append(ch)
+        i += 1
+
+    flush()
+    return literals
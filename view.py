@@ -1,6 +1,12 @@
-from textwrap import dedent
+import sys
 from custom_types import Contact
-from typing import Iterable
+from typing import Iterable, TextIO
+
+# Шаблон карточки контакта; поля подставляются по позиции, без to_dict()
+CONTACT_TEMPLATE = '\nID: {0}\nИмя: {1}\nТелефон: {2}\nКомментарий: {3}\n'
+CONTACT_SEPARATOR = '\n***\n'
+# Сколько контактов накапливать перед записью в поток
+CHUNK_SIZE = 500
 
 
 class ContactBookView:
@@ -48,6 +54,14 @@ class ContactBookView:
     def get_search_term(self) -> str:
         return self._get_user_input('Введите значение для поиска: ')
 
+    def get_bulk_action(self, count: int) -> str:
+        return self._get_user_input(
+            f'Действие со всеми найденными ({count}): d — удалить, e — изменить, Enter — в меню: '
+        )
+
+    def get_bulk_delete_confirmation(self, count: int) -> str:
+        return self._get_user_input(f'Удалить контактов: {count}? (y/N): ')
+
     def get_save_file_decision(self) -> str:
         return self._get_user_input('Изменения не сохранены. Сохранить? (Y/n): ')
 
@@ -56,13 +70,36 @@ class ContactBookView:
         print(message)
 
     @staticmethod
-    def show_contacts(contacts: Iterable[Contact]) -> None:
-        if not contacts:
-            print('Список контактов пуст')
-        tmp: str = dedent('''
-            ID: {id}
-            Имя: {name}
-            Телефон: {phone_number}
-            Комментарий: {comment}
-        ''')
-        print('\n***\n'.join([tmp.format(**c.to_dict()) for c in contacts]))
+    def show_contacts(contacts: Iterable[Contact], out: TextIO | None = None) -> None:
+        """
+        Выводит контакты, записывая текст в поток частями по CHUNK_SIZE контактов,
+        чтобы не собирать весь список в одну строку.
+
+        Args:
+            contacts: Контакты для вывода (подойдет и ленивый итератор)
+            out: Поток вывода, по умолчанию sys.stdout
+        """
+        out = out or sys.stdout
+        render = CONTACT_TEMPLATE.format
+        chunk: list[str] = []
+        shown = 0
+        for contact in contacts:
+            if shown:
+                chunk.append(CONTACT_SEPARATOR)
+            chunk.append(render(contact.id, contact.name, contact.phone_number, contact.comment))
+            shown += 1
+            if shown % CHUNK_SIZE == 0:
+                out.write(''.join(chunk))
+                chunk.clear()
+        if not shown:
+            chunk.append('Список контактов пуст\n')
+        chunk.append('\n')
+        out.write(''.join(chunk))
+        out.flush()
+
+    @staticmethod
+    def show_page_status(page: int, pages: int, total: int) -> None:
+        print(f'Страница {page} из {pages} (всего контактов: {total})')
+
+    def get_page_command(self) -> str:
+        return self._get_user_input('Enter/n — следующая страница, p — предыдущая, q — выход: ')